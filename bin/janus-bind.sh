@@ -9,7 +9,8 @@
 
 set -euo pipefail
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+[ "$SCRIPT_DIR" != "${BASH_SOURCE[0]}" ] || SCRIPT_DIR="."
 export JANUS_ROOT_DIR="$(cd "$SCRIPT_DIR/.." && pwd)"
 
 # shellcheck source=../lib/core/runtime/safety.sh
@@ -44,7 +45,9 @@ if ! janus_has_flag "--yes" "$@" \
 fi
 
 # Request root early when a mutating bind action is requested.
-if janus_has_flag "--apply" "$@" || janus_has_flag "--rollback" "$@"; then
+if janus_has_flag "--apply" "$@" \
+    || janus_has_flag "--rollback" "$@" \
+    || janus_has_flag "--unpersist" "$@"; then
     janus_require_root "janus-bind" || exit 1
 fi
 
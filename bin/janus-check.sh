@@ -8,7 +8,8 @@
 
 set -euo pipefail
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+[ "$SCRIPT_DIR" != "${BASH_SOURCE[0]}" ] || SCRIPT_DIR="."
 export JANUS_ROOT_DIR="$(cd "$SCRIPT_DIR/.." && pwd)"
 
 # shellcheck source=../lib/core/runtime/safety.sh
@@ -26,13 +27,12 @@ if ! janus_has_flag "--no-interactive" "$@" \
     && ! janus_tty_has_stdin \
     && [ -z "${JANUS_CHECK_TTY_REEXEC:-}" ]; then
     export JANUS_CHECK_TTY_REEXEC=1
-    ensure_tty bash "$0" "$@"
-    tty_rc=$?
-    unset JANUS_CHECK_TTY_REEXEC
-
-    if [ "$tty_rc" -eq 0 ]; then
+    if ensure_tty bash "$0" "$@"; then
         exit 0
+    else
+        tty_rc=$?
     fi
+    unset JANUS_CHECK_TTY_REEXEC
 
     if [ "$tty_rc" -eq "$JANUS_TTY_UNAVAILABLE_RC" ]; then
         janus_log_warn "Pseudo-TTY is unavailable; continuing with --no-interactive."
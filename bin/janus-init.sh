@@ -4,13 +4,23 @@
 # Janus Init Command Wrapper
 # ----------------------------------------------------------------------------
 # This thin entrypoint delegates to modular implementation under lib/init/.
+# It performs early root gating for --apply.
 # ----------------------------------------------------------------------------
 
 set -euo pipefail
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+[ "$SCRIPT_DIR" != "${BASH_SOURCE[0]}" ] || SCRIPT_DIR="."
 export JANUS_ROOT_DIR="$(cd "$SCRIPT_DIR/.." && pwd)"
 
+# shellcheck source=../lib/core/runtime/safety.sh
+source "$JANUS_ROOT_DIR/lib/core/runtime/safety.sh"
+
+# Request root early when system-level files will be installed.
+if janus_has_flag "--apply" "$@"; then
+    janus_require_root "janus-init --apply" || exit 1
+fi
+
 # shellcheck source=../lib/init/main.sh
 source "$JANUS_ROOT_DIR/lib/init/main.sh"
 
@@ -9,7 +9,8 @@
 
 set -euo pipefail
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+[ "$SCRIPT_DIR" != "${BASH_SOURCE[0]}" ] || SCRIPT_DIR="."
 export JANUS_ROOT_DIR="$(cd "$SCRIPT_DIR/.." && pwd)"
 
 # shellcheck source=../lib/core/runtime/safety.sh
@@ -22,13 +23,12 @@ source "$JANUS_ROOT_DIR/lib/tty.sh"
 # - if pseudo-TTY is unavailable, transparently downgrade to --no-guided.
 if janus_has_flag "--guided" "$@" && ! janus_tty_has_stdin && [ -z "${JANUS_VM_TTY_REEXEC:-}" ]; then
     export JANUS_VM_TTY_REEXEC=1
-    ensure_tty bash "$0" "$@"
-    tty_rc=$?
-    unset JANUS_VM_TTY_REEXEC
-
-    if [ "$tty_rc" -eq 0 ]; then
+    if ensure_tty bash "$0" "$@"; then
         exit 0
+    else
+        tty_rc=$?
     fi
+    unset JANUS_VM_TTY_REEXEC
 
     if [ "$tty_rc" -eq "$JANUS_TTY_UNAVAILABLE_RC" ]; then
         janus_log_warn "Pseudo-TTY is unavailable; switching --guided to --no-guided."
@@ -47,8 +47,8 @@ if janus_has_flag "--guided" "$@" && ! janus_tty_has_stdin && [ -z "${JANUS_VM_T
     fi
 fi
 
-# Request root early for mutating apply/force operations.
-if janus_has_flag "--apply" "$@" || janus_has_flag "--force" "$@"; then
+# Request root early for mutating apply/force/IRQ pinning operations.
+if janus_has_flag "--apply" "$@" || janus_has_flag "--force" "$@" || janus_has_flag "--irq-cpus" "$@"; then
     janus_require_root "janus-vm" || exit 1
 fi
 
@@ -23,6 +23,9 @@ Usage:
   janus-bind --group 11 --dry-run --yes
   sudo janus-bind --device 0000:03:00.0 --apply
   sudo janus-bind --rollback
+  janus-bind --device 0000:03:00.0 --persist
+  sudo janus-bind --group 11 --persist --apply
+  sudo janus-bind --unpersist
 
 Options:
   --list              List detected display controllers.
@@ -31,6 +34,12 @@ Options:
   --dry-run           Simulate actions (default mode).
   --apply             Apply bind operations to vfio-pci (requires root).
   --rollback          Restore last saved bind state (requires root).
+  --persist           Generate boot-time vfio-pci config (modprobe.d ids,
+                      softdep, initramfs); previews a diff unless --apply.
+  --unpersist         Remove the persistent config and restore the
+                      pre-Janus files (requires root).
+  --initramfs TOOL    Initramfs generator for --persist:
+                      dracut|mkinitcpio|initramfs-tools|none (default: auto).
   --yes               Assume yes for confirmation prompts.
   --verbose           Enable debug logging.
   --help, -h          Show this help.
@@ -38,6 +47,8 @@ Options:
 Warning:
   --apply writes to /sys and can impact active graphics/session devices.
   Prefer --dry-run first and validate your IOMMU isolation.
+  --persist --apply rebuilds the initramfs; the devices (and any card with
+  the same vendor:device id) stay on vfio-pci after every reboot.
 EOF_HELP
 }
 
@@ -46,6 +57,7 @@ janus_bind_parse_args() {
     while [ $# -gt 0 ]; do
         case "$1" in
             --list)
+                janus_bind_load_ops list
                 janus_bind_list_devices
                 exit 0
                 ;;
@@ -68,6 +80,17 @@ janus_bind_parse_args() {
             --rollback)
                 JANUS_BIND_ROLLBACK=1
                 ;;
+            --persist)
+                JANUS_BIND_PERSIST=1
+                ;;
+            --unpersist)
+                JANUS_BIND_UNPERSIST=1
+                ;;
+            --initramfs)
+                [ $# -ge 2 ] || janus_bind_die "--initramfs requires a tool argument."
+                JANUS_BIND_INITRAMFS="$2"
+                shift
+                ;;
             --yes)
                 JANUS_BIND_ASSUME_YES=1
                 ;;
@@ -95,4 +118,19 @@ janus_bind_validate_option_combinations() {
     if [ "$JANUS_BIND_ROLLBACK" -eq 1 ] && [ "$JANUS_BIND_MODE" = "apply" ]; then
         janus_bind_die "--rollback cannot be combined with --apply."
     fi
+
+    if [ "$JANUS_BIND_UNPERSIST" -eq 1 ] \
+        && { [ -n "$JANUS_BIND_TARGET_DEVICE$JANUS_BIND_TARGET_GROUP" ] || [ "$JANUS_BIND_MODE" = "apply" ]; }; then
+        janus_bind_die "--unpersist cannot be combined with --device, --group or --apply."
+    fi
+
+    if [ "$JANUS_BIND_PERSIST" -eq 1 ] && [ $((JANUS_BIND_ROLLBACK + JANUS_BIND_UNPERSIST)) -gt 0 ]; then
+        janus_bind_die "--persist cannot be combined with --rollback or --unpersist."
+    fi
+
+    if [ -n "$JANUS_BIND_INITRAMFS" ]; then
+        [ "$JANUS_BIND_PERSIST" -eq 1 ] || janus_bind_die "--initramfs is only valid with --persist."
+        janus_bind_is_initramfs_tool "$JANUS_BIND_INITRAMFS" \
+            || janus_bind_die "Invalid --initramfs value: $JANUS_BIND_INITRAMFS (expected dracut|mkinitcpio|initramfs-tools|none)"
+    fi
 }
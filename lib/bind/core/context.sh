@@ -20,6 +20,10 @@ JANUS_BIND_MODE="dry-run"
 JANUS_BIND_TARGET_DEVICE=""
 JANUS_BIND_TARGET_GROUP=""
 JANUS_BIND_ROLLBACK=0
+JANUS_BIND_PERSIST=0
+JANUS_BIND_UNPERSIST=0
+JANUS_BIND_INITRAMFS=""
+JANUS_BIND_SYSTEM_ROOT="${JANUS_BIND_SYSTEM_ROOT:-}"
 JANUS_BIND_ASSUME_YES=0
 JANUS_BIND_VERBOSE=0
 JANUS_BIND_DEVICES=()
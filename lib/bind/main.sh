@@ -21,29 +21,45 @@ source "$JANUS_ROOT_DIR/lib/core/runtime/logging.sh"
 source "$JANUS_ROOT_DIR/lib/core/runtime/safety.sh"
 # shellcheck source=core/context.sh
 source "$JANUS_ROOT_DIR/lib/bind/core/context.sh"
+# shellcheck source=../core/runtime/loader.sh
+source "$JANUS_ROOT_DIR/lib/core/runtime/loader.sh"
 # shellcheck source=core/helpers.sh
 source "$JANUS_ROOT_DIR/lib/bind/core/helpers.sh"
-# shellcheck source=ops/list.sh
-source "$JANUS_ROOT_DIR/lib/bind/ops/list.sh"
-# shellcheck source=ops/resolve.sh
-source "$JANUS_ROOT_DIR/lib/bind/ops/resolve.sh"
-# shellcheck source=ops/safety.sh
-source "$JANUS_ROOT_DIR/lib/bind/ops/safety.sh"
-# shellcheck source=ops/apply.sh
-source "$JANUS_ROOT_DIR/lib/bind/ops/apply.sh"
 # shellcheck source=cli/args.sh
 source "$JANUS_ROOT_DIR/lib/bind/cli/args.sh"
 
+# Source bind operations by name (list, resolve, safety, apply, persist).
+janus_bind_load_ops() {
+    local op=""
+
+    for op in "$@"; do
+        janus_runtime_require "bind/ops/$op.sh" || janus_bind_die "Unable to load janus-bind operation: $op"
+    done
+}
+
 # Execute janus-bind workflow.
 janus_bind_main() {
     local group=""
 
-    janus_runtime_start_logging "janus-bind" || exit 1
+    janus_runtime_defer_logging "janus-bind"
+
+    janus_bind_parse_args "$@"
+
+    # Mutating modes keep a full output transcript; dry runs only log lines.
+    if [ "$JANUS_BIND_MODE" = "apply" ] || [ $((JANUS_BIND_ROLLBACK + JANUS_BIND_UNPERSIST)) -gt 0 ]; then
+        janus_runtime_start_logging "janus-bind" || exit 1
+    fi
 
     JANUS_BIND_STATE_DIR="$(janus_runtime_resolve_state_dir)" \
         || janus_bind_die "Unable to create state directory."
 
-    janus_bind_parse_args "$@"
+    if [ "$JANUS_BIND_ROLLBACK" -eq 1 ]; then
+        janus_bind_load_ops apply
+    elif [ "$JANUS_BIND_UNPERSIST" -eq 1 ] || [ "$JANUS_BIND_PERSIST" -eq 1 ]; then
+        janus_bind_load_ops resolve safety persist
+    else
+        janus_bind_load_ops resolve safety apply
+    fi
 
     printf '=== Janus VFIO Bind v%s ===\n' "$JANUS_BIND_VERSION"
 
@@ -54,6 +70,11 @@ janus_bind_main() {
         return 0
     fi
 
+    if [ "$JANUS_BIND_UNPERSIST" -eq 1 ]; then
+        janus_bind_unpersist_last
+        return 0
+    fi
+
     janus_bind_validate_environment
     janus_bind_resolve_targets
 
@@ -62,6 +83,11 @@ janus_bind_main() {
         janus_bind_confirm "Continue despite unsafe IOMMU group?" || exit 1
     }
 
+    if [ "$JANUS_BIND_PERSIST" -eq 1 ]; then
+        janus_bind_persist
+        return 0
+    fi
+
     if [ "$JANUS_BIND_MODE" = "dry-run" ]; then
         janus_bind_dry_run
         return 0
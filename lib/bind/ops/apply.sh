@@ -89,7 +89,7 @@ janus_bind_rollback_last() {
 
     janus_bind_require_root
 
-    last_state="$(ls -t "$JANUS_BIND_STATE_DIR"/bind_*.state 2>/dev/null | head -n1)"
+    last_state="$(ls -t "$JANUS_BIND_STATE_DIR"/bind_*.state 2>/dev/null | head -n1 || true)"
     [ -n "$last_state" ] || janus_bind_die "No previous bind state found."
 
     janus_bind_log_info "Rolling back using $last_state"
@@ -0,0 +1,471 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Bind Persistent Mode
+# ----------------------------------------------------------------------------
+# This file generates early-boot vfio-pci configuration (modprobe.d ids,
+# softdep ordering, initramfs includes) and rolls it back.
+#
+# JANUS_BIND_SYSTEM_ROOT prefixes every /etc path so the files can be
+# staged against a fixture tree; initramfs regeneration is skipped then.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_BIND_OP_PERSIST_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_BIND_OP_PERSIST_LOADED=1
+
+JANUS_BIND_PERSIST_MODPROBE_FILE="/etc/modprobe.d/janus-vfio.conf"
+JANUS_BIND_PERSIST_DRACUT_FILE="/etc/dracut.conf.d/janus-vfio.conf"
+JANUS_BIND_PERSIST_MKINITCPIO_FILE="/etc/mkinitcpio.conf.d/janus-vfio.conf"
+JANUS_BIND_PERSIST_INITRAMFS_TOOLS_FILE="/etc/initramfs-tools/modules"
+
+# Modules that must be in the initramfs so vfio-pci claims devices first.
+JANUS_BIND_PERSIST_EARLY_MODULES=(vfio_pci vfio vfio_iommu_type1)
+
+JANUS_BIND_PERSIST_IDS=()
+JANUS_BIND_PERSIST_SOFTDEPS=()
+JANUS_BIND_PERSIST_FILES=()
+
+# Return success when value is a supported initramfs generator.
+janus_bind_is_initramfs_tool() {
+    case "$1" in
+        dracut|mkinitcpio|initramfs-tools|none) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
+# Detect the initramfs generator used by the (possibly prefixed) system.
+janus_bind_detect_initramfs_tool() {
+    local root="$JANUS_BIND_SYSTEM_ROOT"
+
+    if [ -f "$root/etc/mkinitcpio.conf" ]; then
+        printf '%s' "mkinitcpio"
+    elif [ -d "$root/etc/dracut.conf.d" ] || [ -f "$root/etc/dracut.conf" ]; then
+        printf '%s' "dracut"
+    elif [ -d "$root/etc/initramfs-tools" ]; then
+        printf '%s' "initramfs-tools"
+    else
+        printf '%s' "none"
+    fi
+}
+
+# Resolve the kernel module that provides a bound PCI driver.
+# Fails for built-in drivers, which have no module link.
+janus_bind_driver_module() {
+    local driver="$1"
+    local module_link="/sys/bus/pci/drivers/$driver/module"
+
+    [ -e "$module_link" ] || return 1
+    basename "$(readlink -f "$module_link")"
+}
+
+# Read the host driver recorded for a device by the latest runtime bind.
+janus_bind_recorded_old_driver() {
+    local pci="$1"
+    local state=""
+
+    for state in $(ls -t "$JANUS_BIND_STATE_DIR"/bind_*.state 2>/dev/null || true); do
+        awk -v pci="$pci" '
+            $0 == "DEVICE=" pci { found = 1; next }
+            found && /^OLD_DRIVER=/ { sub(/^OLD_DRIVER=/, ""); print; exit }
+            /^---$/ { found = 0 }
+        ' "$state" | grep -v '^none$' && return 0
+    done
+
+    return 1
+}
+
+# Collect vendor:device ids and host driver modules of the target devices.
+janus_bind_persist_collect() {
+    local pci=""
+    local id=""
+    local driver=""
+    local dev=""
+    local other_id=""
+    local target=""
+    local module=""
+    local is_target=0
+
+    JANUS_BIND_PERSIST_IDS=()
+    JANUS_BIND_PERSIST_SOFTDEPS=()
+
+    for pci in "${JANUS_BIND_DEVICES[@]}"; do
+        id="$(janus_bind_pci_vendor_device "$pci")" || janus_bind_die "Unable to read vendor/device for $pci"
+        driver="$(janus_bind_pci_driver "$pci")"
+
+        JANUS_BIND_PERSIST_IDS+=("$id")
+
+        # Devices already moved by a runtime bind still need their host driver ordered.
+        if [ "$driver" = "vfio-pci" ]; then
+            driver="$(janus_bind_recorded_old_driver "$pci")" || driver="none"
+        fi
+        [ "$driver" != "none" ] || continue
+
+        if module="$(janus_bind_driver_module "$driver")"; then
+            JANUS_BIND_PERSIST_SOFTDEPS+=("$module")
+        else
+            janus_bind_log_warn "Driver $driver ($pci) is built into the kernel; vfio-pci ids= cannot claim the device before it."
+        fi
+    done
+
+    mapfile -t JANUS_BIND_PERSIST_IDS < <(printf '%s\n' "${JANUS_BIND_PERSIST_IDS[@]}" | sort -u)
+    if [ "${#JANUS_BIND_PERSIST_SOFTDEPS[@]}" -gt 0 ]; then
+        mapfile -t JANUS_BIND_PERSIST_SOFTDEPS < <(printf '%s\n' "${JANUS_BIND_PERSIST_SOFTDEPS[@]}" | sort -u)
+    fi
+
+    # ids= matches by vendor:device, so identical cards elsewhere are claimed too.
+    for dev in /sys/bus/pci/devices/*; do
+        [ -e "$dev" ] || continue
+        other_id="$(janus_bind_pci_vendor_device "$(basename "$dev")")" || continue
+
+        is_target=0
+        for target in "${JANUS_BIND_DEVICES[@]}"; do
+            [ "$target" = "$(basename "$dev")" ] && is_target=1
+        done
+
+        for id in "${JANUS_BIND_PERSIST_IDS[@]}"; do
+            if [ "$is_target" -eq 0 ] && [ "$other_id" = "$id" ]; then
+                janus_bind_log_warn "$(basename "$dev") shares id $id and will also be claimed by vfio-pci at boot."
+            fi
+        done
+    done
+}
+
+# Render the modprobe.d file with vfio-pci ids and softdep ordering.
+# Usage:
+#   janus_bind_persist_render_modprobe "ID,ID" [MODULE...]
+janus_bind_persist_render_modprobe() {
+    local ids="$1"
+    local module=""
+    shift
+
+    printf '# Generated by Janus: bind passthrough devices to vfio-pci at boot\n'
+    printf 'options vfio-pci ids=%s\n' "$ids"
+    for module in "$@"; do
+        printf 'softdep %s pre: vfio-pci\n' "$module"
+    done
+}
+
+# Render the dracut drop-in that forces vfio modules into the initramfs.
+janus_bind_persist_render_dracut() {
+    printf '# Generated by Janus: load vfio-pci from the initramfs\n'
+    printf 'force_drivers+=" %s "\n' "${JANUS_BIND_PERSIST_EARLY_MODULES[*]}"
+}
+
+# Render the mkinitcpio drop-in that adds vfio modules to MODULES.
+janus_bind_persist_render_mkinitcpio() {
+    printf '# Generated by Janus: load vfio-pci from the initramfs\n'
+    printf 'MODULES+=(%s)\n' "${JANUS_BIND_PERSIST_EARLY_MODULES[*]}"
+}
+
+# Print FILE without the Janus block.
+janus_bind_persist_strip_block() {
+    sed '/^# BEGIN janus-vfio$/,/^# END janus-vfio$/d' "$1"
+}
+
+# Render initramfs-tools/modules: existing content plus a Janus block.
+janus_bind_persist_render_initramfs_tools() {
+    local current_file="$1"
+    local module=""
+
+    if [ -f "$current_file" ]; then
+        janus_bind_persist_strip_block "$current_file"
+    fi
+
+    printf '# BEGIN janus-vfio\n'
+    for module in "${JANUS_BIND_PERSIST_EARLY_MODULES[@]}"; do
+        printf '%s\n' "$module"
+    done
+    printf '# END janus-vfio\n'
+}
+
+# Map an initramfs tool to the file Janus manages for it.
+janus_bind_persist_initramfs_file() {
+    case "$1" in
+        dracut) printf '%s' "$JANUS_BIND_PERSIST_DRACUT_FILE" ;;
+        mkinitcpio) printf '%s' "$JANUS_BIND_PERSIST_MKINITCPIO_FILE" ;;
+        initramfs-tools) printf '%s' "$JANUS_BIND_PERSIST_INITRAMFS_TOOLS_FILE" ;;
+    esac
+}
+
+# Render proposed files into STAGE_DIR (mirroring /etc) and record their
+# paths in JANUS_BIND_PERSIST_FILES.
+janus_bind_persist_stage() {
+    local stage_dir="$1"
+    local tool="$2"
+    local ids=""
+    local initramfs_file=""
+
+    ids="$(IFS=,; printf '%s' "${JANUS_BIND_PERSIST_IDS[*]}")"
+    JANUS_BIND_PERSIST_FILES=("$JANUS_BIND_PERSIST_MODPROBE_FILE")
+
+    rm -rf "$stage_dir"
+    mkdir -p "$stage_dir$(dirname "$JANUS_BIND_PERSIST_MODPROBE_FILE")" \
+        || janus_bind_die "Unable to create staging directory: $stage_dir"
+
+    janus_bind_persist_render_modprobe "$ids" "${JANUS_BIND_PERSIST_SOFTDEPS[@]}" \
+        > "$stage_dir$JANUS_BIND_PERSIST_MODPROBE_FILE"
+
+    [ "$tool" != "none" ] || return 0
+
+    initramfs_file="$(janus_bind_persist_initramfs_file "$tool")"
+    mkdir -p "$stage_dir$(dirname "$initramfs_file")"
+
+    case "$tool" in
+        dracut)
+            janus_bind_persist_render_dracut > "$stage_dir$initramfs_file"
+            ;;
+        mkinitcpio)
+            janus_bind_persist_render_mkinitcpio > "$stage_dir$initramfs_file"
+            ;;
+        initramfs-tools)
+            janus_bind_persist_render_initramfs_tools "$JANUS_BIND_SYSTEM_ROOT$initramfs_file" \
+                > "$stage_dir$initramfs_file"
+            ;;
+    esac
+    JANUS_BIND_PERSIST_FILES+=("$initramfs_file")
+}
+
+# Print a unified diff between installed and staged files; fail when identical.
+janus_bind_persist_preview() {
+    local stage_dir="$1"
+    shift
+
+    local file=""
+    local current=""
+    local changed=1
+
+    for file in "$@"; do
+        current="$JANUS_BIND_SYSTEM_ROOT$file"
+        [ -f "$current" ] || current="/dev/null"
+
+        if cmp -s "$current" "$stage_dir$file"; then
+            janus_bind_log_info "Unchanged: $file"
+            continue
+        fi
+
+        diff -u --label "a$file" --label "b$file" "$current" "$stage_dir$file" || true
+        changed=0
+    done
+
+    return "$changed"
+}
+
+# Regenerate the initramfs with the detected tool.
+janus_bind_regenerate_initramfs() {
+    local tool="$1"
+    local cmd=()
+
+    case "$tool" in
+        dracut) cmd=(dracut --force) ;;
+        mkinitcpio) cmd=(mkinitcpio -P) ;;
+        initramfs-tools) cmd=(update-initramfs -u) ;;
+        *)
+            janus_bind_log_warn "No initramfs generator detected; vfio-pci may load after the host GPU driver."
+            return 0
+            ;;
+    esac
+
+    # A staging prefix is not the running system; never rebuild its initramfs.
+    if [ -n "$JANUS_BIND_SYSTEM_ROOT" ]; then
+        janus_bind_log_info "System root is $JANUS_BIND_SYSTEM_ROOT; skipping: ${cmd[*]}"
+        return 0
+    fi
+
+    if ! command -v "${cmd[0]}" >/dev/null 2>&1; then
+        janus_bind_log_warn "${cmd[0]} not found; regenerate the initramfs manually."
+        return 0
+    fi
+
+    janus_bind_log_info "Regenerating initramfs: ${cmd[*]}"
+    "${cmd[@]}" || janus_bind_die "Initramfs regeneration failed: ${cmd[*]}"
+    janus_bind_log_ok "Initramfs regenerated."
+}
+
+# Install staged files, backing up originals and recording rollback state.
+# An existing STATE_FILE is updated in place: files it already records keep
+# their pre-Janus backup, so a single restore always undoes every run.
+janus_bind_persist_install() {
+    local stage_dir="$1"
+    local state_file="$2"
+    local tool="$3"
+    shift 3
+
+    local backup_dir="${state_file%.state}.backup"
+    local file=""
+    local backup=""
+    local recorded=""
+
+    [ ! -f "$state_file" ] || recorded="$(awk 'seen; /^---$/ { seen = 1 }' "$state_file")"
+
+    {
+        printf 'IDS=%s\n' "$(IFS=,; printf '%s' "${JANUS_BIND_PERSIST_IDS[*]}")"
+        printf 'INITRAMFS=%s\n' "$tool"
+        printf '%s\n' '---'
+        [ -z "$recorded" ] || printf '%s\n' "$recorded"
+    } > "$state_file.tmp" && mv -f "$state_file.tmp" "$state_file" \
+        || janus_bind_die "Unable to write persist state: $state_file"
+
+    for file in "$@"; do
+        if printf '%s\n' "$recorded" | grep -qxF "FILE=$file"; then
+            install -D -m 0644 "$stage_dir$file" "$JANUS_BIND_SYSTEM_ROOT$file" \
+                || janus_bind_die "Failed to install $JANUS_BIND_SYSTEM_ROOT$file"
+            janus_bind_log_ok "Updated: $JANUS_BIND_SYSTEM_ROOT$file"
+            continue
+        fi
+
+        backup="none"
+
+        # Shared with other packages and the admin: undo only the Janus block.
+        if [ "$file" = "$JANUS_BIND_PERSIST_INITRAMFS_TOOLS_FILE" ]; then
+            backup="block"
+        elif [ -f "$JANUS_BIND_SYSTEM_ROOT$file" ]; then
+            backup="$backup_dir$file"
+            mkdir -p "$(dirname "$backup")"
+            cp -p "$JANUS_BIND_SYSTEM_ROOT$file" "$backup" || janus_bind_die "Unable to back up $file"
+        fi
+
+        {
+            printf 'FILE=%s\n' "$file"
+            printf 'BACKUP=%s\n' "$backup"
+            printf '%s\n' '---'
+        } >> "$state_file"
+
+        install -D -m 0644 "$stage_dir$file" "$JANUS_BIND_SYSTEM_ROOT$file" \
+            || janus_bind_die "Failed to install $JANUS_BIND_SYSTEM_ROOT$file"
+        janus_bind_log_ok "Installed: $JANUS_BIND_SYSTEM_ROOT$file"
+    done
+}
+
+# Restore files recorded in a persist state file and drop the state.
+# Pass REGENERATE=0 to leave the initramfs rebuild to the caller.
+# Usage:
+#   janus_bind_persist_restore STATE_FILE [REGENERATE]
+janus_bind_persist_restore() {
+    local state_file="$1"
+    local regenerate="${2:-1}"
+    local line=""
+    local file=""
+    local backup=""
+    local tool="none"
+
+    while IFS= read -r line; do
+        case "$line" in
+            INITRAMFS=*)
+                tool="${line#INITRAMFS=}"
+                ;;
+            FILE=*)
+                file="${line#FILE=}"
+                ;;
+            BACKUP=*)
+                backup="${line#BACKUP=}"
+                ;;
+            ---)
+                # Older states kept a full copy of the shared modules file too.
+                [ "$file" != "$JANUS_BIND_PERSIST_INITRAMFS_TOOLS_FILE" ] || backup="block"
+
+                if [ -n "$file" ]; then
+                    if [ "$backup" = "block" ]; then
+                        if [ -f "$JANUS_BIND_SYSTEM_ROOT$file" ]; then
+                            janus_bind_persist_strip_block "$JANUS_BIND_SYSTEM_ROOT$file" > "$state_file.strip" \
+                                && cat "$state_file.strip" > "$JANUS_BIND_SYSTEM_ROOT$file" \
+                                || janus_bind_die "Failed to remove the Janus block from $file"
+                            rm -f "$state_file.strip"
+                            janus_bind_log_ok "Removed Janus block: $JANUS_BIND_SYSTEM_ROOT$file"
+                        fi
+                    elif [ "$backup" = "none" ]; then
+                        rm -f "$JANUS_BIND_SYSTEM_ROOT$file" || janus_bind_die "Failed to remove $file"
+                        janus_bind_log_ok "Removed: $JANUS_BIND_SYSTEM_ROOT$file"
+                    else
+                        [ -f "$backup" ] || janus_bind_die "Missing backup for $file: $backup"
+                        cp -p "$backup" "$JANUS_BIND_SYSTEM_ROOT$file" || janus_bind_die "Failed to restore $file"
+                        janus_bind_log_ok "Restored: $JANUS_BIND_SYSTEM_ROOT$file"
+                    fi
+                fi
+
+                file=""
+                backup=""
+                ;;
+        esac
+    done < "$state_file"
+
+    [ "$regenerate" -eq 0 ] || janus_bind_regenerate_initramfs "$tool"
+
+    rm -rf "${state_file%.state}.backup"
+    rm -f "$state_file"
+}
+
+# Preview (dry-run) or write persistent vfio-pci boot configuration.
+janus_bind_persist() {
+    local tool="$JANUS_BIND_INITRAMFS"
+    local stage_dir="$JANUS_BIND_STATE_DIR/persist_stage"
+    local state_file=""
+
+    [ -n "$tool" ] || tool="$(janus_bind_detect_initramfs_tool)"
+
+    janus_bind_persist_collect
+
+    janus_bind_log_info "vfio-pci ids: $(IFS=,; printf '%s' "${JANUS_BIND_PERSIST_IDS[*]}")"
+    janus_bind_log_info "Initramfs generator: $tool"
+
+    # softdep lines only reach the initramfs when the modconf hook copies modprobe.d.
+    if [ "$tool" = "mkinitcpio" ] \
+        && ! grep -Eq '^HOOKS=.*\bmodconf\b' "$JANUS_BIND_SYSTEM_ROOT/etc/mkinitcpio.conf" 2>/dev/null; then
+        janus_bind_log_warn "mkinitcpio HOOKS has no modconf; vfio-pci ids/softdep will not be applied early."
+    fi
+
+    janus_bind_persist_stage "$stage_dir" "$tool"
+
+    if ! janus_bind_persist_preview "$stage_dir" "${JANUS_BIND_PERSIST_FILES[@]}"; then
+        janus_bind_log_ok "Persistent vfio-pci configuration is already up to date."
+        return 0
+    fi
+
+    if [ "$JANUS_BIND_MODE" = "dry-run" ]; then
+        janus_bind_log_info "DRY RUN - re-run with --apply to write these files."
+        return 0
+    fi
+
+    janus_bind_require_root
+    janus_bind_confirm "Write persistent vfio-pci boot configuration now?" || return 0
+
+    # Reuse the existing state so its backups stay the pre-Janus originals.
+    state_file="$(ls -t "$JANUS_BIND_STATE_DIR"/persist_*.state 2>/dev/null | head -n1 || true)"
+    if [ -n "$state_file" ]; then
+        janus_bind_log_info "Updating persist state $state_file (original backups are kept)"
+    else
+        state_file="$JANUS_BIND_STATE_DIR/persist_$(date +%Y%m%d_%H%M%S).state"
+        janus_bind_log_info "Saving persist state to $state_file"
+    fi
+
+    janus_bind_persist_install "$stage_dir" "$state_file" "$tool" "${JANUS_BIND_PERSIST_FILES[@]}"
+    janus_bind_regenerate_initramfs "$tool"
+
+    janus_bind_log_ok "Persistent vfio-pci binding configured. Reboot to apply; undo with --unpersist."
+}
+
+# Undo the persistent vfio-pci configuration and drop every persist state.
+# States are restored newest first, so files end up as they were before the
+# first Janus run even when older releases stacked one state per run.
+janus_bind_unpersist_last() {
+    local states=()
+    local state=""
+    local tool=""
+
+    janus_bind_require_root
+
+    mapfile -t states < <(ls -t "$JANUS_BIND_STATE_DIR"/persist_*.state 2>/dev/null || true)
+    [ "${#states[@]}" -gt 0 ] || janus_bind_die "No persistent vfio-pci state found."
+
+    janus_bind_log_info "Removing persistent vfio-pci configuration recorded in: ${states[*]}"
+    janus_bind_confirm "Restore boot configuration from ${#states[@]} persist state(s)?" || return 0
+
+    tool="$(sed -n 's/^INITRAMFS=//p' "${states[0]}" | head -n1)"
+    for state in "${states[@]}"; do
+        janus_bind_persist_restore "$state" 0
+    done
+    janus_bind_regenerate_initramfs "${tool:-none}"
+
+    janus_bind_log_ok "Persistent vfio-pci binding removed. Reboot to return devices to their host drivers."
+}
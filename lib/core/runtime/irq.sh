@@ -0,0 +1,341 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Runtime IRQ Affinity
+# ----------------------------------------------------------------------------
+# This file steers vfio MSI/MSI-X interrupts of passthrough devices onto a
+# chosen CPU list and restores the original affinity afterwards.
+#
+# Root paths are overridable so the logic can run against fixture trees:
+# - JANUS_IRQ_PROC_ROOT (default: /proc)
+# - JANUS_IRQ_SYS_ROOT  (default: /sys)
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_RUNTIME_IRQ_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_RUNTIME_IRQ_LOADED=1
+
+# Sourced by bare file name, BASH_SOURCE has no directory part to strip.
+JANUS_RUNTIME_LIB_DIR="${BASH_SOURCE[0]%/*}"
+[ "$JANUS_RUNTIME_LIB_DIR" != "${BASH_SOURCE[0]}" ] || JANUS_RUNTIME_LIB_DIR="."
+# shellcheck source=logging.sh
+source "$JANUS_RUNTIME_LIB_DIR/logging.sh"
+
+JANUS_IRQ_PROC_ROOT="${JANUS_IRQ_PROC_ROOT:-/proc}"
+JANUS_IRQ_SYS_ROOT="${JANUS_IRQ_SYS_ROOT:-/sys}"
+
+# irqbalance rewrites smp_affinity periodically and would undo the pinning.
+# "stop" pauses the service while IRQs are pinned; "ignore" leaves it alone.
+JANUS_IRQ_IRQBALANCE_MODE="${JANUS_IRQ_IRQBALANCE_MODE:-stop}"
+
+# IRQs written by the last janus_irq_pin_devices call.
+JANUS_IRQ_PINNED=0
+
+# Optional function called with another state file; it returns 1 when the VM
+# owning that file is no longer running. Empty: only the boot id is checked.
+JANUS_IRQ_OWNER_CHECK="${JANUS_IRQ_OWNER_CHECK:-}"
+
+# Live state files (same boot, owner running) that keep irqbalance paused,
+# and whether janus_irq_scan_holders dropped a stale file that paused it.
+JANUS_IRQ_HOLDERS=()
+JANUS_IRQ_STALE_HELD=0
+
+# Return success when value is a kernel cpulist (example: 2-5,8,10-11).
+janus_irq_is_cpulist() {
+    [[ "$1" =~ ^[0-9]+(-[0-9]+)?(,[0-9]+(-[0-9]+)?)*$ ]]
+}
+
+# List vfio MSI/MSI-X IRQ numbers owned by a PCI device, one per line.
+janus_irq_device_irqs() {
+    local pci="$1"
+    local msi_dir="$JANUS_IRQ_SYS_ROOT/bus/pci/devices/$pci/msi_irqs"
+    local interrupts_file="$JANUS_IRQ_PROC_ROOT/interrupts"
+    local entry=""
+
+    {
+        if [ -d "$msi_dir" ]; then
+            for entry in "$msi_dir"/*; do
+                [ -e "$entry" ] && basename "$entry"
+            done
+        fi
+
+        if [ -r "$interrupts_file" ]; then
+            awk -v pci="$pci" '
+                /vfio-msix?\[[0-9]+\]\(/ && index($0, "(" pci ")") {
+                    sub(/:$/, "", $1)
+                    print $1
+                }
+            ' "$interrupts_file"
+        fi
+    } | grep -E '^[0-9]+$' | sort -n -u
+}
+
+# Print the CPUs of a cpulist one per line, so equivalent lists compare equal.
+janus_irq_expand_cpulist() {
+    local part=""
+    local cpu=0
+    local parts=()
+
+    IFS=',' read -r -a parts <<< "$1"
+    for part in "${parts[@]}"; do
+        if [[ "$part" == *-* ]]; then
+            for ((cpu = ${part%-*}; cpu <= ${part#*-}; cpu++)); do
+                printf '%s\n' "$cpu"
+            done
+        else
+            printf '%s\n' "$part"
+        fi
+    done | sort -n -u
+}
+
+# Wait up to TIMEOUT seconds until any of the given devices owns vfio IRQs.
+# vfio only allocates them once the guest driver enables MSI/MSI-X.
+janus_irq_wait_device_irqs() {
+    local timeout="$1"
+    shift || true
+
+    local waited=0
+    local pci=""
+
+    while :; do
+        for pci in "$@"; do
+            [ -z "$(janus_irq_device_irqs "$pci")" ] || return 0
+        done
+
+        [ "$waited" -lt "$timeout" ] || return 1
+        sleep 1
+        waited=$((waited + 1))
+    done
+}
+
+# Print the kernel boot id; IRQ numbers in state from another boot are stale.
+janus_irq_boot_id() {
+    cat "$JANUS_IRQ_PROC_ROOT/sys/kernel/random/boot_id" 2>/dev/null || true
+}
+
+# Return success when STATE_FILE was written this boot by a VM still running.
+janus_irq_state_is_live() {
+    local state_file="$1"
+
+    grep -qx "BOOT_ID=$(janus_irq_boot_id)" "$state_file" 2>/dev/null || return 1
+    [ -z "$JANUS_IRQ_OWNER_CHECK" ] || "$JANUS_IRQ_OWNER_CHECK" "$state_file"
+}
+
+# Return success when the irqbalance service is currently active.
+janus_irq_irqbalance_active() {
+    command -v systemctl >/dev/null 2>&1 || return 1
+    systemctl is-active --quiet irqbalance 2>/dev/null
+}
+
+# Pin vfio IRQs of the given PCI devices and record their original affinity.
+# Safe to repeat while the VM runs: vfio frees and re-requests IRQs whenever
+# the guest reprograms MSI, so new IRQ numbers are added to the state file and
+# recorded IRQs whose affinity was reset are pinned again. JANUS_IRQ_PINNED is
+# set to the number of IRQs written by this call.
+# Usage:
+#   janus_irq_pin_devices STATE_FILE CPULIST PCI [PCI...]
+janus_irq_pin_devices() {
+    local state_file="$1"
+    local cpulist="$2"
+    shift 2 || true
+
+    local pci=""
+    local irq=""
+    local affinity_file=""
+    local old_affinity=""
+    local wanted=""
+
+    JANUS_IRQ_PINNED=0
+
+    janus_irq_is_cpulist "$cpulist" || {
+        janus_log_error "Invalid IRQ cpulist: $cpulist"
+        return 1
+    }
+    wanted="$(janus_irq_expand_cpulist "$cpulist")"
+
+    # IRQ numbers recorded before a reboot may now belong to other devices.
+    if [ -f "$state_file" ] && ! grep -qx "BOOT_ID=$(janus_irq_boot_id)" "$state_file"; then
+        janus_log_info "IRQ state is from a previous boot; dropping it: $state_file"
+        janus_irq_discard "$state_file"
+    fi
+
+    if [ ! -f "$state_file" ] && ! printf 'BOOT_ID=%s\n%s\n' "$(janus_irq_boot_id)" '---' > "$state_file"; then
+        janus_log_error "Unable to write IRQ state file: $state_file"
+        return 1
+    fi
+
+    for pci in "$@"; do
+        while IFS= read -r irq; do
+            [ -n "$irq" ] || continue
+            affinity_file="$JANUS_IRQ_PROC_ROOT/irq/$irq/smp_affinity_list"
+
+            if [ ! -w "$affinity_file" ]; then
+                janus_log_warn "IRQ $irq ($pci) affinity is not writable: $affinity_file"
+                continue
+            fi
+
+            old_affinity="$(cat "$affinity_file" 2>/dev/null || true)"
+
+            if grep -qx "IRQ=$irq" "$state_file"; then
+                # Already ours; only act when vfio reset the affinity.
+                [ "$(janus_irq_expand_cpulist "$old_affinity")" != "$wanted" ] || continue
+
+                if printf '%s\n' "$cpulist" > "$affinity_file" 2>/dev/null; then
+                    janus_log_ok "IRQ $irq ($pci) re-pinned to CPUs $cpulist (was reset to: ${old_affinity:-unknown})"
+                    JANUS_IRQ_PINNED=$((JANUS_IRQ_PINNED + 1))
+                else
+                    janus_log_warn "Kernel rejected affinity $cpulist for IRQ $irq ($pci)."
+                fi
+                continue
+            fi
+
+            if ! printf '%s\n' "$cpulist" > "$affinity_file" 2>/dev/null; then
+                janus_log_warn "Kernel rejected affinity $cpulist for IRQ $irq ($pci)."
+                continue
+            fi
+
+            {
+                printf 'IRQ=%s\n' "$irq"
+                printf 'DEVICE=%s\n' "$pci"
+                printf 'OLD_AFFINITY=%s\n' "$old_affinity"
+                printf '%s\n' '---'
+            } >> "$state_file"
+
+            janus_log_ok "IRQ $irq ($pci) pinned to CPUs $cpulist (was: ${old_affinity:-unknown})"
+            JANUS_IRQ_PINNED=$((JANUS_IRQ_PINNED + 1))
+        done < <(janus_irq_device_irqs "$pci")
+    done
+
+    # Only pause irqbalance once there is something for it to undo.
+    if [ "$JANUS_IRQ_PINNED" -gt 0 ] && [ "$JANUS_IRQ_IRQBALANCE_MODE" = "stop" ] \
+        && ! grep -qx 'IRQBALANCE_STOPPED=1' "$state_file"; then
+        janus_irq_scan_holders "$state_file"
+        if [ "${#JANUS_IRQ_HOLDERS[@]}" -gt 0 ]; then
+            # Another pinned VM already paused it; take a reference.
+            printf 'IRQBALANCE_STOPPED=1\n%s\n' '---' >> "$state_file"
+        elif janus_irq_irqbalance_active; then
+            janus_log_info "Stopping irqbalance so pinned IRQs are not rebalanced."
+            if systemctl stop irqbalance >/dev/null 2>&1; then
+                printf 'IRQBALANCE_STOPPED=1\n%s\n' '---' >> "$state_file"
+            else
+                janus_log_warn "Unable to stop irqbalance; pinned IRQs may drift."
+            fi
+        elif [ "$JANUS_IRQ_STALE_HELD" -eq 1 ]; then
+            # Paused for a VM that is gone; take over its reference.
+            printf 'IRQBALANCE_STOPPED=1\n%s\n' '---' >> "$state_file"
+        fi
+    fi
+
+    return 0
+}
+
+# Collect other state files next to STATE_FILE that keep irqbalance paused
+# into JANUS_IRQ_HOLDERS. Every VM pinned with irqbalance mode "stop" holds a
+# reference, so stopping one VM does not let irqbalance rebalance another.
+# Files left by a guest that stopped outside Janus or by an earlier boot are
+# removed instead; JANUS_IRQ_STALE_HELD records that one of them paused it.
+janus_irq_scan_holders() {
+    local state_file="$1"
+    local other=""
+
+    JANUS_IRQ_HOLDERS=()
+    JANUS_IRQ_STALE_HELD=0
+
+    for other in "${state_file%/*}"/*.state; do
+        [ -f "$other" ] || continue
+        [ "$other" != "$state_file" ] || continue
+        grep -qx 'IRQBALANCE_STOPPED=1' "$other" || continue
+
+        if janus_irq_state_is_live "$other"; then
+            JANUS_IRQ_HOLDERS+=("$other")
+        else
+            janus_log_info "Dropping stale IRQ state: $other"
+            rm -f "$other"
+            JANUS_IRQ_STALE_HELD=1
+        fi
+    done
+}
+
+# Restart irqbalance for a released reference unless a live VM still holds it.
+janus_irq_release_irqbalance() {
+    local state_file="$1"
+
+    janus_irq_scan_holders "$state_file"
+    if [ "${#JANUS_IRQ_HOLDERS[@]}" -gt 0 ]; then
+        janus_log_info "irqbalance stays paused for ${#JANUS_IRQ_HOLDERS[@]} other pinned VM(s)."
+    elif systemctl start irqbalance >/dev/null 2>&1; then
+        janus_log_ok "irqbalance restarted."
+    else
+        janus_log_warn "Unable to restart irqbalance; start it manually."
+    fi
+}
+
+# Drop a state file whose IRQs vfio has already freed (guest stopped outside
+# Janus, or a reboot) without writing its saved affinities anywhere.
+janus_irq_discard() {
+    local state_file="$1"
+    local held=0
+
+    [ -f "$state_file" ] || return 0
+
+    grep -qx 'IRQBALANCE_STOPPED=1' "$state_file" && held=1
+    rm -f "$state_file"
+    [ "$held" -eq 0 ] || janus_irq_release_irqbalance "$state_file"
+}
+
+# Restore IRQ affinity and irqbalance state saved by janus_irq_pin_devices.
+# irqbalance is restarted only when no live state file still holds it.
+janus_irq_restore() {
+    local state_file="$1"
+    local line=""
+    local irq=""
+    local old_affinity=""
+    local irqbalance_stopped=0
+    local affinity_file=""
+
+    [ -f "$state_file" ] || return 0
+
+    if ! grep -qx "BOOT_ID=$(janus_irq_boot_id)" "$state_file"; then
+        janus_log_info "IRQ state is from a previous boot; nothing to restore: $state_file"
+        janus_irq_discard "$state_file"
+        return 0
+    fi
+
+    while IFS= read -r line; do
+        case "$line" in
+            IRQBALANCE_STOPPED=*)
+                irqbalance_stopped="${line#IRQBALANCE_STOPPED=}"
+                ;;
+            IRQ=*)
+                irq="${line#IRQ=}"
+                ;;
+            OLD_AFFINITY=*)
+                old_affinity="${line#OLD_AFFINITY=}"
+                ;;
+            ---)
+                if [ -n "$irq" ]; then
+                    affinity_file="$JANUS_IRQ_PROC_ROOT/irq/$irq/smp_affinity_list"
+
+                    # vfio frees guest IRQs on shutdown, so a missing entry is expected.
+                    if [ ! -e "$affinity_file" ]; then
+                        janus_log_info "IRQ $irq no longer exists; nothing to restore."
+                    elif [ -z "$old_affinity" ]; then
+                        janus_log_warn "No saved affinity for IRQ $irq; leaving it unchanged."
+                    elif printf '%s\n' "$old_affinity" > "$affinity_file" 2>/dev/null; then
+                        janus_log_ok "IRQ $irq affinity restored to CPUs $old_affinity"
+                    else
+                        janus_log_warn "Unable to restore affinity for IRQ $irq."
+                    fi
+                fi
+
+                irq=""
+                old_affinity=""
+                ;;
+        esac
+    done < "$state_file"
+
+    rm -f "$state_file"
+
+    [ "$irqbalance_stopped" != "1" ] || janus_irq_release_irqbalance "$state_file"
+}
@@ -0,0 +1,31 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Runtime Loader
+# ----------------------------------------------------------------------------
+# This file lets command entrypoints source libraries on demand, so each
+# subcommand only parses the modules it actually runs.
+#
+# Prebuilt single-file bundles (tools/bundle.sh) inline every library and set
+# JANUS_BUNDLED=1, which turns janus_runtime_require into a no-op.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_RUNTIME_LOADER_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_RUNTIME_LOADER_LOADED=1
+
+JANUS_BUNDLED="${JANUS_BUNDLED:-}"
+
+# Source libraries by path relative to lib/ (e.g. vm/actions/create.sh).
+# Libraries keep their include guards, so repeated requires are cheap.
+janus_runtime_require() {
+    local lib=""
+
+    [ -z "$JANUS_BUNDLED" ] || return 0
+
+    for lib in "$@"; do
+        # shellcheck source=/dev/null
+        source "$JANUS_ROOT_DIR/lib/$lib" || return 1
+    done
+}
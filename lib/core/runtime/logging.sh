@@ -4,6 +4,13 @@
 # Janus Runtime Logging
 # ----------------------------------------------------------------------------
 # This file defines shared logging helpers and session log wiring.
+#
+# Two session modes exist:
+# - janus_runtime_start_logging mirrors all command output into the log files
+#   right away (used by commands that change host or VM state);
+# - janus_runtime_defer_logging only remembers the log prefix; log files are
+#   created when the first message is logged and receive log lines only, so
+#   read-only commands that log nothing never touch the filesystem.
 # ----------------------------------------------------------------------------
 
 if [ -n "${JANUS_RUNTIME_LOGGING_LOADED:-}" ]; then
@@ -11,12 +18,17 @@ if [ -n "${JANUS_RUNTIME_LOGGING_LOADED:-}" ]; then
 fi
 JANUS_RUNTIME_LOGGING_LOADED=1
 
+# Sourced by bare file name, BASH_SOURCE has no directory part to strip.
+JANUS_RUNTIME_LIB_DIR="${BASH_SOURCE[0]%/*}"
+[ "$JANUS_RUNTIME_LIB_DIR" != "${BASH_SOURCE[0]}" ] || JANUS_RUNTIME_LIB_DIR="."
 # shellcheck source=paths.sh
-source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/paths.sh"
+source "$JANUS_RUNTIME_LIB_DIR/paths.sh"
 
 JANUS_LOG_ENABLE_COLOR="${JANUS_LOG_ENABLE_COLOR:-1}"
 JANUS_LOG_FILE="${JANUS_LOG_FILE:-}"
 JANUS_MAIN_LOG_FILE="${JANUS_MAIN_LOG_FILE:-}"
+JANUS_LOG_DEFERRED_PREFIX=""
+JANUS_LOG_STAMP=""
 
 # Map log levels to ANSI colors.
 janus_log_color() {
@@ -49,6 +61,8 @@ janus_log() {
     else
         printf '[%s] %s\n' "$level" "$message"
     fi
+
+    [ -z "$JANUS_LOG_DEFERRED_PREFIX" ] || janus_runtime_write_deferred_log "$level" "$message"
 }
 
 janus_log_info() { janus_log INFO "$*"; }
@@ -70,7 +84,10 @@ janus_runtime_start_logging() {
         return 1
     }
 
-    JANUS_LOG_FILE="$log_dir/${prefix}_$(date +%Y%m%d_%H%M%S).log"
+    # A deferred session may already have written lines; keep its file.
+    JANUS_LOG_DEFERRED_PREFIX=""
+    [ -n "$JANUS_LOG_STAMP" ] || printf -v JANUS_LOG_STAMP '%(%Y%m%d_%H%M%S)T' -1
+    JANUS_LOG_FILE="$log_dir/${prefix}_${JANUS_LOG_STAMP}.log"
     JANUS_MAIN_LOG_FILE="$log_dir/janus.log"
 
     if ! command -v tee >/dev/null 2>&1; then
@@ -106,3 +123,36 @@ janus_runtime_start_logging() {
     export JANUS_LOG_FILE
     export JANUS_MAIN_LOG_FILE
 }
+
+# Arm logging for PREFIX without creating log files yet.
+janus_runtime_defer_logging() {
+    JANUS_LOG_DEFERRED_PREFIX="${1:-janus}"
+    printf -v JANUS_LOG_STAMP '%(%Y%m%d_%H%M%S)T' -1
+
+    # Files inherited from a parent Janus command belong to its session.
+    JANUS_LOG_FILE=""
+    JANUS_MAIN_LOG_FILE=""
+}
+
+# Append one log line to the deferred session files, creating them on first use.
+janus_runtime_write_deferred_log() {
+    local level="$1"
+    local message="$2"
+    local log_dir=""
+
+    if [ -z "$JANUS_LOG_FILE" ]; then
+        log_dir="$(janus_runtime_resolve_log_dir)" || {
+            JANUS_LOG_DEFERRED_PREFIX=""
+            echo "[WARN] Unable to resolve log directory; logging to terminal only." >&2
+            return 0
+        }
+
+        JANUS_LOG_FILE="$log_dir/${JANUS_LOG_DEFERRED_PREFIX}_${JANUS_LOG_STAMP}.log"
+        JANUS_MAIN_LOG_FILE="$log_dir/janus.log"
+        export JANUS_LOG_FILE
+        export JANUS_MAIN_LOG_FILE
+    fi
+
+    printf '[%s] %s\n' "$level" "$message" >> "$JANUS_LOG_FILE" 2>/dev/null || true
+    printf '[%s] %s\n' "$level" "$message" >> "$JANUS_MAIN_LOG_FILE" 2>/dev/null || true
+}
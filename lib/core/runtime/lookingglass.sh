@@ -0,0 +1,125 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Runtime Looking Glass Helpers
+# ----------------------------------------------------------------------------
+# This file sizes the IVSHMEM region used by Looking Glass and renders the
+# host-side files (tmpfiles, udev, modprobe) that expose it to QEMU.
+#
+# Backends:
+# - shm:   plain file under /dev/shm (libvirt <shmem> device);
+# - kvmfr: kvmfr kernel module character device (/dev/kvmfr0).
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_RUNTIME_LOOKINGGLASS_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_RUNTIME_LOOKINGGLASS_LOADED=1
+
+JANUS_LG_SHM_NAME="looking-glass"
+JANUS_LG_SHM_PATH="/dev/shm/$JANUS_LG_SHM_NAME"
+JANUS_LG_KVMFR_PATH="/dev/kvmfr0"
+
+# Overridable so the loaded kvmfr parameters can come from a fixture tree.
+JANUS_LG_SYS_ROOT="${JANUS_LG_SYS_ROOT:-/sys}"
+
+JANUS_LG_DEFAULT_RESOLUTION="1920x1080"
+JANUS_LG_DEFAULT_BIT_DEPTH="8"
+
+# Return success when value is a supported Looking Glass mode.
+janus_lg_is_mode() {
+    case "$1" in
+        disabled|shm|kvmfr) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
+# Return success when value is a WIDTHxHEIGHT resolution.
+janus_lg_is_resolution() {
+    [[ "$1" =~ ^[1-9][0-9]*x[1-9][0-9]*$ ]]
+}
+
+# Return success when value is a supported per-channel bit depth.
+janus_lg_is_bit_depth() {
+    case "$1" in
+        8|10|16) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
+# Compute IVSHMEM size in MiB for a resolution and per-channel bit depth.
+# Looking Glass needs two frames plus ~10 MiB of headroom, and IVSHMEM
+# regions must be a power of two.
+janus_lg_size_mib() {
+    local resolution="$1"
+    local bit_depth="$2"
+    local width="${resolution%x*}"
+    local height="${resolution#*x}"
+    local bytes_per_pixel=4
+    local frame_bytes=0
+    local needed_mib=0
+    local size_mib=1
+
+    janus_lg_is_resolution "$resolution" || return 1
+    janus_lg_is_bit_depth "$bit_depth" || return 1
+
+    # 8/10-bit frames pack into 32 bits per pixel; 16-bit (FP16 HDR) needs 64.
+    [ "$bit_depth" -eq 16 ] && bytes_per_pixel=8
+
+    frame_bytes=$((width * height * bytes_per_pixel))
+    needed_mib=$(( (frame_bytes * 2 + 1048575) / 1048576 + 10 ))
+
+    while [ "$size_mib" -lt "$needed_mib" ]; do
+        size_mib=$((size_mib * 2))
+    done
+
+    printf '%s' "$size_mib"
+}
+
+# Read a KEY="value" entry from a Janus config file without sourcing it.
+janus_lg_conf_value() {
+    local conf_file="$1"
+    local key="$2"
+
+    [ -f "$conf_file" ] || return 0
+
+    sed -n "s/^${key}=\"\{0,1\}\([^\"]*\)\"\{0,1\}[[:space:]]*$/\1/p" "$conf_file" | tail -n1
+}
+
+# Render the tmpfiles.d entry that pre-creates the /dev/shm region.
+janus_lg_render_tmpfiles() {
+    local owner="$1"
+    local group="$2"
+
+    printf '# Generated by Janus: Looking Glass shared memory region\n'
+    printf 'f %s 0660 %s %s -\n' "$JANUS_LG_SHM_PATH" "$owner" "$group"
+}
+
+# Render kvmfr modprobe options for a given region size.
+janus_lg_render_kvmfr_modprobe() {
+    local size_mib="$1"
+
+    printf '# Generated by Janus: Looking Glass kvmfr region size\n'
+    printf 'options kvmfr static_size_mb=%s\n' "$size_mib"
+}
+
+# Print the region size (MiB) of /dev/kvmfr0 in the loaded kvmfr module.
+# Prints nothing when the module is not loaded.
+janus_lg_kvmfr_loaded_size_mib() {
+    local sizes=""
+
+    sizes="$(cat "$JANUS_LG_SYS_ROOT/module/kvmfr/parameters/static_size_mb" 2>/dev/null || true)"
+    # One comma-separated entry per device; the first one backs kvmfr0.
+    sizes="${sizes%%,*}"
+    [[ "$sizes" =~ ^[0-9]+$ ]] && printf '%s' "$sizes"
+    return 0
+}
+
+# Render the udev rule that grants the user access to /dev/kvmfr*.
+janus_lg_render_kvmfr_udev() {
+    local owner="$1"
+    local group="$2"
+
+    printf '# Generated by Janus: Looking Glass kvmfr device permissions\n'
+    printf 'SUBSYSTEM=="kvmfr", OWNER="%s", GROUP="%s", MODE="0660"\n' "$owner" "$group"
+}
@@ -36,6 +36,18 @@ janus_runtime_pick_writable_dir() {
     return 1
 }
 
+# Print the home directory of the user who invoked the command. Under sudo
+# HOME may point at /root, but user-scoped files belong to SUDO_USER.
+janus_runtime_invoking_home() {
+    local home=""
+
+    if [ "$(id -u)" -eq 0 ] && [ -n "${SUDO_USER:-}" ] && [ "$SUDO_USER" != "root" ]; then
+        home="$(getent passwd "$SUDO_USER" 2>/dev/null | cut -d: -f6)"
+    fi
+
+    printf '%s' "${home:-$HOME}"
+}
+
 # Create and return the runtime log directory.
 janus_runtime_resolve_log_dir() {
     local primary="${HOME:-/tmp}/.cache/janus/logs"
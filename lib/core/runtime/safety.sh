@@ -11,8 +11,11 @@ if [ -n "${JANUS_RUNTIME_SAFETY_LOADED:-}" ]; then
 fi
 JANUS_RUNTIME_SAFETY_LOADED=1
 
+# Sourced by bare file name, BASH_SOURCE has no directory part to strip.
+JANUS_RUNTIME_LIB_DIR="${BASH_SOURCE[0]%/*}"
+[ "$JANUS_RUNTIME_LIB_DIR" != "${BASH_SOURCE[0]}" ] || JANUS_RUNTIME_LIB_DIR="."
 # shellcheck source=logging.sh
-source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/logging.sh"
+source "$JANUS_RUNTIME_LIB_DIR/logging.sh"
 
 # Return success when input is interactive and at least one output stream is
 # (or was) interactive.  After janus_runtime_start_logging redirects stdout/
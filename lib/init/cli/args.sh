@@ -19,6 +19,7 @@ janus_init_show_help() {
 Usage: ./janus-init [OPTIONS]
 
 Options:
+  --apply          Install system-level Looking Glass files (requires root)
   --help, -h       Show this help
   --version, -v    Show version
 
@@ -29,6 +30,8 @@ Examples:
 Notes:
   - This command is non-destructive and does not edit kernel/boot settings.
   - It only creates Janus state/config files in your home directory.
+  - With LOOKING_GLASS="shm|kvmfr" in janus.conf, tmpfiles/udev/modprobe files
+    are staged under ~/.config/janus/looking-glass; --apply installs them.
 EOF_HELP
 
     exit "$exit_code"
@@ -41,6 +44,9 @@ janus_init_parse_args() {
             --help|-h)
                 janus_init_show_help
                 ;;
+            --apply)
+                JANUS_INIT_APPLY=1
+                ;;
             --version|-v)
                 printf 'janus-init v%s\n' "$JANUS_INIT_VERSION"
                 exit 0
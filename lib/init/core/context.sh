@@ -14,15 +14,25 @@ JANUS_INIT_CONTEXT_LOADED=1
 JANUS_INIT_VERSION="0.1"
 
 # Define user-scoped directories and files.
-JANUS_INIT_CONFIG_DIR="${HOME}/.config/janus"
-JANUS_INIT_CACHE_DIR="${HOME}/.cache/janus"
+JANUS_INIT_USER="$(id -un)"
+[ "$(id -u)" -ne 0 ] || [ -z "${SUDO_USER:-}" ] || JANUS_INIT_USER="$SUDO_USER"
+JANUS_INIT_HOME="$(janus_runtime_invoking_home)"
+JANUS_INIT_CONFIG_DIR="$JANUS_INIT_HOME/.config/janus"
+JANUS_INIT_CACHE_DIR="$JANUS_INIT_HOME/.cache/janus"
 JANUS_INIT_LOG_DIR="$JANUS_INIT_CACHE_DIR/logs"
 JANUS_INIT_STATE_DIR="$JANUS_INIT_CONFIG_DIR/state"
 JANUS_INIT_PROFILE_DIR="$JANUS_INIT_CONFIG_DIR/profiles"
+JANUS_INIT_LG_DIR="$JANUS_INIT_CONFIG_DIR/looking-glass"
 
 JANUS_INIT_CONF_FILE="$JANUS_INIT_CONFIG_DIR/janus.conf"
 JANUS_INIT_STATE_FILE="$JANUS_INIT_STATE_DIR/janus.state"
 
+# System-level installs are opt-in (--apply). The root prefix is overridable
+# so staged files can be installed into a fixture tree.
+JANUS_INIT_APPLY=0
+JANUS_INIT_SYSTEM_ROOT="${JANUS_INIT_SYSTEM_ROOT:-}"
+JANUS_INIT_SYSTEM_CHANGED=0
+
 # Track warning/info metrics for the summary.
 JANUS_INIT_WARN_COUNT=0
 JANUS_INIT_INFO_COUNT=0
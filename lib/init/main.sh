@@ -15,6 +15,8 @@ JANUS_ROOT_DIR="${JANUS_ROOT_DIR:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." &&
 
 # shellcheck source=../core/runtime/logging.sh
 source "$JANUS_ROOT_DIR/lib/core/runtime/logging.sh"
+# shellcheck source=../core/runtime/lookingglass.sh
+source "$JANUS_ROOT_DIR/lib/core/runtime/lookingglass.sh"
 # shellcheck source=core/context.sh
 source "$JANUS_ROOT_DIR/lib/init/core/context.sh"
 # shellcheck source=cli/args.sh
@@ -27,6 +29,8 @@ source "$JANUS_ROOT_DIR/lib/init/steps/config.sh"
 source "$JANUS_ROOT_DIR/lib/init/steps/state.sh"
 # shellcheck source=steps/permissions.sh
 source "$JANUS_ROOT_DIR/lib/init/steps/permissions.sh"
+# shellcheck source=steps/lookingglass.sh
+source "$JANUS_ROOT_DIR/lib/init/steps/lookingglass.sh"
 
 # Print the final init summary and next steps.
 janus_init_print_summary() {
@@ -41,7 +45,11 @@ janus_init_print_summary() {
     printf '  -> Run: janus-check (if not already done)\n'
     printf '  -> Continue with: janus-bind (when ready for VFIO)\n'
     printf '\n'
-    printf 'This command did not apply system-level changes.\n'
+    if [ "$JANUS_INIT_SYSTEM_CHANGED" -eq 1 ]; then
+        printf 'System-level Looking Glass files were installed (--apply).\n'
+    else
+        printf 'This command did not apply system-level changes.\n'
+    fi
     printf 'Logs:\n'
     printf '  - %s\n' "$JANUS_LOG_FILE"
     printf '  - %s\n' "$JANUS_MAIN_LOG_FILE"
@@ -59,7 +67,9 @@ janus_init_main() {
     janus_init_create_config
     janus_init_create_state
     janus_init_check_permissions
+    janus_init_prepare_looking_glass
     janus_init_finalize_config
+    janus_init_fix_ownership
 
     janus_init_print_summary
 }
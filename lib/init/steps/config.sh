@@ -47,7 +47,11 @@ HOST_KERNEL="$(uname -r)"
 # Core settings
 VM_BACKEND="libvirt"
 GPU_MODE="unset"
+
+# Looking Glass IVSHMEM display path: disabled|shm|kvmfr
 LOOKING_GLASS="disabled"
+LOOKING_GLASS_RESOLUTION="$JANUS_LG_DEFAULT_RESOLUTION"
+LOOKING_GLASS_BIT_DEPTH="$JANUS_LG_DEFAULT_BIT_DEPTH"
 
 # Safety flags
 INIT_COMPLETE="false"
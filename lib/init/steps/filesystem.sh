@@ -21,7 +21,32 @@ janus_init_create_directories() {
         "$JANUS_INIT_LOG_DIR" \
         "$JANUS_INIT_STATE_DIR" \
         "$JANUS_INIT_PROFILE_DIR" \
-        || janus_init_die "Unable to create Janus directories under $HOME."
+        || janus_init_die "Unable to create Janus directories under $JANUS_INIT_HOME."
 
     janus_init_log_ok "Directories initialized under ~/.config and ~/.cache"
 }
+
+# Hand user-scoped files created by a sudo run back to the invoking user.
+janus_init_fix_ownership() {
+    local path=""
+
+    [ "$(id -u)" -eq 0 ] && [ "$JANUS_INIT_USER" != "root" ] || return 0
+
+    for path in \
+        "$JANUS_INIT_HOME/.config" \
+        "$JANUS_INIT_HOME/.cache" \
+        "$JANUS_INIT_CONFIG_DIR" \
+        "$JANUS_INIT_CACHE_DIR" \
+        "$JANUS_INIT_LOG_DIR" \
+        "$JANUS_INIT_STATE_DIR" \
+        "$JANUS_INIT_PROFILE_DIR" \
+        "$JANUS_INIT_CONF_FILE" \
+        "$JANUS_INIT_STATE_FILE" \
+        "$JANUS_INIT_LG_DIR" \
+        "$JANUS_INIT_LG_DIR"/*; do
+        # Only touch what this run created as root; leave everything else alone.
+        [ -e "$path" ] && [ "$(stat -c %u "$path")" = "0" ] || continue
+        chown "$JANUS_INIT_USER:" "$path" 2>/dev/null \
+            || janus_init_log_warn "Unable to give $path back to $JANUS_INIT_USER."
+    done
+}
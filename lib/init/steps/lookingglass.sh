@@ -0,0 +1,114 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Init Looking Glass Steps
+# ----------------------------------------------------------------------------
+# This file stages host files for the Looking Glass IVSHMEM region and
+# installs them only when --apply is requested.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_INIT_STEP_LOOKINGGLASS_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_INIT_STEP_LOOKINGGLASS_LOADED=1
+
+# Stage (and optionally install) tmpfiles/udev/modprobe files for Looking Glass.
+janus_init_prepare_looking_glass() {
+    local mode=""
+    local resolution=""
+    local bit_depth=""
+    local size_mib=""
+    local owner="$JANUS_INIT_USER"
+    local group="kvm"
+    local staged=()
+    local entry=""
+    local src=""
+    local dest=""
+
+    mode="$(janus_lg_conf_value "$JANUS_INIT_CONF_FILE" LOOKING_GLASS)"
+    [ "$mode" = "enabled" ] && mode="shm"
+
+    case "${mode:-disabled}" in
+        disabled)
+            janus_init_log_info "Looking Glass is disabled in janus.conf; skipping shared-memory setup."
+            return 0
+            ;;
+        shm|kvmfr)
+            ;;
+        *)
+            janus_init_log_warn "Invalid LOOKING_GLASS value in janus.conf: $mode (expected disabled|shm|kvmfr)"
+            return 0
+            ;;
+    esac
+
+    resolution="$(janus_lg_conf_value "$JANUS_INIT_CONF_FILE" LOOKING_GLASS_RESOLUTION)"
+    bit_depth="$(janus_lg_conf_value "$JANUS_INIT_CONF_FILE" LOOKING_GLASS_BIT_DEPTH)"
+    resolution="${resolution:-$JANUS_LG_DEFAULT_RESOLUTION}"
+    bit_depth="${bit_depth:-$JANUS_LG_DEFAULT_BIT_DEPTH}"
+
+    size_mib="$(janus_lg_size_mib "$resolution" "$bit_depth")" || {
+        janus_init_log_warn "Invalid Looking Glass resolution/bit depth in janus.conf: $resolution @ $bit_depth"
+        return 0
+    }
+
+    janus_init_log_info "Looking Glass ($mode): ${size_mib} MiB region for $resolution @ ${bit_depth}-bit"
+
+    mkdir -p "$JANUS_INIT_LG_DIR" || janus_init_die "Unable to create $JANUS_INIT_LG_DIR"
+
+    if [ "$mode" = "shm" ]; then
+        janus_lg_render_tmpfiles "$owner" "$group" > "$JANUS_INIT_LG_DIR/10-looking-glass.conf"
+        staged+=("10-looking-glass.conf|/etc/tmpfiles.d/10-looking-glass.conf")
+    else
+        janus_lg_render_kvmfr_modprobe "$size_mib" > "$JANUS_INIT_LG_DIR/kvmfr-modprobe.conf"
+        printf 'kvmfr\n' > "$JANUS_INIT_LG_DIR/kvmfr-modules-load.conf"
+        janus_lg_render_kvmfr_udev "$owner" "$group" > "$JANUS_INIT_LG_DIR/99-kvmfr.rules"
+        staged+=(
+            "kvmfr-modprobe.conf|/etc/modprobe.d/kvmfr.conf"
+            "kvmfr-modules-load.conf|/etc/modules-load.d/kvmfr.conf"
+            "99-kvmfr.rules|/etc/udev/rules.d/99-kvmfr.rules"
+        )
+    fi
+
+    janus_init_log_ok "Looking Glass host files staged in $JANUS_INIT_LG_DIR"
+
+    if [ "$JANUS_INIT_APPLY" -eq 0 ]; then
+        for entry in "${staged[@]}"; do
+            janus_init_log_info "Would install: ${entry%%|*} -> ${entry#*|}"
+        done
+        janus_init_log_info "To install system-wide: sudo janus-init --apply"
+        return 0
+    fi
+
+    for entry in "${staged[@]}"; do
+        src="$JANUS_INIT_LG_DIR/${entry%%|*}"
+        dest="$JANUS_INIT_SYSTEM_ROOT${entry#*|}"
+
+        install -D -m 0644 "$src" "$dest" || janus_init_die "Failed to install $dest"
+        janus_init_log_ok "Installed: $dest"
+    done
+    JANUS_INIT_SYSTEM_CHANGED=1
+
+    # Activation only makes sense against the live root, not a staging prefix.
+    [ -z "$JANUS_INIT_SYSTEM_ROOT" ] || return 0
+
+    if [ "$mode" = "shm" ]; then
+        if command -v systemd-tmpfiles >/dev/null 2>&1 \
+            && systemd-tmpfiles --create /etc/tmpfiles.d/10-looking-glass.conf >/dev/null 2>&1; then
+            janus_init_log_ok "Created $JANUS_LG_SHM_PATH with owner $owner:$group"
+        else
+            janus_init_log_warn "Unable to run systemd-tmpfiles; $JANUS_LG_SHM_PATH will be created on next boot."
+        fi
+        return 0
+    fi
+
+    if command -v udevadm >/dev/null 2>&1; then
+        udevadm control --reload-rules >/dev/null 2>&1 || janus_init_log_warn "Unable to reload udev rules."
+    fi
+
+    if modprobe kvmfr "static_size_mb=$size_mib" >/dev/null 2>&1; then
+        janus_init_log_ok "kvmfr module loaded ($JANUS_LG_KVMFR_PATH)"
+    else
+        janus_init_log_warn "Unable to load kvmfr; install the Looking Glass kvmfr module (DKMS) and reboot."
+    fi
+    janus_init_log_info "Ensure $JANUS_LG_KVMFR_PATH is listed in cgroup_device_acl in /etc/libvirt/qemu.conf."
+}
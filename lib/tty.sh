@@ -12,5 +12,8 @@ if [ -n "${JANUS_TTY_SHIM_LOADED:-}" ]; then
 fi
 JANUS_TTY_SHIM_LOADED=1
 
-source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/core/runtime/tty.sh"
+# Sourced by bare file name, BASH_SOURCE has no directory part to strip.
+JANUS_LIB_DIR="${BASH_SOURCE[0]%/*}"
+[ "$JANUS_LIB_DIR" != "${BASH_SOURCE[0]}" ] || JANUS_LIB_DIR="."
+source "$JANUS_LIB_DIR/core/runtime/tty.sh"
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus VM Balloon Daemon Action
+# ----------------------------------------------------------------------------
+# This file runs the balloon-daemon loop that returns idle guest memory to
+# the host and gives it back when guests need it again.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_VM_ACTION_BALLOON_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_VM_ACTION_BALLOON_LOADED=1
+
+# List running domains the daemon may manage.
+janus_vm_balloon_running_names() {
+    local stats_file=""
+
+    if [ -n "$JANUS_VM_BALLOON_STUB_DIR" ]; then
+        for stats_file in "$JANUS_VM_BALLOON_STUB_DIR"/*.stats; do
+            [ -e "$stats_file" ] && basename "$stats_file" .stats
+        done
+        return 0
+    fi
+
+    janus_vm_capacity_running_names
+}
+
+# Fill JANUS_VM_BALLOON_TARGETS with "NAME MIN_KIB MAX_KIB" for this tick.
+# Domains that cannot give memory back are reported once.
+janus_vm_balloon_targets() {
+    local names=()
+    local name=""
+    local max_mib=""
+    local min_mib=""
+    local reason=""
+
+    if [ "$JANUS_VM_BALLOON_ALL" -eq 1 ]; then
+        mapfile -t names < <(janus_vm_balloon_running_names)
+    else
+        names=("$JANUS_VM_NAME")
+    fi
+
+    JANUS_VM_BALLOON_TARGETS=()
+
+    for name in "${names[@]}"; do
+        reason=""
+        max_mib="$JANUS_VM_BALLOON_MAX_MIB"
+
+        if [ -n "${JANUS_VM_CAP_RECORDS[$name]:-}" ]; then
+            [ -n "$max_mib" ] || max_mib="$(janus_vm_capacity_field "$name" 2)"
+
+            # VFIO pins all guest RAM and hugepages never return to the host pool.
+            if [ "$(janus_vm_capacity_field "$name" 7)" != "-" ]; then
+                reason="has PCI passthrough devices (VFIO pins guest memory)"
+            elif [ "$(janus_vm_capacity_field "$name" 4)" != "-" ]; then
+                reason="is backed by hugepages"
+            fi
+        elif [ -z "$max_mib" ]; then
+            reason="has no Janus definition; pass --max-mib"
+        fi
+
+        if [ -n "$reason" ]; then
+            if [ -z "${JANUS_VM_BALLOON_SKIPPED[$name]:-}" ]; then
+                janus_vm_log_warn "Skipping $name: it $reason."
+                JANUS_VM_BALLOON_SKIPPED["$name"]=1
+            fi
+            continue
+        fi
+
+        min_mib="$JANUS_VM_BALLOON_MIN_MIB"
+        [ -n "$min_mib" ] || min_mib=$((max_mib / 4))
+        [ "$min_mib" -le "$max_mib" ] || min_mib="$max_mib"
+
+        JANUS_VM_BALLOON_TARGETS+=("$name $((min_mib * 1024)) $((max_mib * 1024))")
+    done
+}
+
+# Log the net memory moved by the daemon.
+janus_vm_balloon_summary() {
+    local net_mib=$((JANUS_VM_BALLOON_RECLAIMED_KIB / 1024))
+
+    if [ "$net_mib" -ge 0 ]; then
+        janus_vm_log_info "Balloon daemon stopped: $net_mib MiB net reclaimed for the host."
+    else
+        janus_vm_log_info "Balloon daemon stopped: $((-net_mib)) MiB net returned to guests."
+    fi
+}
+
+# Poll guest memory stats and resize balloons within the configured bounds.
+janus_vm_balloon_daemon() {
+    local entry=""
+    local name=""
+    local min_kib=""
+    local max_kib=""
+    local low="${JANUS_VM_BALLOON_FREE_BAND%%:*}"
+    local high="${JANUS_VM_BALLOON_FREE_BAND##*:}"
+    local iteration=0
+    local sleep_pid=""
+
+    janus_vm_log_info "Balloon daemon: every ${JANUS_VM_BALLOON_INTERVAL}s, keeping ${low}-${high}% of guest memory free."
+
+    # Bash defers traps until a foreground command returns, so the sleep runs
+    # in the background and the wait below is interrupted right away.
+    trap '[ -z "$sleep_pid" ] || kill "$sleep_pid" 2>/dev/null; janus_vm_balloon_summary; exit 0' INT TERM
+
+    while :; do
+        janus_vm_capacity_load
+        janus_vm_balloon_targets
+
+        if [ "${#JANUS_VM_BALLOON_TARGETS[@]}" -eq 0 ] && [ "$JANUS_VM_BALLOON_ALL" -eq 0 ]; then
+            janus_vm_die "Nothing to manage for $JANUS_VM_NAME."
+        fi
+
+        for entry in "${JANUS_VM_BALLOON_TARGETS[@]}"; do
+            read -r name min_kib max_kib <<< "$entry"
+            janus_vm_balloon_tick "$name" "$min_kib" "$max_kib" "$low" "$high"
+        done
+
+        iteration=$((iteration + 1))
+        if [ "$JANUS_VM_BALLOON_ITERATIONS" -gt 0 ] && [ "$iteration" -ge "$JANUS_VM_BALLOON_ITERATIONS" ]; then
+            break
+        fi
+
+        sleep "$JANUS_VM_BALLOON_INTERVAL" &
+        sleep_pid=$!
+        wait "$sleep_pid" || true
+        sleep_pid=""
+    done
+
+    trap - INT TERM
+    janus_vm_balloon_summary
+}
@@ -0,0 +1,78 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus VM Capacity Action
+# ----------------------------------------------------------------------------
+# This file prints the host capacity summary for all Janus VM definitions.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_VM_ACTION_CAPACITY_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_VM_ACTION_CAPACITY_LOADED=1
+
+# Print per-VM claims, host totals, and conflicts among running VMs.
+janus_vm_capacity_report() {
+    local -A running=()
+    local name=""
+    local state=""
+    local hugepages=""
+    local memory=0
+    local committed_mib=0
+    local committed_vcpus=0
+    local row_format='%-20s %-8s %9s %6s %-14s %-12s %s\n'
+
+    janus_vm_capacity_load
+
+    if [ "${#JANUS_VM_CAP_NAMES[@]}" -eq 0 ]; then
+        janus_vm_log_info "No Janus VM definitions found in $JANUS_VM_DEF_DIR"
+        return 0
+    fi
+
+    while IFS= read -r name; do
+        running["$name"]=1
+    done < <(janus_vm_capacity_running_names)
+
+    # shellcheck disable=SC2059
+    printf "$row_format" "VM" "STATE" "MEM_MIB" "VCPUS" "HUGEPAGES" "PINNED" "DEVICES"
+
+    for name in "${JANUS_VM_CAP_NAMES[@]}"; do
+        state="stopped"
+        memory="$(janus_vm_capacity_field "$name" 2)"
+
+        if [ -n "${running[$name]:-}" ]; then
+            state="running"
+            committed_mib=$((committed_mib + memory))
+            committed_vcpus=$((committed_vcpus + $(janus_vm_capacity_field "$name" 3)))
+        fi
+
+        hugepages="$(janus_vm_capacity_field "$name" 4)"
+        [ "$hugepages" = "-" ] || hugepages="${hugepages}@$(janus_vm_capacity_field "$name" 5)"
+
+        # shellcheck disable=SC2059
+        printf "$row_format" \
+            "$name" \
+            "$state" \
+            "$memory" \
+            "$(janus_vm_capacity_field "$name" 3)" \
+            "$hugepages" \
+            "$(janus_vm_capacity_field "$name" 6)" \
+            "$(janus_vm_capacity_field "$name" 7)"
+    done
+
+    printf '\n'
+    printf 'Host memory: %s MiB (%s MiB in hugepage pools)\n' \
+        "$(janus_vm_host_mem_total_mib)" \
+        "$(janus_vm_host_hugepage_pool_mib)"
+    printf 'Host CPUs online: %s\n' "$(janus_vm_host_online_cpus | wc -w)"
+    printf 'Committed by running VMs: %s MiB, %s vCPUs\n' "$committed_mib" "$committed_vcpus"
+    printf '\n'
+
+    if janus_vm_capacity_check ""; then
+        janus_vm_log_ok "No blocking capacity conflicts among running VMs."
+        return 0
+    fi
+
+    janus_vm_log_warn "Blocking capacity conflicts detected among running VMs."
+    return 1
+}
@@ -11,6 +11,25 @@ if [ -n "${JANUS_VM_ACTION_CREATE_LOADED:-}" ]; then
 fi
 JANUS_VM_ACTION_CREATE_LOADED=1
 
+# Make sure the loaded kvmfr region is large enough for this VM's resolution.
+# janus-init sizes the module from janus.conf, while create may override the
+# resolution; QEMU would only fail at start. Warns in dry-run, refuses apply.
+janus_vm_check_kvmfr_size() {
+    local loaded=""
+    local message=""
+
+    [ "$JANUS_VM_LOOKING_GLASS" = "kvmfr" ] || return 0
+    loaded="$(janus_lg_kvmfr_loaded_size_mib)"
+    [ -n "$loaded" ] && [ "$JANUS_VM_LG_SIZE_MIB" -gt "$loaded" ] || return 0
+
+    message="Looking Glass needs ${JANUS_VM_LG_SIZE_MIB} MiB for $JANUS_VM_LG_RESOLUTION @ ${JANUS_VM_LG_BIT_DEPTH}-bit, but kvmfr is loaded with static_size_mb=$loaded."
+    if [ "$JANUS_VM_APPLY" -eq 1 ]; then
+        janus_vm_log_error "$message"
+        janus_vm_die "Update LOOKING_GLASS_RESOLUTION in janus.conf, re-run: sudo janus-init --apply, then reload kvmfr."
+    fi
+    janus_vm_log_warn "$message The VM would fail to start; update janus.conf and re-run: sudo janus-init --apply"
+}
+
 # Create or define a VM from the Janus template.
 janus_vm_create() {
     local def_file="$JANUS_VM_DEF_DIR/${JANUS_VM_NAME}.xml"
@@ -28,7 +47,15 @@ janus_vm_create() {
         janus_vm_parse_pci_parts "$JANUS_VM_GPU_AUDIO_PCI" "JANUS_VM_GPU_AUDIO"
     fi
 
-    janus_vm_render_xml_definition "$template_file" "$def_file"
+    janus_vm_check_kvmfr_size
+
+    # Admit the rendered XML before it replaces anything in the definitions dir.
+    janus_vm_render_xml_definition "$template_file" "$def_file.tmp"
+    if ! janus_vm_capacity_admit create "$JANUS_VM_APPLY" "$def_file.tmp"; then
+        rm -f "$def_file.tmp"
+        exit 1
+    fi
+    mv -f "$def_file.tmp" "$def_file" || janus_vm_die "Unable to write VM definition: $def_file"
     janus_vm_log_ok "VM definition rendered: $def_file"
 
     if [ "$JANUS_VM_APPLY" -eq 0 ]; then
@@ -48,6 +75,14 @@ janus_vm_create() {
             janus_vm_log_info "Would create NVRAM file from template: $nvram_path"
         fi
 
+        if [ "$JANUS_VM_LOOKING_GLASS" != "disabled" ]; then
+            janus_vm_log_info "Looking Glass ($JANUS_VM_LOOKING_GLASS): ${JANUS_VM_LG_SIZE_MIB} MiB IVSHMEM for $JANUS_VM_LG_RESOLUTION @ ${JANUS_VM_LG_BIT_DEPTH}-bit"
+        fi
+
+        if [ "$JANUS_VM_MEMORY_PROFILE" = "reclaim" ]; then
+            janus_vm_log_info "Memory profile reclaim: free page reporting + balloon stats every ${JANUS_VM_BALLOON_STATS_PERIOD}s (see: janus-vm balloon-daemon)"
+        fi
+
         if [ "$JANUS_VM_UNATTENDED_ENABLED" -eq 1 ]; then
             janus_vm_log_info "Would create unattended XML: $unattended_xml_path"
             janus_vm_log_info "Would create unattended ISO: $unattended_iso_path"
@@ -63,6 +98,10 @@ janus_vm_create() {
 
     janus_vm_ensure_virsh_connection
 
+    if [ "$JANUS_VM_LOOKING_GLASS" = "kvmfr" ] && [ ! -e "$JANUS_LG_KVMFR_PATH" ]; then
+        janus_vm_log_warn "$JANUS_LG_KVMFR_PATH not found; load kvmfr (see: janus-init --apply) before starting the VM."
+    fi
+
     if ! janus_vm_confirm "Apply VM definition and local artifacts now?"; then
         janus_vm_log_warn "Aborted by user."
         return 0
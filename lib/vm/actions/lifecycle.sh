@@ -3,7 +3,7 @@
 # ----------------------------------------------------------------------------
 # Janus VM Lifecycle Actions
 # ----------------------------------------------------------------------------
-# This file contains start, stop, and status actions.
+# This file contains start, stop, status, and irq-pin actions.
 # ----------------------------------------------------------------------------
 
 if [ -n "${JANUS_VM_ACTION_LIFECYCLE_LOADED:-}" ]; then
@@ -11,18 +11,142 @@ if [ -n "${JANUS_VM_ACTION_LIFECYCLE_LOADED:-}" ]; then
 fi
 JANUS_VM_ACTION_LIFECYCLE_LOADED=1
 
+# Resolve the IRQ affinity state file for the current VM.
+janus_vm_irq_state_file() {
+    local state_dir=""
+
+    state_dir="$(janus_runtime_resolve_state_dir)" || janus_vm_die "Unable to create state directory."
+    printf '%s' "$state_dir/irq_${JANUS_VM_NAME}.state"
+}
+
+# Return success when the VM owning an IRQ state file is still running.
+janus_vm_irq_state_owner_running() {
+    local name="${1##*/irq_}"
+
+    name="${name%.state}"
+    [ "$(virsh -c "$JANUS_VM_CONNECT_URI" domstate "$name" 2>/dev/null | awk 'NR==1 {print $0}')" = "running" ]
+}
+
+# Other VMs' IRQ state only counts while that VM is still running.
+JANUS_IRQ_OWNER_CHECK="janus_vm_irq_state_owner_running"
+
+# Resolve --irq-cpus into a concrete cpulist using the Janus definition.
+janus_vm_resolve_irq_cpus() {
+    local def_file="$1"
+    local cpulist="$JANUS_VM_IRQ_CPUS"
+
+    if [ "$cpulist" = "auto" ]; then
+        cpulist="$(janus_vm_definition_pinned_cpus "$def_file")"
+        [ -n "$cpulist" ] || janus_vm_die "--irq-cpus auto requires <vcpupin> entries in $def_file"
+    fi
+
+    printf '%s' "$cpulist"
+}
+
+# Steer passthrough device IRQs onto the requested host CPUs.
+# The guest enables MSI/MSI-X only once its driver loads, so wait for the IRQs
+# (--irq-wait) and, with --watch, keep re-pinning until the VM shuts off.
+janus_vm_pin_irqs() {
+    local def_file="$1"
+    local cpulist="$2"
+    local pcis=()
+    local state_file=""
+
+    mapfile -t pcis < <(janus_vm_definition_hostdev_pcis "$def_file")
+    if [ "${#pcis[@]}" -eq 0 ]; then
+        janus_vm_log_warn "No PCI hostdev entries in $def_file; skipping IRQ pinning."
+        return 0
+    fi
+
+    state_file="$(janus_vm_irq_state_file)"
+
+    janus_vm_log_info "Waiting up to ${JANUS_VM_IRQ_WAIT}s for the guest to enable MSI on ${pcis[*]}"
+    if janus_irq_wait_device_irqs "$JANUS_VM_IRQ_WAIT" "${pcis[@]}"; then
+        janus_vm_log_info "Pinning vfio IRQs for ${pcis[*]} to CPUs $cpulist"
+        janus_irq_pin_devices "$state_file" "$cpulist" "${pcis[@]}" \
+            || janus_vm_log_warn "IRQ pinning failed; VM keeps running with default affinity."
+    elif [ "$JANUS_VM_IRQ_WATCH" -eq 0 ]; then
+        janus_vm_log_warn "No vfio MSI/MSI-X IRQs for ${pcis[*]} after ${JANUS_VM_IRQ_WAIT}s; nothing pinned."
+        janus_vm_log_info "Once the guest driver is loaded: sudo janus-vm irq-pin --name $JANUS_VM_NAME --irq-cpus $JANUS_VM_IRQ_CPUS"
+        return 0
+    fi
+
+    [ "$JANUS_VM_IRQ_WATCH" -eq 1 ] || return 0
+
+    janus_vm_log_info "Watching vfio IRQs of $JANUS_VM_NAME until it shuts off (Ctrl+C to stop watching)."
+    while sleep "$JANUS_VM_IRQ_WATCH_INTERVAL" && [ "$(janus_vm_domain_state)" = "running" ]; do
+        janus_irq_pin_devices "$state_file" "$cpulist" "${pcis[@]}" || break
+    done
+
+    if [ "$(janus_vm_domain_state)" = "shut off" ]; then
+        janus_vm_restore_irqs
+    fi
+}
+
+# Drop IRQ state of a VM that stopped without janus-vm (or before a reboot).
+janus_vm_discard_irq_state() {
+    local state_file=""
+
+    state_file="$(janus_vm_irq_state_file)"
+    [ -f "$state_file" ] || return 0
+
+    janus_vm_log_info "Dropping stale IRQ state of $JANUS_VM_NAME (its IRQs were freed when the guest stopped)."
+    janus_irq_discard "$state_file"
+}
+
+# Wait up to TIMEOUT seconds for the domain to reach "shut off".
+janus_vm_wait_shut_off() {
+    local timeout="$1"
+    local waited=0
+
+    until [ "$(janus_vm_domain_state)" = "shut off" ]; do
+        [ "$waited" -lt "$timeout" ] || return 1
+        sleep 1
+        waited=$((waited + 1))
+    done
+}
+
+# Restore IRQ affinity saved when the VM was started with --irq-cpus.
+janus_vm_restore_irqs() {
+    local state_file=""
+
+    state_file="$(janus_vm_irq_state_file)"
+    [ -f "$state_file" ] || return 0
+
+    if [ "$(id -u)" -ne 0 ]; then
+        janus_vm_log_warn "Pinned IRQ affinity needs root to restore. Re-run: sudo janus-vm stop --name $JANUS_VM_NAME"
+        return 0
+    fi
+
+    janus_vm_log_info "Restoring IRQ affinity for: $JANUS_VM_NAME"
+    janus_irq_restore "$state_file"
+}
+
 # Start VM when it is not already running.
 janus_vm_start() {
+    local def_file="$JANUS_VM_DEF_DIR/${JANUS_VM_NAME}.xml"
+    local irq_cpus=""
+
     janus_vm_ensure_virsh_connection
     janus_vm_domain_exists || janus_vm_die "VM not defined: $JANUS_VM_NAME"
 
+    if [ -n "$JANUS_VM_IRQ_CPUS" ]; then
+        [ -f "$def_file" ] || janus_vm_die "Janus definition not found for IRQ pinning: $def_file"
+        irq_cpus="$(janus_vm_resolve_irq_cpus "$def_file")" || exit 1
+    fi
+
     if [ "$(janus_vm_domain_state)" = "running" ]; then
         janus_vm_log_info "VM is already running: $JANUS_VM_NAME"
-        return 0
+    else
+        # State left by a previous run refers to IRQs vfio has since freed, and
+        # their numbers may belong to other devices now; drop it unrestored.
+        [ -z "$irq_cpus" ] || janus_vm_discard_irq_state
+        janus_vm_capacity_admit start 1 || exit 1
+        virsh -c "$JANUS_VM_CONNECT_URI" start "$JANUS_VM_NAME" >/dev/null || janus_vm_die "Failed to start VM."
+        janus_vm_log_ok "VM started: $JANUS_VM_NAME"
     fi
 
-    virsh -c "$JANUS_VM_CONNECT_URI" start "$JANUS_VM_NAME" >/dev/null || janus_vm_die "Failed to start VM."
-    janus_vm_log_ok "VM started: $JANUS_VM_NAME"
+    [ -z "$irq_cpus" ] || janus_vm_pin_irqs "$def_file" "$irq_cpus"
 }
 
 # Request graceful shutdown or force-stop VM.
@@ -35,6 +159,7 @@ janus_vm_stop() {
     state="$(janus_vm_domain_state)"
     if [ "$state" = "shut off" ]; then
         janus_vm_log_info "VM is already stopped: $JANUS_VM_NAME"
+        janus_vm_restore_irqs
         return 0
     fi
 
@@ -46,11 +171,35 @@ janus_vm_stop() {
 
         virsh -c "$JANUS_VM_CONNECT_URI" destroy "$JANUS_VM_NAME" >/dev/null || janus_vm_die "Failed to force-stop VM."
         janus_vm_log_ok "VM force-stopped: $JANUS_VM_NAME"
+        janus_vm_restore_irqs
         return 0
     fi
 
     virsh -c "$JANUS_VM_CONNECT_URI" shutdown "$JANUS_VM_NAME" >/dev/null || janus_vm_die "Failed to request VM shutdown."
     janus_vm_log_ok "Shutdown signal sent: $JANUS_VM_NAME"
+
+    # The guest keeps its IRQs until it is actually off, so restore only then.
+    [ -f "$(janus_vm_irq_state_file)" ] || return 0
+    janus_vm_log_info "Waiting up to ${JANUS_VM_SHUTDOWN_WAIT}s for $JANUS_VM_NAME to shut off before restoring IRQ affinity."
+    if janus_vm_wait_shut_off "$JANUS_VM_SHUTDOWN_WAIT"; then
+        janus_vm_restore_irqs
+    else
+        janus_vm_log_warn "VM still running; IRQ affinity stays pinned. Re-run once it is off: sudo janus-vm stop --name $JANUS_VM_NAME"
+    fi
+}
+
+# Pin vfio IRQs of an already running VM (e.g. after the guest driver loaded).
+janus_vm_irq_pin() {
+    local def_file="$JANUS_VM_DEF_DIR/${JANUS_VM_NAME}.xml"
+    local irq_cpus=""
+
+    janus_vm_ensure_virsh_connection
+    janus_vm_domain_exists || janus_vm_die "VM not defined: $JANUS_VM_NAME"
+    [ "$(janus_vm_domain_state)" = "running" ] || janus_vm_die "VM is not running: $JANUS_VM_NAME"
+    [ -f "$def_file" ] || janus_vm_die "Janus definition not found for IRQ pinning: $def_file"
+
+    irq_cpus="$(janus_vm_resolve_irq_cpus "$def_file")" || exit 1
+    janus_vm_pin_irqs "$def_file" "$irq_cpus"
 }
 
 # Print domain status and metadata.
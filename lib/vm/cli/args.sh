@@ -22,6 +22,9 @@ Usage:
   janus-vm start [options]
   janus-vm stop [options]
   janus-vm status [options]
+  janus-vm capacity [options]
+  janus-vm balloon-daemon [options]
+  janus-vm irq-pin [options]
 
 Core options:
   --name NAME             VM name (default: janus-win11)
@@ -44,28 +47,58 @@ Create options:
   --gpu PCI               GPU PCI address for passthrough mode
   --gpu-audio PCI         GPU audio PCI address for passthrough mode
   --single-gpu-mode MODE  shared-vram|cpu-only (base mode only)
+  --looking-glass MODE    disabled|shm|kvmfr IVSHMEM display path (passthrough only;
+                          default: LOOKING_GLASS in janus.conf)
+  --lg-resolution WxH     Looking Glass target resolution (default: 1920x1080)
+  --lg-bit-depth N        Looking Glass bits per channel: 8|10|16 (default: 8)
+  --memory-profile MODE   static|reclaim (default: static); reclaim enables
+                          free page reporting + balloon stats for balloon-daemon
   --unattended            Enable Windows unattended local account setup
   --win-user USER         Local Windows username for unattended
   --win-password PASS     Optional local Windows password for unattended
   --apply                 Apply changes (define VM, create disk/NVRAM)
+  --allow-overcommit      Continue when host capacity checks fail (create/start)
   --yes                   Assume yes for confirmations
 
+Start / irq-pin options:
+  --irq-cpus LIST|auto    Pin passthrough vfio MSI/MSI-X IRQs to a host cpulist
+                          (auto: guest vcpupin cores); restored on stop
+  --irq-wait SEC          Wait this long for the guest to enable MSI (default: 60)
+  --watch                 Keep re-pinning IRQs the guest re-requests until the
+                          VM shuts off, then restore affinity
+
+Balloon daemon options:
+  --all                   Manage every running Janus VM instead of --name
+  --interval SEC          Stats polling interval (default: 10)
+  --min-mib N             Smallest balloon size (default: 25% of VM memory)
+  --max-mib N             Largest balloon size (default: VM memory)
+  --free-band LOW:HIGH    Guest free-memory band in percent (default: 10:30)
+  --iterations N          Stop after N polls (default: 0, run until stopped)
+
 Stop options:
   --force                 Force stop via virsh destroy
 
 Examples:
   janus-vm create --name win11 --guided
   janus-vm create --name win11 --mode passthrough --gpu 0000:03:00.0 --gpu-audio 0000:03:00.1
+  janus-vm create --name win11 --mode passthrough --gpu 0000:03:00.0 --gpu-audio 0000:03:00.1 --looking-glass shm
   janus-vm create --name win11 --mode base --single-gpu-mode cpu-only
   janus-vm create --name win11 --storage block --disk-path /dev/nvme0n1p3 --apply
   janus-vm create --name win11 --unattended --win-user gamer --win-password secret --apply
   janus-vm status --name win11
+  janus-vm capacity
+  janus-vm create --name win11 --memory-profile reclaim
+  janus-vm balloon-daemon --all --interval 15
   janus-vm start --name win11
+  janus-vm start --name win11 --irq-cpus 2-5
+  janus-vm irq-pin --name win11 --irq-cpus auto --watch
   janus-vm stop --name win11
 
 Safety:
   - 'create' is DRY-RUN by default.
   - Use --apply to persist VM definitions and artifacts.
+  - 'create --apply' and 'start' refuse host memory/hugepage overcommit and
+    PCI devices already claimed by running VMs (see 'janus-vm capacity').
 EOF_HELP
 }
 
@@ -79,7 +112,7 @@ janus_vm_parse_args() {
     shift || true
 
     case "$JANUS_VM_ACTION" in
-        create|start|stop|status)
+        create|start|stop|status|capacity|balloon-daemon|irq-pin)
             ;;
         --help|-h|help)
             janus_vm_show_help
@@ -173,6 +206,21 @@ janus_vm_parse_args() {
                 JANUS_VM_SINGLE_GPU_MODE="$2"
                 shift
                 ;;
+            --looking-glass)
+                [ $# -ge 2 ] || janus_vm_die "--looking-glass requires a value"
+                JANUS_VM_LOOKING_GLASS="$2"
+                shift
+                ;;
+            --lg-resolution)
+                [ $# -ge 2 ] || janus_vm_die "--lg-resolution requires a value"
+                JANUS_VM_LG_RESOLUTION="$2"
+                shift
+                ;;
+            --lg-bit-depth)
+                [ $# -ge 2 ] || janus_vm_die "--lg-bit-depth requires a value"
+                JANUS_VM_LG_BIT_DEPTH="$2"
+                shift
+                ;;
             --unattended)
                 JANUS_VM_UNATTENDED_ENABLED=1
                 ;;
@@ -197,6 +245,55 @@ janus_vm_parse_args() {
             --force)
                 JANUS_VM_FORCE=1
                 ;;
+            --allow-overcommit)
+                JANUS_VM_ALLOW_OVERCOMMIT=1
+                ;;
+            --memory-profile)
+                [ $# -ge 2 ] || janus_vm_die "--memory-profile requires a value"
+                JANUS_VM_MEMORY_PROFILE="$2"
+                shift
+                ;;
+            --all)
+                JANUS_VM_BALLOON_ALL=1
+                ;;
+            --interval)
+                [ $# -ge 2 ] || janus_vm_die "--interval requires a value"
+                JANUS_VM_BALLOON_INTERVAL="$2"
+                shift
+                ;;
+            --min-mib)
+                [ $# -ge 2 ] || janus_vm_die "--min-mib requires a value"
+                JANUS_VM_BALLOON_MIN_MIB="$2"
+                shift
+                ;;
+            --max-mib)
+                [ $# -ge 2 ] || janus_vm_die "--max-mib requires a value"
+                JANUS_VM_BALLOON_MAX_MIB="$2"
+                shift
+                ;;
+            --free-band)
+                [ $# -ge 2 ] || janus_vm_die "--free-band requires a value"
+                JANUS_VM_BALLOON_FREE_BAND="$2"
+                shift
+                ;;
+            --iterations)
+                [ $# -ge 2 ] || janus_vm_die "--iterations requires a value"
+                JANUS_VM_BALLOON_ITERATIONS="$2"
+                shift
+                ;;
+            --irq-wait)
+                [ $# -ge 2 ] || janus_vm_die "--irq-wait requires a value"
+                JANUS_VM_IRQ_WAIT="$2"
+                shift
+                ;;
+            --watch)
+                JANUS_VM_IRQ_WATCH=1
+                ;;
+            --irq-cpus)
+                [ $# -ge 2 ] || janus_vm_die "--irq-cpus requires a value"
+                JANUS_VM_IRQ_CPUS="$2"
+                shift
+                ;;
             --help|-h)
                 janus_vm_show_help
                 exit 0
@@ -42,6 +42,7 @@ janus_vm_run_guided_create_wizard() {
     printf '[2/3] VM resources\n'
     janus_vm_prompt_with_default "RAM (MiB)" "$JANUS_VM_MEMORY_MIB" JANUS_VM_MEMORY_MIB
     janus_vm_prompt_with_default "vCPU cores" "$JANUS_VM_VCPUS" JANUS_VM_VCPUS
+    janus_vm_prompt_with_default "Memory profile (static/reclaim)" "${JANUS_VM_MEMORY_PROFILE:-static}" JANUS_VM_MEMORY_PROFILE
 
     default_choice="$(janus_vm_video_profile_default_choice)"
     printf 'Video profile:\n'
@@ -57,18 +58,22 @@ janus_vm_run_guided_create_wizard() {
             JANUS_VM_MODE="passthrough"
             janus_vm_prompt_with_default "GPU PCI (example: 0000:03:00.0)" "$JANUS_VM_GPU_PCI" JANUS_VM_GPU_PCI
             janus_vm_prompt_with_default "GPU audio PCI (example: 0000:03:00.1)" "$JANUS_VM_GPU_AUDIO_PCI" JANUS_VM_GPU_AUDIO_PCI
+            [ -n "$JANUS_VM_LOOKING_GLASS" ] || JANUS_VM_LOOKING_GLASS="$(janus_lg_conf_value "$JANUS_VM_JANUS_CONF" LOOKING_GLASS)"
+            janus_vm_prompt_with_default "Looking Glass display (disabled/shm/kvmfr)" "${JANUS_VM_LOOKING_GLASS:-disabled}" JANUS_VM_LOOKING_GLASS
             ;;
         2)
             JANUS_VM_MODE="base"
             JANUS_VM_SINGLE_GPU_MODE="shared-vram"
             JANUS_VM_GPU_PCI=""
             JANUS_VM_GPU_AUDIO_PCI=""
+            JANUS_VM_LOOKING_GLASS=""
             ;;
         3)
             JANUS_VM_MODE="base"
             JANUS_VM_SINGLE_GPU_MODE="cpu-only"
             JANUS_VM_GPU_PCI=""
             JANUS_VM_GPU_AUDIO_PCI=""
+            JANUS_VM_LOOKING_GLASS=""
             ;;
         *)
             janus_vm_die "Invalid video profile selection: $input"
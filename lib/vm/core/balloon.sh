@@ -0,0 +1,190 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus VM Balloon Control
+# ----------------------------------------------------------------------------
+# This file reads guest memory statistics and resizes the virtio balloon so
+# memory a guest is not using goes back to the host.
+#
+# Sizing keeps the guest's free share of memory inside a band (hysteresis):
+# the balloon only moves when free memory leaves LOW..HIGH percent, and then
+# it aims for the middle of the band.
+#
+# JANUS_VM_BALLOON_STUB_DIR swaps libvirt for plain files: stats are read from
+# <dir>/<name>.stats (virsh dommemstat format, KiB) and resizes rewrite the
+# "actual" line and shift free memory by the same amount, like a guest would,
+# so the daemon can run without a hypervisor.
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_VM_BALLOON_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_VM_BALLOON_LOADED=1
+
+JANUS_VM_BALLOON_STUB_DIR="${JANUS_VM_BALLOON_STUB_DIR:-}"
+
+# Guest stats polling period rendered into memballoon for the reclaim profile.
+JANUS_VM_BALLOON_STATS_PERIOD=10
+
+# Ignore resizes smaller than this; balloon moves are not free for the guest.
+JANUS_VM_BALLOON_MIN_STEP_MIB=64
+
+# KiB returned to the host (positive) or handed back to guests (negative).
+JANUS_VM_BALLOON_RECLAIMED_KIB=0
+
+# Daemon working set: "NAME MIN_KIB MAX_KIB" entries and domains already
+# reported as unmanageable (NAME) or without usable stats (NAME:nostats,
+# NAME:nofree). declare -g keeps them global when sourced from
+# inside a function.
+JANUS_VM_BALLOON_TARGETS=()
+declare -gA JANUS_VM_BALLOON_SKIPPED=()
+
+# Return success when value is a supported create memory profile.
+janus_vm_is_memory_profile() {
+    case "$1" in
+        static|reclaim) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
+# Print balloon statistics for a domain as "key value" lines (KiB).
+janus_vm_balloon_read_stats() {
+    local name="$1"
+
+    if [ -n "$JANUS_VM_BALLOON_STUB_DIR" ]; then
+        cat "$JANUS_VM_BALLOON_STUB_DIR/$name.stats" 2>/dev/null
+        return
+    fi
+
+    virsh -c "$JANUS_VM_CONNECT_URI" dommemstat "$name" 2>/dev/null
+}
+
+# Resize the balloon of a running domain to SIZE_KIB.
+janus_vm_balloon_set_actual() {
+    local name="$1"
+    local size_kib="$2"
+    local stats_file=""
+
+    if [ -n "$JANUS_VM_BALLOON_STUB_DIR" ]; then
+        stats_file="$JANUS_VM_BALLOON_STUB_DIR/$name.stats"
+        awk -v target="$size_kib" '
+            $1 == "actual" { delta = target - $2; $2 = target }
+            { lines[NR] = $0; keys[NR] = $1; values[NR] = $2 }
+            END {
+                for (i = 1; i <= NR; i++) {
+                    if (keys[i] == "usable" || keys[i] == "unused") {
+                        print keys[i], values[i] + delta
+                    } else {
+                        print lines[i]
+                    }
+                }
+            }
+        ' "$stats_file" > "$stats_file.tmp" && mv "$stats_file.tmp" "$stats_file"
+        return
+    fi
+
+    virsh -c "$JANUS_VM_CONNECT_URI" setmem "$name" "$size_kib" --live >/dev/null 2>&1
+}
+
+# Extract one value from dommemstat-style output.
+janus_vm_balloon_stat() {
+    local stats="$1"
+    local key="$2"
+
+    awk -v key="$key" '$1 == key { print $2; exit }' <<< "$stats"
+}
+
+# Compute a new balloon size; fail when the guest is inside the free band.
+# Usage:
+#   janus_vm_balloon_plan ACTUAL_KIB FREE_KIB MIN_KIB MAX_KIB LOW_PCT HIGH_PCT
+janus_vm_balloon_plan() {
+    local actual="$1"
+    local free="$2"
+    local min="$3"
+    local max="$4"
+    local low="$5"
+    local high="$6"
+    local free_pct=0
+    local used=0
+    local target=0
+    local step=0
+    local mid=$(((low + high) / 2))
+
+    [ "$actual" -gt 0 ] || return 1
+
+    free_pct=$((free * 100 / actual))
+    if [ "$free_pct" -ge "$low" ] && [ "$free_pct" -le "$high" ]; then
+        return 1
+    fi
+
+    # Size the guest so its current usage leaves it at the middle of the band.
+    used=$((actual - free))
+    [ "$used" -gt 0 ] || used=0
+    target=$((used * 100 / (100 - mid)))
+
+    [ "$target" -ge "$min" ] || target="$min"
+    [ "$target" -le "$max" ] || target="$max"
+
+    step=$((target - actual))
+    [ "$step" -ge 0 ] || step=$((-step))
+    [ "$step" -ge $((JANUS_VM_BALLOON_MIN_STEP_MIB * 1024)) ] || return 1
+
+    printf '%s' "$target"
+}
+
+# Run one balloon adjustment for a domain and log the memory moved.
+# Usage:
+#   janus_vm_balloon_tick NAME MIN_KIB MAX_KIB LOW_PCT HIGH_PCT
+janus_vm_balloon_tick() {
+    local name="$1"
+    local min="$2"
+    local max="$3"
+    local low="$4"
+    local high="$5"
+    local stats=""
+    local actual=""
+    local free=""
+    local target=""
+    local delta=0
+
+    stats="$(janus_vm_balloon_read_stats "$name")" || true
+    actual="$(janus_vm_balloon_stat "$stats" actual)"
+
+    # Each polling gap is reported once per domain, not on every interval.
+    if [ -z "$actual" ]; then
+        if [ -z "${JANUS_VM_BALLOON_SKIPPED[$name:nostats]:-}" ]; then
+            janus_vm_log_warn "$name: no balloon statistics (is the domain running?)"
+            JANUS_VM_BALLOON_SKIPPED["$name:nostats"]=1
+        fi
+        return 0
+    fi
+
+    # "usable" counts reclaimable page cache; older guest drivers only report "unused".
+    free="$(janus_vm_balloon_stat "$stats" usable)"
+    [ -n "$free" ] || free="$(janus_vm_balloon_stat "$stats" unused)"
+
+    if [ -z "$free" ]; then
+        if [ -z "${JANUS_VM_BALLOON_SKIPPED[$name:nofree]:-}" ]; then
+            janus_vm_log_warn "$name: guest reports no free memory stats; create it with --memory-profile reclaim."
+            JANUS_VM_BALLOON_SKIPPED["$name:nofree"]=1
+        fi
+        return 0
+    fi
+    unset 'JANUS_VM_BALLOON_SKIPPED[$name:nostats]' 'JANUS_VM_BALLOON_SKIPPED[$name:nofree]'
+
+    target="$(janus_vm_balloon_plan "$actual" "$free" "$min" "$max" "$low" "$high")" || return 0
+
+    if ! janus_vm_balloon_set_actual "$name" "$target"; then
+        janus_vm_log_warn "$name: failed to resize balloon to $((target / 1024)) MiB"
+        return 0
+    fi
+
+    delta=$((actual - target))
+    JANUS_VM_BALLOON_RECLAIMED_KIB=$((JANUS_VM_BALLOON_RECLAIMED_KIB + delta))
+
+    if [ "$delta" -gt 0 ]; then
+        janus_vm_log_ok "$name: reclaimed $((delta / 1024)) MiB ($((actual / 1024)) -> $((target / 1024)) MiB, $((free * 100 / actual))% was free)"
+    else
+        janus_vm_log_ok "$name: returned $((-delta / 1024)) MiB ($((actual / 1024)) -> $((target / 1024)) MiB, $((free * 100 / actual))% was free)"
+    fi
+}
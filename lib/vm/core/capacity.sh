@@ -0,0 +1,434 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus VM Capacity
+# ----------------------------------------------------------------------------
+# This file summarizes resource claims of all Janus VM definitions and checks
+# them against host capacity (memory, hugepages, pinned CPUs, PCI devices).
+#
+# Parsed definitions are cached by file mtime+size so repeated checks only
+# re-read definitions that changed. Host roots are overridable for fixtures:
+# - JANUS_VM_HOST_PROC_ROOT (default: /proc)
+# - JANUS_VM_HOST_SYS_ROOT  (default: /sys)
+# ----------------------------------------------------------------------------
+
+if [ -n "${JANUS_VM_CAPACITY_LOADED:-}" ]; then
+    return 0 2>/dev/null || exit 0
+fi
+JANUS_VM_CAPACITY_LOADED=1
+
+JANUS_VM_HOST_PROC_ROOT="${JANUS_VM_HOST_PROC_ROOT:-/proc}"
+JANUS_VM_HOST_SYS_ROOT="${JANUS_VM_HOST_SYS_ROOT:-/sys}"
+# Versioned name: bump it when the record format or its meaning changes.
+JANUS_VM_CAPACITY_CACHE="${JANUS_VM_CAPACITY_CACHE:-$HOME/.cache/janus/vm/capacity-v2.cache}"
+
+# Memory kept free for the host itself before warning about overcommit.
+JANUS_VM_HOST_RESERVE_MIB="${JANUS_VM_HOST_RESERVE_MIB:-2048}"
+
+# Loaded inventory: ordered VM names and name -> record map.
+# Record format: name|memory_mib|vcpus|hugepage_kib|hugepage_nodes|pinned_cpus|pci_list
+JANUS_VM_CAP_NAMES=()
+declare -gA JANUS_VM_CAP_RECORDS=()
+JANUS_VM_CAP_PARSED=0
+
+# Parse one libvirt definition into a capacity record.
+janus_vm_capacity_parse_definition() {
+    local def_file="$1"
+    local base=""
+    local pinned=""
+    local pcis=""
+
+    base="$(awk -v fallback_name="$(basename "$def_file" .xml)" '
+        function to_mib(value, unit) {
+            unit = tolower(unit)
+            if (unit == "" || unit == "k" || unit == "kib") return int(value / 1024)
+            if (unit == "b" || unit == "bytes") return int(value / 1048576)
+            if (unit == "m" || unit == "mib") return int(value)
+            if (unit == "g" || unit == "gib") return int(value * 1024)
+            if (unit == "t" || unit == "tib") return int(value * 1048576)
+            return int(value)
+        }
+        function to_kib(value, unit) {
+            unit = tolower(unit)
+            if (unit == "" || unit == "k" || unit == "kib") return int(value)
+            if (unit == "m" || unit == "mib") return int(value * 1024)
+            if (unit == "g" || unit == "gib") return int(value * 1048576)
+            return int(value)
+        }
+        function attr(line, key) {
+            if (!match(line, key "=[\x27\"][^\x27\"]*[\x27\"]")) return ""
+            return substr(line, RSTART + length(key) + 2, RLENGTH - length(key) - 3)
+        }
+        function text(line) {
+            sub(/^[^>]*>/, "", line)
+            sub(/<.*$/, "", line)
+            return line
+        }
+        /<name>/ && name == "" { name = text($0) }
+        # Host NUMA placement lives in numatune; its <memory> is not guest RAM.
+        /<numatune>/ { in_nt = 1 }
+        in_nt && /<memory / && attr($0, "nodeset") != "" { host_nodes = attr($0, "nodeset") }
+        in_nt && /<memnode / && attr($0, "nodeset") != "" {
+            memnodes = (memnodes == "" ? "" : memnodes ",") attr($0, "nodeset")
+        }
+        /<\/numatune>/ { in_nt = 0; next }
+        in_nt { next }
+        /<memory[ >]/ { memory = to_mib(text($0), attr($0, "unit")) }
+        /<vcpu[ >]/ { vcpus = text($0) + 0 }
+        /<hugepages\/>/ { hp_size = "default" }
+        /<hugepages>/ { in_hp = 1; hp_size = "default" }
+        # page nodeset names guest NUMA cells, so it does not pick a host pool.
+        in_hp && /<page / { hp_size = to_kib(attr($0, "size"), attr($0, "unit")) }
+        /<\/hugepages>/ { in_hp = 0 }
+        END {
+            if (name == "") name = fallback_name
+            if (hp_size != "") {
+                hp_nodes = "any"
+                if (host_nodes != "") hp_nodes = host_nodes
+                else if (memnodes != "") hp_nodes = memnodes
+            }
+            printf "%s|%d|%d|%s|%s\n", name, memory, vcpus, (hp_size == "" ? "-" : hp_size), (hp_nodes == "" ? "-" : hp_nodes)
+        }
+    ' "$def_file")"
+
+    pinned="$(janus_vm_definition_pinned_cpus "$def_file")"
+    pcis="$(janus_vm_definition_hostdev_pcis "$def_file" | paste -sd, -)"
+
+    printf '%s|%s|%s\n' "$base" "${pinned:--}" "${pcis:--}"
+}
+
+# Load all definitions into JANUS_VM_CAP_*, reusing cached records when unchanged.
+janus_vm_capacity_load() {
+    local -A cached=()
+    local stat_lines=()
+    local new_cache=()
+    local line=""
+    local file=""
+    local stamp=""
+    local entry=""
+    local record=""
+    local name=""
+    local changed=0
+    local cache_dir=""
+
+    JANUS_VM_CAP_NAMES=()
+    JANUS_VM_CAP_RECORDS=()
+    JANUS_VM_CAP_PARSED=0
+
+    if [ -f "$JANUS_VM_CAPACITY_CACHE" ]; then
+        while IFS=$'\t' read -r file stamp record; do
+            [ -n "$record" ] && cached["$file"]="$stamp"$'\t'"$record"
+        done < "$JANUS_VM_CAPACITY_CACHE"
+    fi
+
+    # One stat call for the whole directory keeps the unchanged path cheap.
+    if compgen -G "$JANUS_VM_DEF_DIR/*.xml" >/dev/null; then
+        mapfile -t stat_lines < <(stat -c $'%n\t%Y:%s' "$JANUS_VM_DEF_DIR"/*.xml 2>/dev/null)
+    fi
+
+    for line in "${stat_lines[@]}"; do
+        file="${line%%$'\t'*}"
+        stamp="${line#*$'\t'}"
+
+        entry="${cached[$file]:-}"
+        if [ -n "$entry" ] && [ "${entry%%$'\t'*}" = "$stamp" ]; then
+            record="${entry#*$'\t'}"
+        else
+            record="$(janus_vm_capacity_parse_definition "$file")"
+            JANUS_VM_CAP_PARSED=$((JANUS_VM_CAP_PARSED + 1))
+            changed=1
+        fi
+
+        name="${record%%|*}"
+        JANUS_VM_CAP_NAMES+=("$name")
+        JANUS_VM_CAP_RECORDS["$name"]="$record"
+        new_cache+=("$file"$'\t'"$stamp"$'\t'"$record")
+    done
+
+    [ "${#new_cache[@]}" -ne "${#cached[@]}" ] && changed=1
+    [ "$changed" -eq 1 ] || return 0
+
+    cache_dir="$(dirname "$JANUS_VM_CAPACITY_CACHE")"
+    mkdir -p "$cache_dir" 2>/dev/null || return 0
+    if [ "${#new_cache[@]}" -gt 0 ]; then
+        printf '%s\n' "${new_cache[@]}" > "$JANUS_VM_CAPACITY_CACHE.$$" 2>/dev/null || return 0
+    else
+        : > "$JANUS_VM_CAPACITY_CACHE.$$" 2>/dev/null || return 0
+    fi
+    mv -f "$JANUS_VM_CAPACITY_CACHE.$$" "$JANUS_VM_CAPACITY_CACHE" 2>/dev/null || rm -f "$JANUS_VM_CAPACITY_CACHE.$$"
+}
+
+# Read one field (1-based) from a loaded capacity record.
+janus_vm_capacity_field() {
+    local name="$1"
+    local index="$2"
+    local fields=()
+
+    IFS='|' read -r -a fields <<< "${JANUS_VM_CAP_RECORDS[$name]:-}"
+    printf '%s' "${fields[$((index - 1))]:-}"
+}
+
+# Expand a cpulist (example: 2-4,8) into space-separated CPU ids.
+janus_vm_capacity_expand_cpulist() {
+    local list="$1"
+    local part=""
+    local first=""
+    local last=""
+    local cpu=""
+    local parts=()
+    local out=()
+
+    [ -n "$list" ] && [ "$list" != "-" ] || return 0
+
+    IFS=',' read -r -a parts <<< "$list"
+    for part in "${parts[@]}"; do
+        first="${part%-*}"
+        last="${part#*-}"
+        for ((cpu = first; cpu <= last; cpu++)); do
+            out+=("$cpu")
+        done
+    done
+
+    printf '%s' "${out[*]}"
+}
+
+# List running libvirt domains (empty when libvirt is unreachable).
+janus_vm_capacity_running_names() {
+    command -v virsh >/dev/null 2>&1 || return 0
+    virsh -c "$JANUS_VM_CONNECT_URI" list --name --state-running 2>/dev/null | sed '/^$/d'
+}
+
+# Print host MemTotal in MiB.
+janus_vm_host_mem_total_mib() {
+    awk '/^MemTotal:/ { print int($2 / 1024) }' "$JANUS_VM_HOST_PROC_ROOT/meminfo" 2>/dev/null || true
+}
+
+# Print the default hugepage size in KiB.
+janus_vm_host_default_hugepage_kib() {
+    local size=""
+
+    size="$(awk '/^Hugepagesize:/ { print $2 }' "$JANUS_VM_HOST_PROC_ROOT/meminfo" 2>/dev/null || true)"
+    printf '%s' "${size:-2048}"
+}
+
+# Print online host CPU ids as a space-separated list.
+janus_vm_host_online_cpus() {
+    local online=""
+
+    online="$(cat "$JANUS_VM_HOST_SYS_ROOT/devices/system/cpu/online" 2>/dev/null || true)"
+    janus_vm_capacity_expand_cpulist "$online"
+}
+
+# Print configured hugepages for a page size (KiB) on a node, or host-wide for "any".
+janus_vm_host_hugepages() {
+    local size_kib="$1"
+    local node="$2"
+    local path="$JANUS_VM_HOST_SYS_ROOT/kernel/mm/hugepages/hugepages-${size_kib}kB/nr_hugepages"
+
+    if [ "$node" != "any" ]; then
+        path="$JANUS_VM_HOST_SYS_ROOT/devices/system/node/node${node}/hugepages/hugepages-${size_kib}kB/nr_hugepages"
+    fi
+
+    cat "$path" 2>/dev/null || printf '0'
+}
+
+# Print total MiB reserved by all host hugepage pools.
+janus_vm_host_hugepage_pool_mib() {
+    local dir=""
+    local size_kib=""
+    local pages=""
+    local total_kib=0
+
+    for dir in "$JANUS_VM_HOST_SYS_ROOT"/kernel/mm/hugepages/hugepages-*kB; do
+        [ -d "$dir" ] || continue
+        size_kib="${dir##*hugepages-}"
+        size_kib="${size_kib%kB}"
+        pages="$(cat "$dir/nr_hugepages" 2>/dev/null || printf '0')"
+        total_kib=$((total_kib + size_kib * pages))
+    done
+
+    printf '%s' "$((total_kib / 1024))"
+}
+
+# Check the combined claims of running domains plus an optional target VM.
+# Soft issues are logged as warnings; blocking issues are logged and make
+# the function return 1. Pass CONFLICTS_BLOCK=0 to report PCI devices held
+# by a running VM as warnings only (defining a VM that shares a GPU is fine).
+# Usage:
+#   janus_vm_capacity_check TARGET [CONFLICTS_BLOCK]
+janus_vm_capacity_check() {
+    local target="$1"
+    local conflicts_block="${2:-1}"
+    local -A counted=()
+    local -A cpu_owner=()
+    local -A dev_owner=()
+    local -A hp_need=()
+    local -A online=()
+    local names=()
+    local name=""
+    local other=""
+    local memory=0
+    local vcpus=0
+    local hp_size=""
+    local hp_nodes=""
+    local pinned=""
+    local pcis=""
+    local cpu=""
+    local pci=""
+    local pci_list=()
+    local key=""
+    local pages=0
+    local pool=0
+    local mem_regular=0
+    local vcpu_total=0
+    local host_mem=0
+    local host_regular=0
+    local online_count=0
+    local blocking=0
+
+    while IFS= read -r name; do
+        [ -n "${JANUS_VM_CAP_RECORDS[$name]:-}" ] && counted["$name"]=1
+    done < <(janus_vm_capacity_running_names)
+    [ -n "$target" ] && [ -n "${JANUS_VM_CAP_RECORDS[$target]:-}" ] && counted["$target"]=1
+
+    for cpu in $(janus_vm_host_online_cpus); do
+        online["$cpu"]=1
+        online_count=$((online_count + 1))
+    done
+
+    for name in "${JANUS_VM_CAP_NAMES[@]}"; do
+        [ -n "${counted[$name]:-}" ] && names+=("$name")
+    done
+
+    for name in "${names[@]}"; do
+        memory="$(janus_vm_capacity_field "$name" 2)"
+        vcpus="$(janus_vm_capacity_field "$name" 3)"
+        hp_size="$(janus_vm_capacity_field "$name" 4)"
+        hp_nodes="$(janus_vm_capacity_field "$name" 5)"
+        pinned="$(janus_vm_capacity_field "$name" 6)"
+        pcis="$(janus_vm_capacity_field "$name" 7)"
+
+        vcpu_total=$((vcpu_total + vcpus))
+
+        if [ "$hp_size" = "-" ]; then
+            mem_regular=$((mem_regular + memory))
+        else
+            [ "$hp_size" = "default" ] && hp_size="$(janus_vm_host_default_hugepage_kib)"
+            # Guest memory pinned to one node must come from that node's pool.
+            [[ "$hp_nodes" =~ ^[0-9]+$ ]] || hp_nodes="any"
+            key="$hp_size:$hp_nodes"
+            pages=$(( (memory * 1024 + hp_size - 1) / hp_size ))
+            hp_need["$key"]=$(( ${hp_need[$key]:-0} + pages ))
+        fi
+
+        for cpu in $(janus_vm_capacity_expand_cpulist "$pinned"); do
+            if [ "$online_count" -gt 0 ] && [ -z "${online[$cpu]:-}" ]; then
+                janus_vm_log_warn "Capacity: $name pins CPU $cpu, which is not online on this host."
+                blocking=1
+            elif [ -n "${cpu_owner[$cpu]:-}" ]; then
+                janus_vm_log_warn "Capacity: CPU $cpu is pinned by both ${cpu_owner[$cpu]} and $name."
+            else
+                cpu_owner["$cpu"]="$name"
+            fi
+        done
+
+        if [ "$pcis" != "-" ]; then
+            IFS=',' read -r -a pci_list <<< "$pcis"
+            for pci in "${pci_list[@]}"; do
+                if [ -n "${dev_owner[$pci]:-}" ]; then
+                    janus_vm_log_warn "Capacity: PCI device $pci is claimed by both ${dev_owner[$pci]} and $name."
+                    [ "$conflicts_block" -eq 0 ] || blocking=1
+                else
+                    dev_owner["$pci"]="$name"
+                fi
+            done
+        fi
+    done
+
+    # Claims shared with defined-but-stopped VMs only matter when both run.
+    if [ -n "$target" ] && [ -n "${counted[$target]:-}" ]; then
+        pinned="$(janus_vm_capacity_field "$target" 6)"
+        pcis="$(janus_vm_capacity_field "$target" 7)"
+
+        for other in "${JANUS_VM_CAP_NAMES[@]}"; do
+            [ -z "${counted[$other]:-}" ] || continue
+
+            for pci in ${pcis//,/ }; do
+                [ "$pci" != "-" ] || continue
+                case ",$(janus_vm_capacity_field "$other" 7)," in
+                    *",$pci,"*)
+                        janus_vm_log_info "Capacity: PCI device $pci is also assigned to stopped VM $other."
+                        ;;
+                esac
+            done
+
+            for cpu in $(janus_vm_capacity_expand_cpulist "$(janus_vm_capacity_field "$other" 6)"); do
+                case " $(janus_vm_capacity_expand_cpulist "$pinned") " in
+                    *" $cpu "*)
+                        janus_vm_log_info "Capacity: CPU $cpu is also pinned by stopped VM $other."
+                        ;;
+                esac
+            done
+        done
+    fi
+
+    host_mem="$(janus_vm_host_mem_total_mib)"
+    if [ -n "$host_mem" ] && [ "$host_mem" -gt 0 ]; then
+        host_regular=$((host_mem - $(janus_vm_host_hugepage_pool_mib)))
+
+        if [ "$mem_regular" -gt "$host_regular" ]; then
+            janus_vm_log_warn "Capacity: ${mem_regular} MiB of guest memory exceeds ${host_regular} MiB available outside hugepage pools."
+            blocking=1
+        elif [ "$mem_regular" -gt $((host_regular - JANUS_VM_HOST_RESERVE_MIB)) ]; then
+            janus_vm_log_warn "Capacity: ${mem_regular} MiB of guest memory leaves less than ${JANUS_VM_HOST_RESERVE_MIB} MiB for the host."
+        fi
+    fi
+
+    for key in "${!hp_need[@]}"; do
+        pool="$(janus_vm_host_hugepages "${key%%:*}" "${key#*:}")"
+        if [ "${hp_need[$key]}" -gt "$pool" ]; then
+            janus_vm_log_warn "Capacity: ${hp_need[$key]} hugepages of ${key%%:*} KiB needed on node ${key#*:}, only $pool configured."
+            blocking=1
+        fi
+    done
+
+    if [ "$online_count" -gt 0 ] && [ "$vcpu_total" -gt "$online_count" ]; then
+        janus_vm_log_warn "Capacity: $vcpu_total vCPUs committed on $online_count host CPUs."
+    fi
+
+    [ "$blocking" -eq 0 ]
+}
+
+# Run admission control for the current VM before create/start.
+# At create, DEF_FILE is the freshly rendered (not yet installed) definition,
+# and device conflicts with running VMs only warn; start enforces them.
+# Usage:
+#   janus_vm_capacity_admit create|start STRICT [DEF_FILE]
+janus_vm_capacity_admit() {
+    local phase="$1"
+    local strict="$2"
+    local def_file="${3:-}"
+    local conflicts_block=1
+
+    janus_vm_capacity_load
+
+    if [ -n "$def_file" ]; then
+        [ -n "${JANUS_VM_CAP_RECORDS[$JANUS_VM_NAME]:-}" ] || JANUS_VM_CAP_NAMES+=("$JANUS_VM_NAME")
+        JANUS_VM_CAP_RECORDS["$JANUS_VM_NAME"]="$(janus_vm_capacity_parse_definition "$def_file")"
+    fi
+
+    if [ -z "${JANUS_VM_CAP_RECORDS[$JANUS_VM_NAME]:-}" ]; then
+        janus_vm_log_info "No Janus definition for $JANUS_VM_NAME; skipping capacity check."
+        return 0
+    fi
+
+    [ "$phase" != "create" ] || conflicts_block=0
+    janus_vm_capacity_check "$JANUS_VM_NAME" "$conflicts_block" && return 0
+
+    if [ "$strict" -eq 1 ] && [ "$JANUS_VM_ALLOW_OVERCOMMIT" -eq 0 ]; then
+        janus_vm_log_error "Host capacity check failed for $JANUS_VM_NAME. Re-run with --allow-overcommit to override."
+        return 1
+    fi
+
+    janus_vm_log_warn "Host capacity check reported blocking issues for $JANUS_VM_NAME; continuing."
+}
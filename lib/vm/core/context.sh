@@ -13,7 +13,6 @@ JANUS_VM_CONTEXT_LOADED=1
 
 JANUS_VM_VERSION="0.2"
 
-JANUS_VM_SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 JANUS_VM_TEMPLATE_DIR="$JANUS_ROOT_DIR/templates/libvirt"
 
 JANUS_VM_CONFIG_DIR="$HOME/.config/janus/vm"
@@ -21,6 +20,8 @@ JANUS_VM_DEF_DIR="$JANUS_VM_CONFIG_DIR/definitions"
 JANUS_VM_NVRAM_DIR="$JANUS_VM_CONFIG_DIR/nvram"
 JANUS_VM_UNATTEND_DIR="$JANUS_VM_CONFIG_DIR/unattend"
 JANUS_VM_DEFAULT_DISK_DIR="$HOME/.local/share/janus/vms"
+# janus.conf is written by janus-init for the invoking user, also under sudo.
+JANUS_VM_JANUS_CONF="$(janus_runtime_invoking_home)/.config/janus/janus.conf"
 
 JANUS_VM_ACTION=""
 JANUS_VM_NAME="janus-win11"
@@ -45,6 +46,27 @@ JANUS_VM_WIN_PASSWORD=""
 JANUS_VM_APPLY=0
 JANUS_VM_ASSUME_YES=0
 JANUS_VM_FORCE=0
+JANUS_VM_IRQ_CPUS=""
+JANUS_VM_IRQ_WAIT=""
+JANUS_VM_IRQ_WATCH=0
+JANUS_VM_IRQ_WATCH_INTERVAL=2
+JANUS_VM_SHUTDOWN_WAIT=60
+JANUS_VM_ALLOW_OVERCOMMIT=0
+JANUS_VM_MEMORY_PROFILE=""
+
+# balloon-daemon settings; empty values get defaults during validation.
+JANUS_VM_BALLOON_ALL=0
+JANUS_VM_BALLOON_INTERVAL=""
+JANUS_VM_BALLOON_MIN_MIB=""
+JANUS_VM_BALLOON_MAX_MIB=""
+JANUS_VM_BALLOON_FREE_BAND=""
+JANUS_VM_BALLOON_ITERATIONS=""
+
+# Looking Glass settings; empty values fall back to janus.conf, then defaults.
+JANUS_VM_LOOKING_GLASS=""
+JANUS_VM_LG_RESOLUTION=""
+JANUS_VM_LG_BIT_DEPTH=""
+JANUS_VM_LG_SIZE_MIB=""
 
 # Parsed PCI components for passthrough rendering.
 JANUS_VM_GPU_DOMAIN=""
@@ -169,3 +169,45 @@ janus_vm_domain_exists() {
 janus_vm_domain_state() {
     virsh -c "$JANUS_VM_CONNECT_URI" domstate "$JANUS_VM_NAME" 2>/dev/null | awk 'NR==1 {print $0}'
 }
+
+# List host PCI addresses of hostdev entries in a libvirt definition file.
+janus_vm_definition_hostdev_pcis() {
+    local def_file="$1"
+
+    [ -f "$def_file" ] || return 0
+
+    awk '
+        function hex_attr(line, name, width,    value) {
+            if (!match(line, name "=.0x[0-9a-fA-F]+")) {
+                return ""
+            }
+            value = tolower(substr(line, RSTART + length(name) + 4, RLENGTH - length(name) - 4))
+            while (length(value) < width) {
+                value = "0" value
+            }
+            return value
+        }
+        /<hostdev .*type=.pci./ { in_hostdev = 1 }
+        in_hostdev && /<source>/ { in_source = 1 }
+        in_hostdev && in_source && /<address / {
+            printf "%s:%s:%s.%s\n", hex_attr($0, "domain", 4), hex_attr($0, "bus", 2), hex_attr($0, "slot", 2), hex_attr($0, "function", 1)
+        }
+        /<\/source>/ { in_source = 0 }
+        /<\/hostdev>/ { in_hostdev = 0; in_source = 0 }
+    ' "$def_file"
+}
+
+# Print the host cpuset used by vcpupin entries as a single cpulist.
+janus_vm_definition_pinned_cpus() {
+    local def_file="$1"
+
+    [ -f "$def_file" ] || return 0
+
+    awk '
+        /<vcpupin / && match($0, /cpuset=.[0-9,-]+/) {
+            cpus = substr($0, RSTART + 8, RLENGTH - 8)
+            out = (out == "") ? cpus : out "," cpus
+        }
+        END { if (out != "") print out }
+    ' "$def_file"
+}
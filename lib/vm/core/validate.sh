@@ -108,6 +108,15 @@ janus_vm_validate_create() {
         janus_vm_log_warn "Ignoring --gpu/--gpu-audio because mode is base."
     fi
 
+    janus_vm_resolve_looking_glass
+
+    [ -n "$JANUS_VM_MEMORY_PROFILE" ] || JANUS_VM_MEMORY_PROFILE="static"
+    janus_vm_is_memory_profile "$JANUS_VM_MEMORY_PROFILE" \
+        || janus_vm_die "Invalid --memory-profile: $JANUS_VM_MEMORY_PROFILE (expected static|reclaim)"
+    if [ "$JANUS_VM_MEMORY_PROFILE" = "reclaim" ] && [ "$JANUS_VM_MODE" = "passthrough" ]; then
+        janus_vm_log_warn "VFIO pins all guest memory; the reclaim profile will not return memory from a passthrough VM."
+    fi
+
     if [ "$JANUS_VM_UNATTENDED_ENABLED" -eq 1 ]; then
         [ -n "$JANUS_VM_WIN_USERNAME" ] || janus_vm_die "--win-user is required when --unattended is enabled."
     fi
@@ -115,6 +124,85 @@ janus_vm_validate_create() {
     if [ "$JANUS_VM_FORCE" -eq 1 ]; then
         janus_vm_die "--force is only valid for the stop action."
     fi
+
+    [ -z "$JANUS_VM_IRQ_CPUS$JANUS_VM_IRQ_WAIT" ] && [ "$JANUS_VM_IRQ_WATCH" -eq 0 ] \
+        || janus_vm_die "--irq-cpus/--irq-wait/--watch are only valid for start and irq-pin."
+    janus_vm_reject_balloon_options
+}
+
+# Fail when balloon-daemon options are passed to another action.
+janus_vm_reject_balloon_options() {
+    if [ "$JANUS_VM_BALLOON_ALL" -eq 1 ] || [ -n "$JANUS_VM_BALLOON_INTERVAL$JANUS_VM_BALLOON_MIN_MIB$JANUS_VM_BALLOON_MAX_MIB$JANUS_VM_BALLOON_FREE_BAND$JANUS_VM_BALLOON_ITERATIONS" ]; then
+        janus_vm_die "--all/--interval/--min-mib/--max-mib/--free-band/--iterations are only valid for balloon-daemon."
+    fi
+}
+
+# Validate balloon-daemon options and derive defaults.
+janus_vm_validate_balloon_daemon() {
+    local low=""
+    local high=""
+
+    [ -n "$JANUS_VM_BALLOON_INTERVAL" ] || JANUS_VM_BALLOON_INTERVAL=10
+    [ -n "$JANUS_VM_BALLOON_FREE_BAND" ] || JANUS_VM_BALLOON_FREE_BAND="10:30"
+    [ -n "$JANUS_VM_BALLOON_ITERATIONS" ] || JANUS_VM_BALLOON_ITERATIONS=0
+
+    janus_vm_is_integer "$JANUS_VM_BALLOON_INTERVAL" && [ "$JANUS_VM_BALLOON_INTERVAL" -gt 0 ] \
+        || janus_vm_die "--interval must be an integer > 0"
+    janus_vm_is_integer "$JANUS_VM_BALLOON_ITERATIONS" || janus_vm_die "--iterations must be an integer."
+
+    if [ -n "$JANUS_VM_BALLOON_MIN_MIB" ]; then
+        janus_vm_is_integer "$JANUS_VM_BALLOON_MIN_MIB" || janus_vm_die "--min-mib must be an integer."
+    fi
+    if [ -n "$JANUS_VM_BALLOON_MAX_MIB" ]; then
+        janus_vm_is_integer "$JANUS_VM_BALLOON_MAX_MIB" && [ "$JANUS_VM_BALLOON_MAX_MIB" -gt 0 ] \
+            || janus_vm_die "--max-mib must be an integer > 0"
+    fi
+    if [ -n "$JANUS_VM_BALLOON_MIN_MIB" ] && [ -n "$JANUS_VM_BALLOON_MAX_MIB" ] \
+        && [ "$JANUS_VM_BALLOON_MIN_MIB" -gt "$JANUS_VM_BALLOON_MAX_MIB" ]; then
+        janus_vm_die "--min-mib cannot exceed --max-mib."
+    fi
+
+    [[ "$JANUS_VM_BALLOON_FREE_BAND" =~ ^[0-9]+:[0-9]+$ ]] \
+        || janus_vm_die "Invalid --free-band: $JANUS_VM_BALLOON_FREE_BAND (expected LOW:HIGH percent)"
+    low="${JANUS_VM_BALLOON_FREE_BAND%%:*}"
+    high="${JANUS_VM_BALLOON_FREE_BAND##*:}"
+    [ "$low" -lt "$high" ] && [ "$high" -lt 100 ] \
+        || janus_vm_die "--free-band needs LOW < HIGH < 100: $JANUS_VM_BALLOON_FREE_BAND"
+}
+
+# Resolve Looking Glass settings from CLI flags, janus.conf, and defaults.
+janus_vm_resolve_looking_glass() {
+    if [ -z "$JANUS_VM_LOOKING_GLASS" ]; then
+        # janus.conf only opts passthrough guests in; base guests have no GPU to capture.
+        if [ "$JANUS_VM_MODE" = "passthrough" ]; then
+            JANUS_VM_LOOKING_GLASS="$(janus_lg_conf_value "$JANUS_VM_JANUS_CONF" LOOKING_GLASS)"
+        fi
+        [ -n "$JANUS_VM_LOOKING_GLASS" ] || JANUS_VM_LOOKING_GLASS="disabled"
+    fi
+
+    [ "$JANUS_VM_LOOKING_GLASS" = "enabled" ] && JANUS_VM_LOOKING_GLASS="shm"
+    janus_lg_is_mode "$JANUS_VM_LOOKING_GLASS" \
+        || janus_vm_die "Invalid --looking-glass mode: $JANUS_VM_LOOKING_GLASS (expected disabled|shm|kvmfr)"
+
+    if [ "$JANUS_VM_LOOKING_GLASS" = "disabled" ]; then
+        [ -z "$JANUS_VM_LG_RESOLUTION$JANUS_VM_LG_BIT_DEPTH" ] \
+            || janus_vm_log_warn "Ignoring --lg-resolution/--lg-bit-depth because Looking Glass is disabled."
+        return 0
+    fi
+
+    [ "$JANUS_VM_MODE" = "passthrough" ] || janus_vm_die "--looking-glass requires --mode passthrough."
+
+    [ -n "$JANUS_VM_LG_RESOLUTION" ] || JANUS_VM_LG_RESOLUTION="$(janus_lg_conf_value "$JANUS_VM_JANUS_CONF" LOOKING_GLASS_RESOLUTION)"
+    [ -n "$JANUS_VM_LG_RESOLUTION" ] || JANUS_VM_LG_RESOLUTION="$JANUS_LG_DEFAULT_RESOLUTION"
+    [ -n "$JANUS_VM_LG_BIT_DEPTH" ] || JANUS_VM_LG_BIT_DEPTH="$(janus_lg_conf_value "$JANUS_VM_JANUS_CONF" LOOKING_GLASS_BIT_DEPTH)"
+    [ -n "$JANUS_VM_LG_BIT_DEPTH" ] || JANUS_VM_LG_BIT_DEPTH="$JANUS_LG_DEFAULT_BIT_DEPTH"
+
+    janus_lg_is_resolution "$JANUS_VM_LG_RESOLUTION" \
+        || janus_vm_die "Invalid --lg-resolution: $JANUS_VM_LG_RESOLUTION (expected WIDTHxHEIGHT)"
+    janus_lg_is_bit_depth "$JANUS_VM_LG_BIT_DEPTH" \
+        || janus_vm_die "Invalid --lg-bit-depth: $JANUS_VM_LG_BIT_DEPTH (expected 8|10|16)"
+
+    JANUS_VM_LG_SIZE_MIB="$(janus_lg_size_mib "$JANUS_VM_LG_RESOLUTION" "$JANUS_VM_LG_BIT_DEPTH")"
 }
 
 # Validate options for non-create actions.
@@ -128,9 +216,39 @@ janus_vm_validate_non_create() {
     [ "$JANUS_VM_SINGLE_GPU_MODE" = "shared-vram" ] || janus_vm_die "--single-gpu-mode is only valid for create."
     [ "$JANUS_VM_UNATTENDED_ENABLED" -eq 0 ] || janus_vm_die "--unattended is only valid for create."
     [ -z "$JANUS_VM_WIN_USERNAME$JANUS_VM_WIN_PASSWORD" ] || janus_vm_die "--win-user/--win-password are only valid for create."
+    [ -z "$JANUS_VM_LOOKING_GLASS$JANUS_VM_LG_RESOLUTION$JANUS_VM_LG_BIT_DEPTH" ] \
+        || janus_vm_die "--looking-glass/--lg-resolution/--lg-bit-depth are only valid for create."
+
+    [ "$JANUS_VM_ACTION" = "stop" ] || [ "$JANUS_VM_FORCE" -eq 0 ] \
+        || janus_vm_die "--force is only valid for stop."
+
+    if [ "$JANUS_VM_ALLOW_OVERCOMMIT" -eq 1 ] && [ "$JANUS_VM_ACTION" != "start" ]; then
+        janus_vm_die "--allow-overcommit is only valid for create and start."
+    fi
+
+    [ -z "$JANUS_VM_MEMORY_PROFILE" ] || janus_vm_die "--memory-profile is only valid for create."
+
+    if [ "$JANUS_VM_ACTION" = "balloon-daemon" ]; then
+        janus_vm_validate_balloon_daemon
+    else
+        janus_vm_reject_balloon_options
+    fi
+
+    if [ "$JANUS_VM_ACTION" = "start" ] || [ "$JANUS_VM_ACTION" = "irq-pin" ]; then
+        [ "$JANUS_VM_ACTION" = "start" ] || [ -n "$JANUS_VM_IRQ_CPUS" ] \
+            || janus_vm_die "irq-pin requires --irq-cpus LIST|auto."
+        if [ -z "$JANUS_VM_IRQ_CPUS" ] && { [ -n "$JANUS_VM_IRQ_WAIT" ] || [ "$JANUS_VM_IRQ_WATCH" -eq 1 ]; }; then
+            janus_vm_die "--irq-wait/--watch require --irq-cpus."
+        fi
+        [ -n "$JANUS_VM_IRQ_WAIT" ] || JANUS_VM_IRQ_WAIT=60
+        janus_vm_is_integer "$JANUS_VM_IRQ_WAIT" || janus_vm_die "--irq-wait must be an integer."
+    elif [ -n "$JANUS_VM_IRQ_CPUS$JANUS_VM_IRQ_WAIT" ] || [ "$JANUS_VM_IRQ_WATCH" -eq 1 ]; then
+        janus_vm_die "--irq-cpus/--irq-wait/--watch are only valid for start and irq-pin."
+    fi
 
-    if [ "$JANUS_VM_ACTION" = "start" ] || [ "$JANUS_VM_ACTION" = "status" ]; then
-        [ "$JANUS_VM_FORCE" -eq 0 ] || janus_vm_die "--force is only valid for stop."
+    if [ -n "$JANUS_VM_IRQ_CPUS" ]; then
+        [ "$JANUS_VM_IRQ_CPUS" = "auto" ] || janus_irq_is_cpulist "$JANUS_VM_IRQ_CPUS" \
+            || janus_vm_die "Invalid --irq-cpus value: $JANUS_VM_IRQ_CPUS (expected cpulist like 2-5,8 or auto)"
     fi
 }
 
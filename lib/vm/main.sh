@@ -17,6 +17,8 @@ JANUS_ROOT_DIR="${JANUS_ROOT_DIR:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." &&
 source "$JANUS_ROOT_DIR/lib/core/runtime/logging.sh"
 # shellcheck source=../core/runtime/safety.sh
 source "$JANUS_ROOT_DIR/lib/core/runtime/safety.sh"
+# shellcheck source=../core/runtime/loader.sh
+source "$JANUS_ROOT_DIR/lib/core/runtime/loader.sh"
 
 # shellcheck source=core/context.sh
 source "$JANUS_ROOT_DIR/lib/vm/core/context.sh"
@@ -24,38 +26,55 @@ source "$JANUS_ROOT_DIR/lib/vm/core/context.sh"
 source "$JANUS_ROOT_DIR/lib/vm/core/helpers.sh"
 # shellcheck source=core/validate.sh
 source "$JANUS_ROOT_DIR/lib/vm/core/validate.sh"
-
 # shellcheck source=cli/args.sh
 source "$JANUS_ROOT_DIR/lib/vm/cli/args.sh"
-# shellcheck source=cli/wizard.sh
-source "$JANUS_ROOT_DIR/lib/vm/cli/wizard.sh"
 
-# shellcheck source=xml/blocks.sh
-source "$JANUS_ROOT_DIR/lib/vm/xml/blocks.sh"
-# shellcheck source=xml/render.sh
-source "$JANUS_ROOT_DIR/lib/vm/xml/render.sh"
+# Libraries each action needs on top of the modules above (paths under lib/).
+declare -gA JANUS_VM_ACTION_LIBS=(
+    [create]="core/runtime/lookingglass.sh vm/core/capacity.sh vm/core/balloon.sh vm/cli/wizard.sh vm/xml/blocks.sh vm/xml/render.sh vm/storage/unattend.sh vm/actions/create.sh"
+    [start]="core/runtime/irq.sh vm/core/capacity.sh vm/actions/lifecycle.sh"
+    [stop]="core/runtime/irq.sh vm/actions/lifecycle.sh"
+    [status]="vm/actions/lifecycle.sh"
+    [irq-pin]="core/runtime/irq.sh vm/actions/lifecycle.sh"
+    [capacity]="vm/core/capacity.sh vm/actions/capacity.sh"
+    [balloon-daemon]="vm/core/capacity.sh vm/core/balloon.sh vm/actions/balloon.sh"
+)
 
-# shellcheck source=storage/unattend.sh
-source "$JANUS_ROOT_DIR/lib/vm/storage/unattend.sh"
+# Source the libraries required by one or more actions.
+janus_vm_load_action_libs() {
+    local action=""
+    local libs=()
 
-# shellcheck source=actions/create.sh
-source "$JANUS_ROOT_DIR/lib/vm/actions/create.sh"
-# shellcheck source=actions/lifecycle.sh
-source "$JANUS_ROOT_DIR/lib/vm/actions/lifecycle.sh"
+    for action in "$@"; do
+        [ -n "${JANUS_VM_ACTION_LIBS[$action]:-}" ] || janus_vm_die "Unhandled action: $action"
+        read -r -a libs <<< "${JANUS_VM_ACTION_LIBS[$action]}"
+        janus_runtime_require "${libs[@]}" || janus_vm_die "Unable to load janus-vm modules for: $action"
+    done
+}
 
 # Execute janus-vm action flow.
 janus_vm_main() {
-    janus_runtime_start_logging "janus-vm" || exit 1
+    janus_runtime_defer_logging "janus-vm"
 
     janus_vm_parse_args "$@"
+    janus_vm_load_action_libs "$JANUS_VM_ACTION"
+
+    # Actions that change VM or host state keep a full output transcript;
+    # read-only ones only create log files if they log something.
+    case "$JANUS_VM_ACTION" in
+        create|start|stop|irq-pin)
+            janus_runtime_start_logging "janus-vm" || exit 1
+            ;;
+    esac
+
     janus_vm_validate_common
-    janus_vm_maybe_run_guided_create_wizard
+    [ "$JANUS_VM_ACTION" != "create" ] || janus_vm_maybe_run_guided_create_wizard
 
     case "$JANUS_VM_ACTION" in
         create)
             janus_vm_validate_create
             ;;
-        start|stop|status)
+        start|stop|status|capacity|balloon-daemon|irq-pin)
             janus_vm_validate_non_create
             ;;
         *)
@@ -76,6 +95,15 @@ janus_vm_main() {
         status)
             janus_vm_status
             ;;
+        capacity)
+            janus_vm_capacity_report
+            ;;
+        balloon-daemon)
+            janus_vm_balloon_daemon
+            ;;
+        irq-pin)
+            janus_vm_irq_pin
+            ;;
         *)
             janus_vm_die "Unhandled action: $JANUS_VM_ACTION"
             ;;
@@ -105,6 +105,62 @@ EOF_BLOCK
 EOF_BLOCK
 }
 
+# Build IVSHMEM device block for Looking Glass on the /dev/shm backend.
+janus_vm_build_shmem_block() {
+    case "$JANUS_VM_LOOKING_GLASS" in
+        shm)
+            ;;
+        kvmfr)
+            printf '%s\n' "    <!-- Looking Glass kvmfr region is attached via qemu:commandline -->"
+            return 0
+            ;;
+        *)
+            printf '%s\n' "    <!-- No Looking Glass shared memory configured -->"
+            return 0
+            ;;
+    esac
+
+    cat <<EOF_BLOCK
+    <shmem name='${JANUS_LG_SHM_NAME}'>
+      <model type='ivshmem-plain'/>
+      <size unit='M'>${JANUS_VM_LG_SIZE_MIB}</size>
+    </shmem>
+EOF_BLOCK
+}
+
+# Build QEMU command-line passthrough for the kvmfr Looking Glass backend.
+# libvirt <shmem> cannot target a character device, so kvmfr needs raw args.
+janus_vm_build_qemu_commandline_block() {
+    if [ "$JANUS_VM_LOOKING_GLASS" != "kvmfr" ]; then
+        printf '%s\n' "  <!-- No QEMU command-line overrides -->"
+        return 0
+    fi
+
+    cat <<EOF_BLOCK
+  <qemu:commandline>
+    <qemu:arg value='-device'/>
+    <qemu:arg value='{"driver":"ivshmem-plain","id":"shmem-lg","memdev":"${JANUS_LG_SHM_NAME}"}'/>
+    <qemu:arg value='-object'/>
+    <qemu:arg value='{"qom-type":"memory-backend-file","id":"${JANUS_LG_SHM_NAME}","mem-path":"${JANUS_LG_KVMFR_PATH}","size":$((JANUS_VM_LG_SIZE_MIB * 1048576)),"share":true}'/>
+  </qemu:commandline>
+EOF_BLOCK
+}
+
+# Build the virtio balloon device for the selected memory profile.
+# reclaim lets the guest report freed pages and exposes stats to balloon-daemon.
+janus_vm_build_memballoon_block() {
+    if [ "$JANUS_VM_MEMORY_PROFILE" != "reclaim" ]; then
+        printf '%s\n' "    <memballoon model='virtio'/>"
+        return 0
+    fi
+
+    cat <<EOF_BLOCK
+    <memballoon model='virtio' freePageReporting='on'>
+      <stats period='${JANUS_VM_BALLOON_STATS_PERIOD}'/>
+    </memballoon>
+EOF_BLOCK
+}
+
 # Build passthrough hostdev block for GPU + HDMI audio function.
 janus_vm_build_gpu_hostdev_block() {
     if [ "$JANUS_VM_MODE" != "passthrough" ]; then
@@ -20,6 +20,9 @@ janus_vm_render_xml_definition() {
     local unattended_block=""
     local display_block=""
     local gpu_hostdev_block=""
+    local shmem_block=""
+    local qemu_commandline_block=""
+    local memballoon_block=""
     local nvram_path="$JANUS_VM_NVRAM_DIR/${JANUS_VM_NAME}_VARS.fd"
     local unattended_iso_path="$JANUS_VM_UNATTEND_DIR/${JANUS_VM_NAME}.iso"
 
@@ -34,6 +37,9 @@ janus_vm_render_xml_definition() {
 
     display_block="$(janus_vm_build_display_block)"
     gpu_hostdev_block="$(janus_vm_build_gpu_hostdev_block)"
+    shmem_block="$(janus_vm_build_shmem_block)"
+    qemu_commandline_block="$(janus_vm_build_qemu_commandline_block)"
+    memballoon_block="$(janus_vm_build_memballoon_block)"
 
     awk \
         -v VM_NAME="$JANUS_VM_NAME" \
@@ -49,6 +55,9 @@ janus_vm_render_xml_definition() {
         -v UNATTEND_BLOCK="$unattended_block" \
         -v DISPLAY_BLOCK="$display_block" \
         -v GPU_HOSTDEV_BLOCK="$gpu_hostdev_block" \
+        -v SHMEM_BLOCK="$shmem_block" \
+        -v QEMU_COMMANDLINE_BLOCK="$qemu_commandline_block" \
+        -v MEMBALLOON_BLOCK="$memballoon_block" \
         '
         {
             gsub(/__VM_NAME__/, VM_NAME)
@@ -64,6 +73,9 @@ janus_vm_render_xml_definition() {
             gsub(/__UNATTEND_DEVICE_BLOCK__/, UNATTEND_BLOCK)
             gsub(/__DISPLAY_DEVICE_BLOCK__/, DISPLAY_BLOCK)
             gsub(/__GPU_HOSTDEV_BLOCK__/, GPU_HOSTDEV_BLOCK)
+            gsub(/__SHMEM_DEVICE_BLOCK__/, SHMEM_BLOCK)
+            gsub(/__QEMU_COMMANDLINE_BLOCK__/, QEMU_COMMANDLINE_BLOCK)
+            gsub(/__MEMBALLOON_BLOCK__/, MEMBALLOON_BLOCK)
             print
         }
         ' "$template_file" > "$out_file" || janus_vm_die "Unable to render VM definition: $out_file"
@@ -11,12 +11,21 @@ import shlex
 import shutil
 import subprocess
 import sys
-from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 BIN_DIR = REPO_ROOT / "bin"
 LANG_DIR = REPO_ROOT / "languages"
 
+# Overridable so the inventory can be read from fixture trees.
+SYS_ROOT = Path(os.environ.get("JANUS_TUI_SYS_ROOT", "/sys"))
+PCI_IDS_PATHS: Tuple[str, ...] = (
+    os.environ.get("JANUS_TUI_PCI_IDS", ""),
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+)
+
 DEPENDENCY_COMMANDS: Tuple[str, ...] = (
     "virsh",
     "qemu-img",
@@ -51,7 +60,98 @@ PACKAGE_BY_MANAGER: Dict[str, Dict[str, str]] = {
     },
 }
 
+PCI_CLASS_NAMES: Dict[str, str] = {
+    "01": "Storage",
+    "02": "Network",
+    "03": "Display",
+    "04": "Multimedia",
+    "05": "Memory",
+    "06": "Bridge",
+    "07": "Communication",
+    "08": "System",
+    "09": "Input",
+    "0c": "Serial bus",
+    "0d": "Wireless",
+    "10": "Encryption",
+    "11": "Signal proc",
+    "12": "Accelerator",
+}
+
+PCI_SUBCLASS_NAMES: Dict[str, str] = {
+    "0106": "SATA",
+    "0108": "NVMe",
+    "0300": "VGA",
+    "0302": "3D",
+    "0403": "Audio",
+    "0c03": "USB",
+}
+
 MenuOption = Tuple[str, Callable[[], None]]
+ListItem = TypeVar("ListItem")
+
+
+class PciDevice(NamedTuple):
+    address: str
+    vendor_id: str
+    device_id: str
+    class_code: str
+    driver: str
+    iommu_group: str
+    vendor_name: str
+    device_name: str
+
+    @property
+    def slot(self) -> str:
+        return self.address.rsplit(".", 1)[0]
+
+    @property
+    def base_class_name(self) -> str:
+        return PCI_CLASS_NAMES.get(self.class_code[:2], "Other")
+
+    @property
+    def class_name(self) -> str:
+        return PCI_SUBCLASS_NAMES.get(self.class_code[:4], self.base_class_name)
+
+    @property
+    def is_gpu(self) -> bool:
+        return self.class_code.startswith("03")
+
+    @property
+    def is_audio(self) -> bool:
+        return self.class_code.startswith("0403")
+
+    @property
+    def description(self) -> str:
+        vendor = self.vendor_name or self.vendor_id
+        device = self.device_name or self.device_id
+        return f"{vendor} {device} [{self.vendor_id}:{self.device_id}]"
+
+
+class ListWindow:
+    """Cursor and scroll offset of a list that only renders its visible rows."""
+
+    def __init__(self) -> None:
+        self.index = 0
+        self.offset = 0
+        self.count = 0
+
+    def fit(self, count: int, rows: int) -> None:
+        self.count = count
+        self.index = max(0, min(self.index, count - 1))
+        if self.index < self.offset:
+            self.offset = self.index
+        elif self.index >= self.offset + rows:
+            self.offset = self.index - rows + 1
+        self.offset = max(0, min(self.offset, count - rows))
+
+    def move(self, delta: int, wrap: bool = False) -> None:
+        if self.count == 0:
+            return
+        target = self.index + delta
+        if wrap:
+            self.index = target % self.count
+        else:
+            self.index = max(0, min(self.count - 1, target))
 
 
 def parse_kv_file(path: Path) -> Dict[str, str]:
@@ -121,6 +221,135 @@ def detect_package_manager(os_release: Dict[str, str]) -> Optional[str]:
     return None
 
 
+def read_sysfs_value(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore").strip()
+    except OSError:
+        return ""
+
+
+def find_pci_ids_file() -> Optional[Path]:
+    for candidate in PCI_IDS_PATHS:
+        if candidate and Path(candidate).is_file():
+            return Path(candidate)
+    return None
+
+
+def read_pci_ids(path: Path, vendor_ids: Set[str]) -> Dict[str, str]:
+    """Read vendor and device names from pci.ids, keeping only the given vendors.
+
+    Keys are "vvvv" for vendors and "vvvv:dddd" for devices.
+    """
+    names: Dict[str, str] = {}
+    vendor: Optional[str] = None
+
+    try:
+        with path.open("r", encoding="utf-8", errors="ignore") as handle:
+            for raw_line in handle:
+                if not raw_line.strip() or raw_line.startswith("#"):
+                    continue
+                # The device class section follows the vendor list.
+                if raw_line.startswith("C "):
+                    break
+                if raw_line.startswith("\t\t"):
+                    continue
+
+                code, _sep, name = raw_line.strip().partition(" ")
+                if raw_line.startswith("\t"):
+                    if vendor is not None:
+                        names[f"{vendor}:{code.lower()}"] = name.strip()
+                    continue
+
+                vendor = code.lower() if code.lower() in vendor_ids else None
+                if vendor is not None:
+                    names[vendor] = name.strip()
+    except OSError:
+        return {}
+
+    return names
+
+
+def load_pci_inventory(sys_root: Optional[Path] = None, pci_ids: Optional[Path] = None) -> List[PciDevice]:
+    """Build the PCI device inventory (ids, class, driver, IOMMU group) from sysfs."""
+    devices_dir = (sys_root or SYS_ROOT) / "bus" / "pci" / "devices"
+    if not devices_dir.is_dir():
+        return []
+
+    raw: List[Tuple[str, str, str, str, str, str]] = []
+    for entry in sorted(devices_dir.iterdir()):
+        vendor_id = read_sysfs_value(entry / "vendor").lower().replace("0x", "")
+        device_id = read_sysfs_value(entry / "device").lower().replace("0x", "")
+        class_code = read_sysfs_value(entry / "class").lower().replace("0x", "")
+
+        driver = "none"
+        if (entry / "driver").exists():
+            driver = Path(os.readlink(str(entry / "driver"))).name
+
+        group = "-"
+        if (entry / "iommu_group").exists():
+            group = Path(os.readlink(str(entry / "iommu_group"))).name
+
+        raw.append((entry.name, vendor_id, device_id, class_code, driver, group))
+
+    ids_file = pci_ids or find_pci_ids_file()
+    names = read_pci_ids(ids_file, {item[1] for item in raw}) if ids_file else {}
+
+    return [
+        PciDevice(
+            address=address,
+            vendor_id=vendor_id,
+            device_id=device_id,
+            class_code=class_code,
+            driver=driver,
+            iommu_group=group,
+            vendor_name=names.get(vendor_id, ""),
+            device_name=names.get(f"{vendor_id}:{device_id}", ""),
+        )
+        for address, vendor_id, device_id, class_code, driver, group in raw
+    ]
+
+
+def device_matches(device: PciDevice, token: str) -> bool:
+    key, sep, value = token.partition(":")
+
+    if sep and key == "vendor":
+        return device.vendor_id.startswith(value) or value in device.vendor_name.lower()
+    if sep and key == "class":
+        return (
+            device.class_code.startswith(value)
+            or value in device.class_name.lower()
+            or value in device.base_class_name.lower()
+        )
+    if sep and key == "driver":
+        return value in device.driver.lower()
+    if sep and key == "group":
+        return not value or device.iommu_group == value
+
+    haystack = " ".join(
+        (
+            device.address,
+            f"{device.vendor_id}:{device.device_id}",
+            device.vendor_name,
+            device.device_name,
+            device.class_name,
+            device.base_class_name,
+            device.driver,
+            f"group {device.iommu_group}",
+        )
+    ).lower()
+    return token in haystack
+
+
+def filter_devices(devices: Sequence[PciDevice], query: str) -> List[PciDevice]:
+    """Keep devices matching every whitespace-separated token of query.
+
+    Tokens may be scoped as vendor:, class:, driver: or group:; bare tokens
+    match address, ids, names, class and driver.
+    """
+    tokens = query.lower().split()
+    return [device for device in devices if all(device_matches(device, token) for token in tokens)]
+
+
 def pick_default_language(available: Sequence[str]) -> str:
     env_lang = os.environ.get("LANG", "")
     code = env_lang.split(".", 1)[0].split("_", 1)[0].lower()
@@ -173,7 +402,15 @@ class JanusTUI:
         except curses.error:
             return
 
-    def draw_chrome(self, title: str) -> None:
+    def selected_attr(self) -> int:
+        return curses.color_pair(3) | curses.A_BOLD if curses.has_colors() else curses.A_REVERSE
+
+    def draw_row(self, y: int, text: str, attr: int = 0) -> None:
+        # Pad to the full width so partial redraws never leave stale characters.
+        _height, width = self.stdscr.getmaxyx()
+        self.safe_addstr(y, 2, text.ljust(max(0, width - 3)), attr)
+
+    def draw_chrome(self, title: str, hint: Optional[str] = None) -> None:
         self.stdscr.erase()
         height, width = self.stdscr.getmaxyx()
 
@@ -191,27 +428,33 @@ class JanusTUI:
             attr = curses.color_pair(4) if curses.has_colors() else curses.A_BOLD
             self.safe_addstr(height - 2, 2, self.status, attr)
 
-        self.safe_addstr(height - 1, 2, self.t("menu_hint"))
+        self.safe_addstr(height - 1, 2, hint or self.t("menu_hint"))
 
     def show_text(self, title: str, lines: Sequence[str]) -> None:
         offset = 0
         entries = list(lines) if lines else [""]
+        full = True
+        drawn_offset = -1
 
         while True:
-            self.draw_chrome(title)
-            height, width = self.stdscr.getmaxyx()
+            height, _width = self.stdscr.getmaxyx()
             max_lines = max(1, height - 6)
 
-            for row in range(max_lines):
-                idx = offset + row
-                if idx >= len(entries):
-                    break
-                self.safe_addstr(4 + row, 2, entries[idx][: width - 4])
+            if full:
+                self.draw_chrome(title)
+            if full or offset != drawn_offset:
+                for row in range(max_lines):
+                    idx = offset + row
+                    self.draw_row(4 + row, entries[idx] if idx < len(entries) else "")
+                drawn_offset = offset
+            full = False
 
             self.stdscr.refresh()
             key = self.stdscr.getch()
 
-            if key in (ord("q"), 27, 10, 13):
+            if key == curses.KEY_RESIZE:
+                full = True
+            elif key in (ord("q"), 27, 10, 13):
                 return
             if key in (curses.KEY_DOWN, ord("j")) and offset + max_lines < len(entries):
                 offset += 1
@@ -259,39 +502,115 @@ class JanusTUI:
         return answer in ("y", "yes", "s", "si")
 
     def menu(self, title: str, options: Sequence[MenuOption]) -> Optional[Callable[[], None]]:
-        index = 0
+        picked = self.browse(title, options, lambda option: option[0], numbered=True)
+        return picked[1] if picked is not None else None
+
+    def browse(
+        self,
+        title: str,
+        items: Sequence[ListItem],
+        render: Callable[[ListItem], str],
+        matcher: Optional[Callable[[Sequence[ListItem], str], List[ListItem]]] = None,
+        header: str = "",
+        numbered: bool = False,
+        query: str = "",
+    ) -> Optional[ListItem]:
+        """Pick one item from a scrolling list that only draws its visible rows.
+
+        The chrome is drawn once; cursor moves repaint the two affected rows
+        and scrolling repaints the list window. With a matcher, printable keys
+        edit an incremental filter query instead of acting as shortcuts.
+        """
+        filtering = matcher is not None
+        matches: List[ListItem] = matcher(items, query) if matcher else list(items)
+        view = ListWindow()
+        hint = self.t("browser_hint") if filtering else None
+        top = 4 + (1 if filtering else 0) + (1 if header else 0)
+
+        full = True
+        query_changed = False
+        drawn_index = -1
+        drawn_offset = -1
 
         while True:
-            self.draw_chrome(title)
             height, _width = self.stdscr.getmaxyx()
-
-            for i, (label, _callback) in enumerate(options):
-                y = 4 + i
-                if y >= height - 3:
-                    break
-                prefix = f"{i + 1}. "
-                line = f"{prefix}{label}"
-                if i == index:
-                    attr = curses.color_pair(3) | curses.A_BOLD if curses.has_colors() else curses.A_REVERSE
-                    self.safe_addstr(y, 2, line, attr)
+            rows = max(1, height - top - 3)
+            view.fit(len(matches), rows)
+
+            if full:
+                self.draw_chrome(title, hint)
+                if header:
+                    self.draw_row(top - 1, header, curses.A_BOLD)
+            if filtering and (full or query_changed):
+                self.draw_row(4, self.t("browser_filter", query=query, shown=len(matches), total=len(items)))
+
+            if full or query_changed or view.offset != drawn_offset:
+                dirty = range(view.offset, view.offset + rows)
+            else:
+                dirty = range(0) if view.index == drawn_index else (drawn_index, view.index)
+
+            for idx in dirty:
+                y = top + idx - view.offset
+                if idx < len(matches):
+                    prefix = f"{idx + 1}. " if numbered else ""
+                    attr = self.selected_attr() if idx == view.index else 0
+                    self.draw_row(y, prefix + render(matches[idx]), attr)
+                elif idx == 0:
+                    self.draw_row(y, self.t("browser_no_matches"))
                 else:
-                    self.safe_addstr(y, 2, line)
+                    self.draw_row(y, "")
+
+            if len(matches) > rows or filtering:
+                position = f"{view.index + 1}/{len(matches)}" if matches else ""
+                self.draw_row(top + rows, position)
+
+            drawn_index = view.index
+            drawn_offset = view.offset
+            full = False
+            query_changed = False
 
             self.stdscr.refresh()
             key = self.stdscr.getch()
 
-            if key in (curses.KEY_UP, ord("k")):
-                index = (index - 1) % len(options)
-            elif key in (curses.KEY_DOWN, ord("j")):
-                index = (index + 1) % len(options)
+            if key == curses.KEY_RESIZE:
+                full = True
+            elif key == curses.KEY_UP or (not filtering and key == ord("k")):
+                view.move(-1, wrap=not filtering)
+            elif key == curses.KEY_DOWN or (not filtering and key == ord("j")):
+                view.move(1, wrap=not filtering)
+            elif key == curses.KEY_NPAGE:
+                view.move(rows)
+            elif key == curses.KEY_PPAGE:
+                view.move(-rows)
+            elif key == curses.KEY_HOME:
+                view.move(-len(matches))
+            elif key == curses.KEY_END:
+                view.move(len(matches))
             elif key in (10, 13, curses.KEY_ENTER):
-                return options[index][1]
-            elif key in (ord("q"), 27):
+                if matches:
+                    return matches[view.index]
+            elif key == 27:
+                if not (filtering and query):
+                    return None
+                query = ""
+                query_changed = True
+            elif not filtering and key == ord("q"):
                 return None
-            elif ord("1") <= key <= ord("9"):
+            elif not filtering and ord("1") <= key <= ord("9"):
                 picked = key - ord("1")
-                if picked < len(options):
-                    return options[picked][1]
+                if picked < len(matches):
+                    return matches[picked]
+            elif filtering and key in (curses.KEY_BACKSPACE, 127, 8):
+                query = query[:-1]
+                query_changed = True
+            elif filtering and 32 <= key < 127:
+                query += chr(key)
+                query_changed = True
+
+            if query_changed and matcher is not None:
+                matches = matcher(items, query)
+                view.index = 0
+                view.offset = 0
 
     def run_shell_command(self, cmd: Sequence[str], requires_root: bool = False, pause: bool = True) -> bool:
         final_cmd = list(cmd)
@@ -356,38 +675,62 @@ class JanusTUI:
         return names
 
     def select_from_values(self, title: str, options: Sequence[Tuple[str, str]]) -> Optional[str]:
-        index = 0
+        picked = self.browse(title, options, lambda option: option[0], numbered=True)
+        return picked[1] if picked is not None else None
+
+    def browse_devices(self, title: str, devices: Sequence[PciDevice], query: str = "") -> Optional[PciDevice]:
+        header = "{:<13} {:>5}  {:<10}  {:<12}  {}".format(
+            self.t("browser_col_address")[:13],
+            self.t("browser_col_group")[:5],
+            self.t("browser_col_class")[:10],
+            self.t("browser_col_driver")[:12],
+            self.t("browser_col_device"),
+        )
 
-        while True:
-            self.draw_chrome(title)
-            height, _width = self.stdscr.getmaxyx()
+        def render(device: PciDevice) -> str:
+            return "{:<13} {:>5}  {:<10.10}  {:<12.12}  {}".format(
+                device.address,
+                device.iommu_group,
+                device.class_name,
+                device.driver,
+                device.description,
+            )
 
-            for i, (label, _value) in enumerate(options):
-                y = 4 + i
-                if y >= height - 3:
-                    break
-                line = f"{i + 1}. {label}"
-                if i == index:
-                    attr = curses.color_pair(3) | curses.A_BOLD if curses.has_colors() else curses.A_REVERSE
-                    self.safe_addstr(y, 2, line, attr)
-                else:
-                    self.safe_addstr(y, 2, line)
+        return self.browse(title, devices, render, matcher=filter_devices, header=header, query=query)
 
-            self.stdscr.refresh()
-            key = self.stdscr.getch()
+    def pick_pci_address(self, title: str, query: str, default: str) -> str:
+        devices = load_pci_inventory()
+        if not devices:
+            return self.prompt(self.t("vfio_input_pci"), default)
 
-            if key in (curses.KEY_UP, ord("k")):
-                index = (index - 1) % len(options)
-            elif key in (curses.KEY_DOWN, ord("j")):
-                index = (index + 1) % len(options)
-            elif key in (10, 13, curses.KEY_ENTER):
-                return options[index][1]
-            elif key in (ord("q"), 27):
-                return None
-            elif ord("1") <= key <= ord("9"):
-                picked = key - ord("1")
-                if picked < len(options):
-                    return options[picked][1]
+        device = self.browse_devices(title, devices, query)
+        return device.address if device is not None else ""
+
+    def pick_gpu_pair(self) -> Tuple[str, str]:
+        devices = load_pci_inventory()
+        if not devices:
+            gpu = self.prompt(self.t("input_gpu_pci"), "0000:03:00.0")
+            gpu_audio = self.prompt(self.t("input_gpu_audio_pci"), "0000:03:00.1")
+            return gpu, gpu_audio
+
+        gpu_device = self.browse_devices(self.t("browser_pick_gpu"), devices, "class:display")
+        if gpu_device is None:
+            return "", ""
+
+        # Most GPUs expose their HDMI/DP audio as a sibling function in the same slot.
+        audio = [
+            device
+            for device in devices
+            if device.slot == gpu_device.slot and device.address != gpu_device.address and device.is_audio
+        ]
+        if len(audio) == 1:
+            self.status = self.t("status_gpu_pair", gpu=gpu_device.address, audio=audio[0].address)
+            return gpu_device.address, audio[0].address
+
+        audio_device = self.browse_devices(self.t("browser_pick_gpu_audio"), devices, gpu_device.slot)
+        if audio_device is None:
+            return gpu_device.address, ""
+        return gpu_device.address, audio_device.address
 
     def dependency_summary(self) -> Tuple[Dict[str, str], Optional[str], List[str], List[str]]:
         os_release = read_os_release()
@@ -438,7 +781,7 @@ class JanusTUI:
         self.run_shell_command(["bash", str(BIN_DIR / "janus-init.sh")])
 
         if self.confirm(self.t("guided_step_bind_list"), default_yes=True):
-            self.run_shell_command(["bash", str(BIN_DIR / "janus-bind.sh"), "--list"])
+            self.action_vfio_list()
 
         self.status = self.t("guided_done")
 
@@ -510,10 +853,37 @@ class JanusTUI:
             picked()
 
     def action_vfio_list(self) -> None:
-        self.run_shell_command(["bash", str(BIN_DIR / "janus-bind.sh"), "--list"])
+        devices = load_pci_inventory()
+        if not devices:
+            self.show_text(self.t("browser_devices_title"), [self.t("browser_empty_inventory", path=SYS_ROOT)])
+            return
+
+        query = "class:display"
+        while True:
+            device = self.browse_devices(self.t("browser_devices_title"), devices, query)
+            if device is None:
+                return
+            self.show_device_details(device, devices)
+
+    def show_device_details(self, device: PciDevice, devices: Sequence[PciDevice]) -> None:
+        lines = [
+            f"{self.t('browser_col_address')}: {device.address}",
+            f"{self.t('browser_col_device')}: {device.description}",
+            f"{self.t('browser_col_class')}: {device.class_name} ({device.class_code})",
+            f"{self.t('browser_col_driver')}: {device.driver}",
+            f"{self.t('browser_col_group')}: {device.iommu_group}",
+        ]
+
+        if device.iommu_group != "-":
+            lines.extend(["", self.t("device_group_members")])
+            for member in devices:
+                if member.iommu_group == device.iommu_group:
+                    lines.append(f"- {member.address}  {member.class_name}  {member.driver}  {member.description}")
+
+        self.show_text(self.t("device_details_title"), lines)
 
     def action_vfio_dry_run(self) -> None:
-        pci = self.prompt(self.t("vfio_input_pci"), "0000:03:00.0")
+        pci = self.pick_pci_address(self.t("browser_pick_device"), "class:display", "0000:03:00.0")
         if not pci:
             return
         self.run_shell_command(
@@ -528,7 +898,7 @@ class JanusTUI:
         )
 
     def action_vfio_apply(self) -> None:
-        pci = self.prompt(self.t("vfio_input_pci"), "0000:03:00.0")
+        pci = self.pick_pci_address(self.t("browser_pick_device"), "class:display", "0000:03:00.0")
         if not pci:
             return
         if not self.confirm(self.t("vfio_confirm_apply"), default_yes=False):
@@ -636,8 +1006,7 @@ class JanusTUI:
                 return
             cmd.extend(["--single-gpu-mode", single_mode])
         else:
-            gpu = self.prompt(self.t("input_gpu_pci"), "0000:03:00.0")
-            gpu_audio = self.prompt(self.t("input_gpu_audio_pci"), "0000:03:00.1")
+            gpu, gpu_audio = self.pick_gpu_pair()
             if not gpu or not gpu_audio:
                 return
             cmd.extend(["--gpu", gpu, "--gpu-audio", gpu_audio])
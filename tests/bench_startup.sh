@@ -0,0 +1,114 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Startup benchmark for the Bash entrypoints.
+# Times each subcommand through the bin/ entrypoints of a baseline git ref
+# (eager library sourcing and log setup), through bin/ of this tree
+# (on-demand loading) and through the dist/ bundle built by tools/bundle.sh,
+# and prints the mean per run plus the speedup of bin/ over the baseline.
+#
+# The default baseline is the parent of the commit that added the runtime
+# loader, i.e. the last tree that sourced every library up front.
+#
+# Usage:
+#   bash tests/bench_startup.sh [RUNS] [BASELINE_REF]   (default: 20, see above)
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+RUNS="${1:-20}"
+BASELINE_REF="${2:-}"
+TMP_HOME="$(mktemp -d /tmp/janus-bench.XXXXXX)"
+BUNDLE_DIR="$ROOT_DIR/dist"
+BASE_DIR="$TMP_HOME/baseline"
+
+cleanup() {
+    rm -rf "$TMP_HOME"
+}
+trap cleanup EXIT
+
+# Answer libvirt queries instantly so status measures Janus, not libvirtd.
+mkdir -p "$TMP_HOME/fakebin"
+cat > "$TMP_HOME/fakebin/virsh" <<'EOF_VIRSH'
+#!/usr/bin/env bash
+case " $* " in
+    *" domstate "*) echo "shut off" ;;
+    *" dominfo "*) printf 'Name:           bench\nState:          shut off\n' ;;
+esac
+exit 0
+EOF_VIRSH
+chmod +x "$TMP_HOME/fakebin/virsh"
+
+export HOME="$TMP_HOME"
+export PATH="$TMP_HOME/fakebin:$PATH"
+
+# Bundles must sit one level below the Janus root to find templates.
+JANUS_BUNDLE_OUT_DIR="$BUNDLE_DIR" bash "$ROOT_DIR/tools/bundle.sh" >/dev/null
+
+# Export the baseline tree; without git history the column shows "-".
+if [ -z "$BASELINE_REF" ]; then
+    BASELINE_REF="$(git -C "$ROOT_DIR" log --diff-filter=A --format=%H -1 -- lib/core/runtime/loader.sh 2>/dev/null || true)"
+    [ -z "$BASELINE_REF" ] || BASELINE_REF="$BASELINE_REF^"
+fi
+mkdir -p "$BASE_DIR"
+if [ -z "$BASELINE_REF" ] || ! git -C "$ROOT_DIR" archive "$BASELINE_REF" 2>/dev/null | tar -x -C "$BASE_DIR" 2>/dev/null; then
+    echo "[WARN] Baseline ref unavailable (${BASELINE_REF:-none}); BASE column skipped." >&2
+    BASELINE_REF=""
+fi
+[ -z "$BASELINE_REF" ] || BASELINE_REF="$(git -C "$ROOT_DIR" rev-parse --short "$BASELINE_REF")"
+
+# Print mean wall time in milliseconds for RUNS executions of a command.
+bench_mean_ms() {
+    local start=""
+    local end=""
+    local i=0
+
+    start="${EPOCHREALTIME/./}"
+    for ((i = 0; i < RUNS; i++)); do
+        "$@" >/dev/null 2>&1 </dev/null || true
+    done
+    end="${EPOCHREALTIME/./}"
+
+    printf '%d.%d' $(((end - start) / RUNS / 1000)) $((((end - start) / RUNS / 100) % 10))
+}
+
+# Print BASE_MS / BIN_MS as a speedup factor (example: 2.4x).
+bench_speedup() {
+    local base="${1/./}"
+    local bin="${2/./}"
+
+    # Means are printed in tenths of a millisecond; force base 10 ("08").
+    [ "$base" != "-" ] && [ $((10#$bin)) -gt 0 ] || {
+        printf '%s' "-"
+        return 0
+    }
+    base=$((10#$base))
+    bin=$((10#$bin))
+    printf '%d.%dx' $((base / bin)) $(((base * 10 / bin) % 10))
+}
+
+# Run one benchmark row: LABEL NAME ARGS...
+bench_row() {
+    local label="$1"
+    local name="$2"
+    shift 2
+
+    local base="-"
+    local bin=""
+
+    [ -z "$BASELINE_REF" ] || base="$(bench_mean_ms bash "$BASE_DIR/bin/janus-$name.sh" "$@")"
+    bin="$(bench_mean_ms bash "$ROOT_DIR/bin/janus-$name.sh" "$@")"
+
+    printf '%-34s %10s %10s %10s %8s\n' "$label" "$base" "$bin" \
+        "$(bench_mean_ms bash "$BUNDLE_DIR/janus-$name" "$@")" \
+        "$(bench_speedup "$base" "$bin")"
+}
+
+echo "[INFO] Janus startup benchmark ($RUNS runs each, mean ms; BASE = ${BASELINE_REF:-none})"
+printf '%-34s %10s %10s %10s %8s\n' "COMMAND" "BASE" "BIN" "BUNDLE" "SPEEDUP"
+bench_row "janus-vm --help" vm --help
+bench_row "janus-vm status" vm status --name bench
+bench_row "janus-vm capacity" vm capacity
+bench_row "janus-vm create (dry-run)" vm create --name bench --mode base --yes --no-guided
+bench_row "janus-bind --help" bind --help
+bench_row "janus-bind --rollback (no state)" bind --rollback --yes
+bench_row "janus-check --version" check --version
+bench_row "janus-init --help" init --help
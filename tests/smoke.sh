@@ -84,6 +84,10 @@ assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" invalid-action
 assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --device 0000:ff:ff.f --dry-run --yes
 assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --rollback --apply
 assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --rollback --device 0000:03:00.0
+assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --persist --yes
+assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --persist --rollback --yes
+assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --unpersist --device 0000:03:00.0
+assert_nonzero bash "$ROOT_DIR/bin/janus-bind.sh" --device 0000:03:00.0 --persist --initramfs grub --yes
 
 echo "[INFO] VM XML defaults (stealth + passthrough) checks"
 assert_zero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-win11 --mode passthrough --gpu 0000:03:00.0 --gpu-audio 0000:03:00.1 --yes
@@ -107,6 +111,54 @@ VM_XML_SHARED="$TMP_HOME/.config/janus/vm/definitions/smoke-shared.xml"
 [ -f "$VM_XML_SHARED" ] || fail "Expected VM XML definition not found: $VM_XML_SHARED"
 grep -q "<acceleration accel3d='yes'/>" "$VM_XML_SHARED" || fail "Expected shared-vram 3D acceleration in VM XML."
 
+echo "[INFO] Looking Glass IVSHMEM checks"
+assert_zero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-lg-shm --mode passthrough --gpu 0000:03:00.0 --gpu-audio 0000:03:00.1 --looking-glass shm --lg-resolution 2560x1440 --yes --no-guided
+VM_XML_LG_SHM="$TMP_HOME/.config/janus/vm/definitions/smoke-lg-shm.xml"
+grep -q "<shmem name='looking-glass'>" "$VM_XML_LG_SHM" || fail "Expected Looking Glass shmem device in VM XML."
+grep -q "<size unit='M'>64</size>" "$VM_XML_LG_SHM" || fail "Expected 64 MiB Looking Glass region for 2560x1440."
+
+assert_zero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-lg-kvmfr --mode passthrough --gpu 0000:03:00.0 --gpu-audio 0000:03:00.1 --looking-glass kvmfr --yes --no-guided
+VM_XML_LG_KVMFR="$TMP_HOME/.config/janus/vm/definitions/smoke-lg-kvmfr.xml"
+grep -q '"mem-path":"/dev/kvmfr0","size":33554432' "$VM_XML_LG_KVMFR" || fail "Expected kvmfr memory backend in qemu:commandline."
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-lg-base --mode base --looking-glass shm --yes --no-guided
+
+echo "[INFO] Host capacity checks"
+assert_zero bash "$ROOT_DIR/bin/janus-vm.sh" capacity
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" capacity --force
+[ -s "$TMP_HOME/.cache/janus/vm/capacity-v2.cache" ] || fail "Expected capacity cache after janus-vm capacity."
+touch "$TMP_HOME/smoke-code.fd" "$TMP_HOME/smoke-vars.fd"
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-too-big --mode base --single-gpu-mode cpu-only --memory-mib 99999999 --ovmf-code "$TMP_HOME/smoke-code.fd" --ovmf-vars "$TMP_HOME/smoke-vars.fd" --apply --yes --no-guided
+[ ! -e "$TMP_HOME/.config/janus/vm/definitions/smoke-too-big.xml" ] || fail "Refused create must not leave a VM definition behind."
+[ ! -e "$TMP_HOME/.config/janus/vm/definitions/smoke-too-big.xml.tmp" ] || fail "Refused create must not leave a rendered temp file behind."
+
+echo "[INFO] IRQ pinning option checks"
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" irq-pin --name smoke-win11
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" status --name smoke-win11 --watch
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" start --name smoke-win11 --irq-wait 5
+
+echo "[INFO] Memory reclaim checks"
+assert_zero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-reclaim --mode base --single-gpu-mode cpu-only --memory-profile reclaim --yes --no-guided
+VM_XML_RECLAIM="$TMP_HOME/.config/janus/vm/definitions/smoke-reclaim.xml"
+grep -q "<memballoon model='virtio' freePageReporting='on'>" "$VM_XML_RECLAIM" || fail "Expected free page reporting on memballoon."
+grep -q "<stats period='10'/>" "$VM_XML_RECLAIM" || fail "Expected balloon stats period in VM XML."
+grep -q "<memballoon model='virtio'/>" "$VM_XML_SHARED" || fail "Expected plain memballoon for the static profile."
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" create --name smoke-bad-profile --memory-profile lazy --yes --no-guided
+mkdir -p "$TMP_HOME/balloon-stub"
+printf 'actual 4194304\nusable 3145728\n' > "$TMP_HOME/balloon-stub/smoke-reclaim.stats"
+assert_zero env JANUS_VM_BALLOON_STUB_DIR="$TMP_HOME/balloon-stub" bash "$ROOT_DIR/bin/janus-vm.sh" balloon-daemon --name smoke-reclaim --iterations 2 --interval 1
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" balloon-daemon --free-band 30:10 --iterations 1
+assert_nonzero bash "$ROOT_DIR/bin/janus-vm.sh" status --interval 5
+
+echo "[INFO] Startup loading checks"
+mkdir -p "$TMP_HOME/lazy-home"
+assert_zero env HOME="$TMP_HOME/lazy-home" bash "$ROOT_DIR/bin/janus-vm.sh" --help
+assert_zero env HOME="$TMP_HOME/lazy-home" bash "$ROOT_DIR/bin/janus-bind.sh" --help
+[ ! -e "$TMP_HOME/lazy-home/.cache/janus/logs" ] || fail "Read-only commands should not create log files before logging."
+assert_zero env JANUS_BUNDLE_OUT_DIR="$TMP_HOME/dist" bash "$ROOT_DIR/tools/bundle.sh"
+assert_zero bash "$TMP_HOME/dist/janus-vm" --help
+assert_zero bash "$TMP_HOME/dist/janus-bind" --help
+grep -q '^janus_vm_create()' "$TMP_HOME/dist/janus-vm" || fail "Expected lazily loaded create action inlined in the janus-vm bundle."
+
 echo "[INFO] No-TTY regression checks"
 bash "$ROOT_DIR/bin/janus-check.sh" </dev/null >"$TMP_HOME/janus-check-notty.log" 2>&1 || true
 if grep -q "Launching janus-init" "$TMP_HOME/janus-check-notty.log"; then
@@ -333,6 +333,25 @@ echo "=== lib/core/runtime/logging.sh (start_logging pre-flight) ==="
 # pipes. We only test pre-flight validation here; the positive path is covered
 # by smoke.sh end-to-end.
 
+(
+    source "$ROOT_DIR/lib/core/runtime/logging.sh"
+    janus_runtime_resolve_log_dir() { mkdir -p "$TMP_HOME/deferred-logs" && printf '%s' "$TMP_HOME/deferred-logs"; }
+
+    # -- defer_logging: no files until the first message, then log lines only --
+    janus_runtime_defer_logging "deferred"
+    before="$(ls "$TMP_HOME/deferred-logs" 2>/dev/null | wc -l)"
+    JANUS_LOG_ENABLE_COLOR=0 janus_log_warn "first line" >/dev/null
+
+    if [ "$before" = "0" ] && [ "$(cat "$JANUS_LOG_FILE")" = "[WARN] first line" ] \
+        && [ "$JANUS_LOG_FILE" = "$TMP_HOME/deferred-logs/deferred_${JANUS_LOG_STAMP}.log" ] \
+        && grep -qx "\[WARN\] first line" "$JANUS_MAIN_LOG_FILE"; then
+        echo "[PASS] defer_logging: creates log files on first message"
+    else
+        echo "[FAIL] defer_logging: before=$before file='$JANUS_LOG_FILE'" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
 assert_nonzero \
     "start_logging: fails when resolve_log_dir fails" \
     bash -c "
@@ -341,6 +360,750 @@ assert_nonzero \
         janus_runtime_start_logging 'test'
     "
 
+# ============================================================================
+echo ""
+echo "=== lib/core/runtime/irq.sh ==="
+# ============================================================================
+
+# Build a fake /proc + /sys tree with one passthrough GPU owning two vfio IRQs.
+IRQ_FIXTURE="$TMP_HOME/irq-fixture"
+mkdir -p "$IRQ_FIXTURE/proc/irq/150" "$IRQ_FIXTURE/proc/irq/151" "$IRQ_FIXTURE/proc/irq/20" \
+    "$IRQ_FIXTURE/sys/bus/pci/devices/0000:03:00.0/msi_irqs"
+cat > "$IRQ_FIXTURE/proc/interrupts" <<'EOF_INTERRUPTS'
+            CPU0       CPU1       CPU2       CPU3
+  20:          0          0          0          0  IR-IO-APIC   20-fasteoi   ehci_hcd:usb1
+ 150:        120          0          0          0  IR-PCI-MSI 1572864-edge      vfio-msi[0](0000:03:00.0)
+ 151:         33          0          0          0  IR-PCI-MSI 1572865-edge      vfio-msix[1](0000:03:00.1)
+EOF_INTERRUPTS
+touch "$IRQ_FIXTURE/sys/bus/pci/devices/0000:03:00.0/msi_irqs/150"
+printf '0-3\n' > "$IRQ_FIXTURE/proc/irq/150/smp_affinity_list"
+printf '0-3\n' > "$IRQ_FIXTURE/proc/irq/151/smp_affinity_list"
+printf '0-3\n' > "$IRQ_FIXTURE/proc/irq/20/smp_affinity_list"
+mkdir -p "$IRQ_FIXTURE/proc/sys/kernel/random"
+printf 'aaaa-this-boot\n' > "$IRQ_FIXTURE/proc/sys/kernel/random/boot_id"
+
+assert_zero \
+    "janus_irq_is_cpulist: accepts ranges and lists" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/irq.sh'; janus_irq_is_cpulist '2-5,8,10-11'"
+
+assert_nonzero \
+    "janus_irq_is_cpulist: rejects malformed list" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/irq.sh'; janus_irq_is_cpulist '2-,x'"
+
+assert_output_equals \
+    "janus_irq_device_irqs: finds vfio IRQs for device only" \
+    "150" \
+    bash -c "
+        JANUS_IRQ_PROC_ROOT='$IRQ_FIXTURE/proc' JANUS_IRQ_SYS_ROOT='$IRQ_FIXTURE/sys'
+        source '$ROOT_DIR/lib/core/runtime/irq.sh'
+        janus_irq_device_irqs 0000:03:00.0
+    "
+
+(
+    JANUS_IRQ_PROC_ROOT="$IRQ_FIXTURE/proc"
+    JANUS_IRQ_SYS_ROOT="$IRQ_FIXTURE/sys"
+    JANUS_IRQ_IRQBALANCE_MODE="ignore"
+    JANUS_LOG_ENABLE_COLOR=0
+    source "$ROOT_DIR/lib/core/runtime/irq.sh"
+
+    # -- janus_irq_pin_devices + janus_irq_restore: round-trip on fixtures --
+    state_file="$TMP_HOME/irq.state"
+    janus_irq_pin_devices "$state_file" "6-7" 0000:03:00.0 0000:03:00.1 >/dev/null
+    pinned="$(cat "$IRQ_FIXTURE/proc/irq/150/smp_affinity_list") $(cat "$IRQ_FIXTURE/proc/irq/151/smp_affinity_list")"
+    untouched="$(cat "$IRQ_FIXTURE/proc/irq/20/smp_affinity_list")"
+    janus_irq_restore "$state_file" >/dev/null
+    restored="$(cat "$IRQ_FIXTURE/proc/irq/150/smp_affinity_list") $(cat "$IRQ_FIXTURE/proc/irq/151/smp_affinity_list")"
+
+    if [ "$pinned" = "6-7 6-7" ] && [ "$untouched" = "0-3" ] && [ "$restored" = "0-3 0-3" ] && [ ! -e "$state_file" ]; then
+        echo "[PASS] irq_pin_devices/irq_restore: pins vfio IRQs and restores original affinity"
+    else
+        echo "[FAIL] irq round-trip: pinned='$pinned' untouched='$untouched' restored='$restored'" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_IRQ_PROC_ROOT="$IRQ_FIXTURE/proc"
+    JANUS_IRQ_SYS_ROOT="$IRQ_FIXTURE/sys"
+    JANUS_IRQ_IRQBALANCE_MODE="stop"
+    JANUS_LOG_ENABLE_COLOR=0
+    source "$ROOT_DIR/lib/core/runtime/irq.sh"
+    janus_irq_irqbalance_active() { return 0; }
+    systemctl() { printf '%s\n' "$*" >> "$TMP_HOME/irq-systemctl.calls"; }
+
+    # -- pin_devices: nothing to pin leaves irqbalance running --
+    state_file="$TMP_HOME/irq-none.state"
+    janus_irq_pin_devices "$state_file" "6-7" 0000:09:00.0 >/dev/null
+    if [ "$JANUS_IRQ_PINNED" != "0" ] || [ -e "$TMP_HOME/irq-systemctl.calls" ]; then
+        echo "[FAIL] irq_pin_devices: touched irqbalance with no IRQs pinned" >&2
+        exit 1
+    fi
+
+    # -- pin_devices: repeat calls re-pin IRQs vfio reset, without duplicates --
+    state_file="$TMP_HOME/irq-repin.state"
+    janus_irq_pin_devices "$state_file" "6,7" 0000:03:00.0 >/dev/null
+    first="$JANUS_IRQ_PINNED"
+    janus_irq_pin_devices "$state_file" "6,7" 0000:03:00.0 >/dev/null
+    steady="$JANUS_IRQ_PINNED"
+    printf '0-3\n' > "$IRQ_FIXTURE/proc/irq/150/smp_affinity_list"
+    janus_irq_pin_devices "$state_file" "6,7" 0000:03:00.0 >/dev/null
+    repinned="$JANUS_IRQ_PINNED"
+    affinity="$(cat "$IRQ_FIXTURE/proc/irq/150/smp_affinity_list")"
+    janus_irq_restore "$state_file" >/dev/null
+
+    if [ "$first" = "1" ] && [ "$steady" = "0" ] && [ "$repinned" = "1" ] && [ "$affinity" = "6,7" ] \
+        && [ "$(grep -c '^stop irqbalance$' "$TMP_HOME/irq-systemctl.calls")" = "1" ]; then
+        echo "[PASS] irq_pin_devices: re-pins reset IRQs and pauses irqbalance only once"
+    else
+        echo "[FAIL] irq re-pin: first=$first steady=$steady repinned=$repinned affinity=$affinity" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_IRQ_PROC_ROOT="$IRQ_FIXTURE/proc"
+    JANUS_IRQ_SYS_ROOT="$IRQ_FIXTURE/sys"
+    JANUS_IRQ_IRQBALANCE_MODE="stop"
+    JANUS_LOG_ENABLE_COLOR=0
+    source "$ROOT_DIR/lib/core/runtime/irq.sh"
+    janus_irq_irqbalance_active() { return 0; }
+    calls="$TMP_HOME/irq-refcount.calls"
+    systemctl() { printf '%s\n' "$*" >> "$calls"; }
+
+    # -- irqbalance is shared: only the last pinned VM restarts it --
+    mkdir -p "$TMP_HOME/irq-refcount"
+    janus_irq_pin_devices "$TMP_HOME/irq-refcount/irq_a.state" "6" 0000:03:00.0 >/dev/null
+    janus_irq_pin_devices "$TMP_HOME/irq-refcount/irq_b.state" "7" 0000:03:00.1 >/dev/null
+    janus_irq_restore "$TMP_HOME/irq-refcount/irq_a.state" >/dev/null
+    after_first="$(grep -c '^start irqbalance$' "$calls" || true)"
+    janus_irq_restore "$TMP_HOME/irq-refcount/irq_b.state" >/dev/null
+
+    if [ "$(grep -c '^stop irqbalance$' "$calls")" = "1" ] && [ "$after_first" = "0" ] \
+        && [ "$(grep -c '^start irqbalance$' "$calls")" = "1" ]; then
+        echo "[PASS] irq_restore: irqbalance restarts only after the last pinned VM"
+    else
+        echo "[FAIL] irq_restore: irqbalance refcount calls: $(tr '\n' ';' < "$calls")" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_IRQ_PROC_ROOT="$IRQ_FIXTURE/proc"
+    JANUS_IRQ_SYS_ROOT="$IRQ_FIXTURE/sys"
+    JANUS_IRQ_IRQBALANCE_MODE="stop"
+    JANUS_LOG_ENABLE_COLOR=0
+    source "$ROOT_DIR/lib/core/runtime/irq.sh"
+    janus_irq_irqbalance_active() { return 0; }
+    calls="$TMP_HOME/irq-stale.calls"
+    systemctl() { printf '%s\n' "$*" >> "$calls"; }
+    # Owner of irq_gone.state stopped outside Janus; irq_live.state is running.
+    JANUS_IRQ_OWNER_CHECK="irq_owner_running"
+    irq_owner_running() { [ "${1##*/}" != "irq_gone.state" ]; }
+
+    # -- stale holders (earlier boot, stopped owner) never keep irqbalance paused --
+    mkdir -p "$TMP_HOME/irq-stale"
+    printf 'BOOT_ID=bbbb-old-boot\n---\nIRQ=150\nDEVICE=0000:03:00.0\nOLD_AFFINITY=2\n---\nIRQBALANCE_STOPPED=1\n---\n' \
+        > "$TMP_HOME/irq-stale/irq_reboot.state"
+    printf 'BOOT_ID=aaaa-this-boot\n---\nIRQBALANCE_STOPPED=1\n---\n' > "$TMP_HOME/irq-stale/irq_gone.state"
+    janus_irq_pin_devices "$TMP_HOME/irq-stale/irq_new.state" "6" 0000:03:00.0 >/dev/null
+    stop_calls="$(grep -c '^stop irqbalance$' "$calls" || true)"
+    left="$(ls "$TMP_HOME/irq-stale")"
+
+    # -- a previous-boot state is discarded without writing saved affinities --
+    printf 'BOOT_ID=bbbb-old-boot\n---\nIRQ=20\nDEVICE=0000:09:00.0\nOLD_AFFINITY=1\n---\n' \
+        > "$TMP_HOME/irq-stale/irq_old.state"
+    janus_irq_restore "$TMP_HOME/irq-stale/irq_old.state" >/dev/null
+    affinity="$(cat "$IRQ_FIXTURE/proc/irq/20/smp_affinity_list")"
+    janus_irq_restore "$TMP_HOME/irq-stale/irq_new.state" >/dev/null
+
+    if [ "$stop_calls" = "1" ] && [ "$left" = "irq_new.state" ] && [ "$affinity" = "0-3" ] \
+        && [ "$(grep -c '^start irqbalance$' "$calls")" = "1" ]; then
+        echo "[PASS] irq_pin_devices/irq_restore: stale state never holds irqbalance or restores affinity"
+    else
+        echo "[FAIL] irq stale state: stop=$stop_calls left='$left' affinity=$affinity calls=$(tr '\n' ';' < "$calls")" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+assert_zero \
+    "janus_irq_wait_device_irqs: returns once IRQs exist" \
+    bash -c "
+        JANUS_IRQ_PROC_ROOT='$IRQ_FIXTURE/proc'
+        JANUS_IRQ_SYS_ROOT='$IRQ_FIXTURE/sys'
+        source '$ROOT_DIR/lib/core/runtime/irq.sh'
+        janus_irq_wait_device_irqs 0 0000:09:00.0 0000:03:00.0
+    "
+
+assert_nonzero \
+    "janus_irq_wait_device_irqs: times out without vfio IRQs" \
+    bash -c "
+        JANUS_IRQ_PROC_ROOT='$IRQ_FIXTURE/proc'
+        JANUS_IRQ_SYS_ROOT='$IRQ_FIXTURE/sys'
+        source '$ROOT_DIR/lib/core/runtime/irq.sh'
+        janus_irq_wait_device_irqs 0 0000:09:00.0
+    "
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    source "$ROOT_DIR/lib/vm/main.sh"
+
+    # -- janus_vm_definition_hostdev_pcis / pinned_cpus: parse definition XML --
+    def_file="$TMP_HOME/irq-vm.xml"
+    cat > "$def_file" <<'EOF_DEF'
+<domain type='kvm'>
+  <cputune>
+    <vcpupin vcpu='0' cpuset='4'/>
+    <vcpupin vcpu='1' cpuset='5-6'/>
+  </cputune>
+  <devices>
+    <hostdev mode='subsystem' type='pci' managed='yes'>
+      <source>
+        <address domain='0x0000' bus='0x03' slot='0x00' function='0x1'/>
+      </source>
+      <address type='pci' domain='0x0000' bus='0x06' slot='0x00' function='0x0'/>
+    </hostdev>
+  </devices>
+</domain>
+EOF_DEF
+    pcis="$(janus_vm_definition_hostdev_pcis "$def_file")"
+    cpus="$(janus_vm_definition_pinned_cpus "$def_file")"
+
+    if [ "$pcis" = "0000:03:00.1" ] && [ "$cpus" = "4,5-6" ]; then
+        echo "[PASS] vm definition parsing: hostdev PCI + vcpupin cpuset"
+    else
+        echo "[FAIL] vm definition parsing: pcis='$pcis' cpus='$cpus'" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+# ============================================================================
+echo ""
+echo "=== lib/vm/core/capacity.sh ==="
+# ============================================================================
+
+# Fake host: 16 GiB RAM, 4 CPUs, 4096 x 2 MiB hugepages on node 0.
+CAP_FIXTURE="$TMP_HOME/capacity-fixture"
+mkdir -p "$CAP_FIXTURE/proc" "$CAP_FIXTURE/sys/devices/system/cpu" "$CAP_FIXTURE/defs" \
+    "$CAP_FIXTURE/sys/kernel/mm/hugepages/hugepages-2048kB" \
+    "$CAP_FIXTURE/sys/devices/system/node/node0/hugepages/hugepages-2048kB"
+printf 'MemTotal:       16777216 kB\nHugepagesize:       2048 kB\n' > "$CAP_FIXTURE/proc/meminfo"
+printf '0-3\n' > "$CAP_FIXTURE/sys/devices/system/cpu/online"
+printf '4096\n' > "$CAP_FIXTURE/sys/kernel/mm/hugepages/hugepages-2048kB/nr_hugepages"
+printf '4096\n' > "$CAP_FIXTURE/sys/devices/system/node/node0/hugepages/hugepages-2048kB/nr_hugepages"
+
+# Write a minimal definition: NAME MEMORY_MIB HUGEPAGES(yes|no) CPUSET PCI_BUS [HOST_NODE]
+# The page nodeset is the guest cell; the host node comes from numatune.
+cap_write_def() {
+    local hugepages_block=""
+    local numatune_block=""
+    [ "$3" = "yes" ] && hugepages_block="<memoryBacking><hugepages><page size='2048' unit='KiB' nodeset='0'/></hugepages></memoryBacking>"
+    [ -n "${6:-}" ] && numatune_block="<numatune><memory mode='strict' nodeset='$6'/></numatune>"
+    cat > "${CAP_DEF_DIR:-$CAP_FIXTURE/defs}/$1.xml" <<EOF_DEF
+<domain type='kvm'>
+  <name>$1</name>
+  <memory unit='MiB'>$2</memory>
+  $hugepages_block
+  $numatune_block
+  <vcpu placement='static'>2</vcpu>
+  <cputune>
+    <vcpupin vcpu='0' cpuset='$4'/>
+  </cputune>
+  <devices>
+    <hostdev mode='subsystem' type='pci' managed='yes'>
+      <source>
+        <address domain='0x0000' bus='0x$5' slot='0x00' function='0x0'/>
+      </source>
+    </hostdev>
+  </devices>
+</domain>
+EOF_DEF
+}
+
+cap_write_def hp-guest 6144 yes 2 03 0
+cap_write_def plain-guest 4096 no 3 04
+cap_write_def gpu-thief 2048 no 1 03
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    JANUS_VM_HOST_PROC_ROOT="$CAP_FIXTURE/proc"
+    JANUS_VM_HOST_SYS_ROOT="$CAP_FIXTURE/sys"
+    JANUS_VM_CAPACITY_CACHE="$CAP_FIXTURE/capacity.cache"
+    source "$ROOT_DIR/lib/vm/main.sh"
+    janus_vm_load_action_libs capacity
+    JANUS_VM_DEF_DIR="$CAP_FIXTURE/defs"
+    janus_vm_capacity_running_names() { printf 'hp-guest\n'; }
+
+    # -- capacity_load: parses once, then serves unchanged files from cache --
+    janus_vm_capacity_load
+    first_parsed="$JANUS_VM_CAP_PARSED"
+    record="${JANUS_VM_CAP_RECORDS[hp-guest]}"
+    janus_vm_capacity_load
+    second_parsed="$JANUS_VM_CAP_PARSED"
+
+    if [ "$first_parsed" = "3" ] && [ "$second_parsed" = "0" ] && [ "$record" = "hp-guest|6144|2|2048|0|2|0000:03:00.0" ]; then
+        echo "[PASS] capacity_load: parses definitions and reuses mtime cache"
+    else
+        echo "[FAIL] capacity_load: first=$first_parsed second=$second_parsed record='$record'" >&2
+        exit 1
+    fi
+
+    # -- parse_definition: guest page nodeset alone does not pin a host node --
+    mkdir -p "$CAP_FIXTURE/extra"
+    CAP_DEF_DIR="$CAP_FIXTURE/extra" cap_write_def guest-cells 2048 yes 1 05
+    CAP_DEF_DIR="$CAP_FIXTURE/extra" cap_write_def host-node1 2048 yes 1 05 1
+    if [ "$(janus_vm_capacity_parse_definition "$CAP_FIXTURE/extra/guest-cells.xml")" != "guest-cells|2048|2|2048|any|1|0000:05:00.0" ] \
+        || [ "$(janus_vm_capacity_parse_definition "$CAP_FIXTURE/extra/host-node1.xml")" != "host-node1|2048|2|2048|1|1|0000:05:00.0" ]; then
+        echo "[FAIL] capacity_parse_definition: hugepage host node not taken from numatune" >&2
+        exit 1
+    fi
+
+    # -- capacity_check: plain guest fits next to running hugepage guest --
+    if ! janus_vm_capacity_check plain-guest >/dev/null; then
+        echo "[FAIL] capacity_check: plain-guest should fit" >&2
+        exit 1
+    fi
+
+    # -- capacity_check: device already held by a running VM is blocking --
+    if janus_vm_capacity_check gpu-thief >/dev/null; then
+        echo "[FAIL] capacity_check: gpu-thief should conflict on 0000:03:00.0" >&2
+        exit 1
+    fi
+
+    # -- capacity_admit: a shared GPU only blocks start, not create --
+    JANUS_VM_NAME="gpu-thief"
+    JANUS_VM_ALLOW_OVERCOMMIT=0
+    if ! janus_vm_capacity_admit create 1 >/dev/null 2>&1 || janus_vm_capacity_admit start 1 >/dev/null 2>&1; then
+        echo "[FAIL] capacity_admit: device conflict should warn at create and block at start" >&2
+        exit 1
+    fi
+
+    # -- capacity_admit: a rendered but uninstalled definition is checked --
+    JANUS_VM_NAME="too-big"
+    CAP_DEF_DIR="$CAP_FIXTURE/extra" cap_write_def too-big 99999 no 3 06
+    if janus_vm_capacity_admit create 1 "$CAP_FIXTURE/extra/too-big.xml" >/dev/null 2>&1; then
+        echo "[FAIL] capacity_admit: should refuse an oversized rendered definition" >&2
+        exit 1
+    fi
+    echo "[PASS] capacity_check/admit: admits fitting VM, PCI conflicts block only at start"
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    JANUS_VM_HOST_PROC_ROOT="$CAP_FIXTURE/proc"
+    JANUS_VM_HOST_SYS_ROOT="$CAP_FIXTURE/sys"
+    JANUS_VM_CAPACITY_CACHE="$CAP_FIXTURE/capacity.cache"
+    source "$ROOT_DIR/lib/vm/main.sh"
+    janus_vm_load_action_libs capacity
+    JANUS_VM_DEF_DIR="$CAP_FIXTURE/defs"
+    janus_vm_capacity_running_names() { printf 'hp-guest\n'; }
+
+    # -- capacity_check: hugepage pool shortfall and memory overcommit block --
+    cap_write_def hp-guest 10240 yes 2 03 0
+    cap_write_def plain-guest 12288 no 3 04
+    janus_vm_capacity_load
+    output="$(janus_vm_capacity_check plain-guest 2>&1)" && rc=0 || rc=$?
+
+    if [ "$rc" -ne 0 ] && [ "$JANUS_VM_CAP_PARSED" = "2" ] \
+        && printf '%s' "$output" | grep -q "hugepages of 2048 KiB needed on node 0" \
+        && printf '%s' "$output" | grep -q "exceeds 8192 MiB available outside hugepage pools"; then
+        echo "[PASS] capacity_check: reports hugepage shortfall and memory overcommit"
+    else
+        echo "[FAIL] capacity_check overcommit: rc=$rc parsed=$JANUS_VM_CAP_PARSED output='$output'" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+# ============================================================================
+echo ""
+echo "=== lib/vm/core/balloon.sh ==="
+# ============================================================================
+
+BALLOON_LIB="$ROOT_DIR/lib/vm/core/balloon.sh"
+
+assert_nonzero "janus_vm_balloon_plan: holds inside the free band" \
+    bash -c "source '$BALLOON_LIB'; janus_vm_balloon_plan 8388608 1677721 2097152 8388608 10 30"
+
+assert_output_equals \
+    "janus_vm_balloon_plan: shrinks an idle guest toward mid-band" \
+    "2621440" \
+    bash -c "source '$BALLOON_LIB'; janus_vm_balloon_plan 8388608 6291456 2097152 8388608 10 30"
+
+assert_output_equals \
+    "janus_vm_balloon_plan: grows a starved guest up to max" \
+    "8388608" \
+    bash -c "source '$BALLOON_LIB'; janus_vm_balloon_plan 7340032 102400 2097152 8388608 10 30"
+
+assert_output_equals \
+    "janus_vm_balloon_plan: never shrinks below min" \
+    "4194304" \
+    bash -c "source '$BALLOON_LIB'; janus_vm_balloon_plan 8388608 8000000 4194304 8388608 10 30"
+
+assert_nonzero "janus_vm_balloon_plan: ignores moves below the minimum step" \
+    bash -c "source '$BALLOON_LIB'; janus_vm_balloon_plan 2097152 1258291 2048000 8388608 10 30"
+
+BALLOON_STUB="$TMP_HOME/balloon-stub"
+mkdir -p "$BALLOON_STUB"
+printf 'actual 8388608\nunused 6000000\nusable 6291456\nrss 2200000\n' > "$BALLOON_STUB/idle-guest.stats"
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    JANUS_VM_BALLOON_STUB_DIR="$BALLOON_STUB"
+    JANUS_VM_CAPACITY_CACHE="$TMP_HOME/balloon-capacity.cache"
+    source "$ROOT_DIR/lib/vm/main.sh"
+    janus_vm_load_action_libs balloon-daemon
+    JANUS_VM_DEF_DIR="$CAP_FIXTURE/defs"
+    JANUS_VM_NAME="idle-guest"
+    JANUS_VM_BALLOON_MAX_MIB=8192
+    JANUS_VM_BALLOON_ITERATIONS=2
+    JANUS_VM_BALLOON_INTERVAL=1
+    janus_vm_validate_balloon_daemon
+
+    # -- daemon: reclaims once, then the band keeps the balloon still --
+    output="$(janus_vm_balloon_daemon 2>&1)"
+    actual="$(awk '$1 == "actual" { print $2 }' "$BALLOON_STUB/idle-guest.stats")"
+
+    if [ "$actual" = "2621440" ] \
+        && [ "$(printf '%s\n' "$output" | grep -c "idle-guest: reclaimed")" = "1" ] \
+        && printf '%s' "$output" | grep -q "5632 MiB net reclaimed"; then
+        echo "[PASS] balloon daemon: reclaims idle memory once and holds inside the band"
+    else
+        echo "[FAIL] balloon daemon: actual=$actual output='$output'" >&2
+        exit 1
+    fi
+
+    # -- tick: a guest without free-memory stats is reported once, not per poll --
+    printf 'actual 4194304\nrss 2200000\n' > "$BALLOON_STUB/static-guest.stats"
+    output="$(for _ in 1 2 3; do janus_vm_balloon_tick static-guest 1048576 4194304 10 30; done 2>&1)"
+    if [ "$(printf '%s\n' "$output" | grep -c "static-guest: guest reports no free memory stats")" != "1" ]; then
+        echo "[FAIL] balloon tick: missing-stats warning repeated: $output" >&2
+        exit 1
+    fi
+
+    # -- daemon: TERM during the poll interval stops it promptly with a summary --
+    printf 'actual 8388608\nunused 6000000\nusable 6291456\nrss 2200000\n' > "$BALLOON_STUB/idle-guest.stats"
+    JANUS_VM_BALLOON_ITERATIONS=0
+    JANUS_VM_BALLOON_INTERVAL=60
+    janus_vm_balloon_daemon > "$TMP_HOME/balloon-daemon.out" 2>&1 &
+    daemon_pid=$!
+    sleep 1
+    kill -TERM "$daemon_pid"
+    for _ in 1 2 3 4 5 6 7 8 9 10; do
+        kill -0 "$daemon_pid" 2>/dev/null || break
+        sleep 0.2
+    done
+
+    if kill -0 "$daemon_pid" 2>/dev/null; then
+        kill -KILL "$daemon_pid"
+        echo "[FAIL] balloon daemon: still sleeping 2s after SIGTERM" >&2
+        exit 1
+    fi
+    if ! grep -q "5632 MiB net reclaimed" "$TMP_HOME/balloon-daemon.out"; then
+        echo "[FAIL] balloon daemon: no summary after SIGTERM: $(cat "$TMP_HOME/balloon-daemon.out")" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    JANUS_VM_CAPACITY_CACHE="$TMP_HOME/balloon-capacity.cache"
+    source "$ROOT_DIR/lib/vm/main.sh"
+    janus_vm_load_action_libs balloon-daemon
+    JANUS_VM_DEF_DIR="$CAP_FIXTURE/defs"
+    JANUS_VM_BALLOON_ALL=1
+    janus_vm_capacity_running_names() { printf 'plain-guest\n'; }
+
+    # -- targets: passthrough guests are skipped because VFIO pins memory --
+    janus_vm_capacity_load
+    output="$(janus_vm_balloon_targets 2>&1; printf 'targets=%s' "${#JANUS_VM_BALLOON_TARGETS[@]}")"
+
+    if printf '%s' "$output" | grep -q "Skipping plain-guest: it has PCI passthrough devices" \
+        && printf '%s' "$output" | grep -q "targets=0"; then
+        echo "[PASS] balloon targets: skips VFIO guests"
+    else
+        echo "[FAIL] balloon targets: output='$output'" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+# ============================================================================
+echo ""
+echo "=== lib/core/runtime/lookingglass.sh ==="
+# ============================================================================
+
+assert_output_equals \
+    "janus_lg_size_mib: 1080p SDR rounds up to 32 MiB" \
+    "32" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'; janus_lg_size_mib 1920x1080 8"
+
+assert_output_equals \
+    "janus_lg_size_mib: 4K SDR rounds up to 128 MiB" \
+    "128" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'; janus_lg_size_mib 3840x2160 10"
+
+assert_output_equals \
+    "janus_lg_size_mib: 4K 16-bit HDR doubles to 256 MiB" \
+    "256" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'; janus_lg_size_mib 3840x2160 16"
+
+assert_nonzero \
+    "janus_lg_size_mib: rejects malformed resolution" \
+    bash -c "source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'; janus_lg_size_mib 1920 8"
+
+assert_output_equals \
+    "janus_lg_conf_value: reads quoted janus.conf value" \
+    "kvmfr" \
+    bash -c "
+        printf 'LOOKING_GLASS=\"kvmfr\"\\n' > '$TMP_HOME/lg.conf'
+        source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'
+        janus_lg_conf_value '$TMP_HOME/lg.conf' LOOKING_GLASS
+    "
+
+KVMFR_FIXTURE="$TMP_HOME/kvmfr-sys"
+mkdir -p "$KVMFR_FIXTURE/module/kvmfr/parameters"
+printf '32\n' > "$KVMFR_FIXTURE/module/kvmfr/parameters/static_size_mb"
+
+for kvmfr_apply in 0 1; do
+    kvmfr_check="
+        JANUS_ROOT_DIR='$ROOT_DIR'
+        JANUS_LG_SYS_ROOT='$KVMFR_FIXTURE'
+        source '$ROOT_DIR/lib/vm/main.sh'
+        janus_vm_load_action_libs create
+        JANUS_VM_LOOKING_GLASS=kvmfr
+        JANUS_VM_LG_RESOLUTION=3840x2160
+        JANUS_VM_LG_BIT_DEPTH=10
+        JANUS_VM_LG_SIZE_MIB=128
+        JANUS_VM_APPLY=$kvmfr_apply
+        janus_vm_check_kvmfr_size
+    "
+    if [ "$kvmfr_apply" -eq 0 ]; then
+        assert_zero "janus_vm_check_kvmfr_size: dry-run only warns about a small kvmfr region" bash -c "$kvmfr_check"
+    else
+        assert_nonzero "janus_vm_check_kvmfr_size: --apply refuses a small kvmfr region" bash -c "$kvmfr_check"
+    fi
+done
+
+# ============================================================================
+echo ""
+echo "=== lib/init/core/context.sh ==="
+# ============================================================================
+
+INIT_CONTEXT="$ROOT_DIR/lib/init/core/context.sh"
+
+assert_output_equals \
+    "init context: sudo run uses the invoking user's home" \
+    "/home/alice/.config/janus alice" \
+    bash -c "
+        id() { case \"\$1\" in -u) echo 0 ;; *) echo root ;; esac; }
+        getent() { echo 'alice:x:1000:1000::/home/alice:/bin/bash'; }
+        HOME=/root SUDO_USER=alice
+        source '$ROOT_DIR/lib/core/runtime/paths.sh'
+        source '$INIT_CONTEXT'
+        printf '%s %s' \"\$JANUS_INIT_CONFIG_DIR\" \"\$JANUS_INIT_USER\"
+    "
+
+assert_output_equals \
+    "vm context: sudo run reads the invoking user's janus.conf" \
+    "/home/alice/.config/janus/janus.conf" \
+    bash -c "
+        id() { case \"\$1\" in -u) echo 0 ;; *) echo root ;; esac; }
+        getent() { echo 'alice:x:1000:1000::/home/alice:/bin/bash'; }
+        HOME=/root SUDO_USER=alice JANUS_ROOT_DIR='$ROOT_DIR'
+        source '$ROOT_DIR/lib/core/runtime/paths.sh'
+        source '$ROOT_DIR/lib/vm/core/context.sh'
+        printf '%s' \"\$JANUS_VM_JANUS_CONF\"
+    "
+
+assert_output_equals \
+    "init context: plain run keeps HOME" \
+    "/home/bob/.config/janus" \
+    bash -c "
+        id() { case \"\$1\" in -u) echo 1000 ;; *) echo bob ;; esac; }
+        HOME=/home/bob SUDO_USER=alice
+        source '$ROOT_DIR/lib/core/runtime/paths.sh'
+        source '$INIT_CONTEXT'
+        printf '%s' \"\$JANUS_INIT_CONFIG_DIR\"
+    "
+
+# ============================================================================
+echo ""
+echo "=== lib/bind/ops/persist.sh ==="
+# ============================================================================
+
+PERSIST_FIXTURE="$TMP_HOME/persist-fixture"
+mkdir -p "$PERSIST_FIXTURE/root/etc/initramfs-tools" "$PERSIST_FIXTURE/state"
+printf '# existing modules\nbtrfs\n' > "$PERSIST_FIXTURE/root/etc/initramfs-tools/modules"
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    source "$ROOT_DIR/lib/bind/main.sh"
+    janus_bind_load_ops persist
+    JANUS_BIND_STATE_DIR="$PERSIST_FIXTURE/state"
+    JANUS_BIND_SYSTEM_ROOT="$PERSIST_FIXTURE/root"
+    JANUS_BIND_PERSIST_IDS=(10de:228b 10de:2484)
+    JANUS_BIND_PERSIST_SOFTDEPS=(nvidia snd_hda_intel)
+    state_file="$PERSIST_FIXTURE/state/persist_test.state"
+    modules_file="$JANUS_BIND_SYSTEM_ROOT/etc/initramfs-tools/modules"
+
+    # -- stage + install: modprobe ids/softdep and initramfs-tools block --
+    [ "$(janus_bind_detect_initramfs_tool)" = "initramfs-tools" ] || exit 1
+    janus_bind_persist_stage "$PERSIST_FIXTURE/stage" initramfs-tools
+    janus_bind_persist_preview "$PERSIST_FIXTURE/stage" "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null || exit 1
+    janus_bind_persist_install "$PERSIST_FIXTURE/stage" "$state_file" initramfs-tools \
+        "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null 2>&1
+
+    if [ "$(cat "$JANUS_BIND_SYSTEM_ROOT/etc/modprobe.d/janus-vfio.conf")" = "# Generated by Janus: bind passthrough devices to vfio-pci at boot
+options vfio-pci ids=10de:228b,10de:2484
+softdep nvidia pre: vfio-pci
+softdep snd_hda_intel pre: vfio-pci" ] \
+        && [ "$(head -n2 "$modules_file")" = "# existing modules
+btrfs" ] \
+        && [ "$(grep -c '^vfio_pci$' "$modules_file")" = "1" ]; then
+        echo "[PASS] persist_install: writes modprobe ids/softdep and initramfs-tools block"
+    else
+        echo "[FAIL] persist_install: unexpected generated files" >&2
+        exit 1
+    fi
+
+    # -- re-staging is idempotent, so the preview reports no changes --
+    janus_bind_persist_stage "$PERSIST_FIXTURE/stage" initramfs-tools
+    if janus_bind_persist_preview "$PERSIST_FIXTURE/stage" "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null 2>&1; then
+        echo "[FAIL] persist_preview: second run should report no changes" >&2
+        exit 1
+    fi
+
+    # -- re-install into the same state keeps the pre-Janus backups --
+    JANUS_BIND_PERSIST_IDS=(10de:228b 10de:2484 10de:1aef)
+    janus_bind_persist_stage "$PERSIST_FIXTURE/stage" initramfs-tools
+    janus_bind_persist_install "$PERSIST_FIXTURE/stage" "$state_file" initramfs-tools \
+        "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null 2>&1
+    if [ "$(grep -c "^FILE=/etc/modprobe.d/janus-vfio.conf$" "$state_file")" != "1" ] \
+        || ! grep -q '^IDS=10de:228b,10de:2484,10de:1aef$' "$state_file" \
+        || ! grep -q 'ids=10de:228b,10de:2484,10de:1aef' "$JANUS_BIND_SYSTEM_ROOT/etc/modprobe.d/janus-vfio.conf"; then
+        echo "[FAIL] persist_install: second run should update the existing state" >&2
+        exit 1
+    fi
+
+    # -- restore: removes Janus files and the Janus block, keeps later admin edits --
+    printf 'nvme\n' >> "$modules_file"
+    janus_bind_persist_restore "$state_file" >/dev/null 2>&1
+
+    if [ ! -e "$JANUS_BIND_SYSTEM_ROOT/etc/modprobe.d/janus-vfio.conf" ] \
+        && [ "$(cat "$modules_file")" = "# existing modules
+btrfs
+nvme" ] \
+        && [ ! -e "$state_file" ]; then
+        printf '# existing modules\nbtrfs\n' > "$modules_file"
+        echo "[PASS] persist_restore: drops Janus files and block, keeps other edits"
+    else
+        echo "[FAIL] persist_restore: files were not restored" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+(
+    JANUS_ROOT_DIR="$ROOT_DIR"
+    source "$ROOT_DIR/lib/bind/main.sh"
+    janus_bind_load_ops persist
+    janus_bind_require_root() { :; }
+    JANUS_BIND_ASSUME_YES=1
+    JANUS_BIND_STATE_DIR="$PERSIST_FIXTURE/state"
+    JANUS_BIND_SYSTEM_ROOT="$PERSIST_FIXTURE/root"
+    JANUS_BIND_PERSIST_SOFTDEPS=()
+    modules_file="$JANUS_BIND_SYSTEM_ROOT/etc/initramfs-tools/modules"
+
+    # -- unpersist: unwinds states stacked by older releases to the original --
+    JANUS_BIND_PERSIST_IDS=(10de:228b)
+    janus_bind_persist_stage "$PERSIST_FIXTURE/stage" initramfs-tools
+    janus_bind_persist_install "$PERSIST_FIXTURE/stage" "$PERSIST_FIXTURE/state/persist_1.state" initramfs-tools \
+        "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null 2>&1
+    touch -d '2 minutes ago' "$PERSIST_FIXTURE/state/persist_1.state"
+    JANUS_BIND_PERSIST_IDS=(10de:2484)
+    janus_bind_persist_stage "$PERSIST_FIXTURE/stage" initramfs-tools
+    janus_bind_persist_install "$PERSIST_FIXTURE/stage" "$PERSIST_FIXTURE/state/persist_2.state" initramfs-tools \
+        "${JANUS_BIND_PERSIST_FILES[@]}" >/dev/null 2>&1
+    janus_bind_unpersist_last >/dev/null 2>&1
+
+    if [ ! -e "$JANUS_BIND_SYSTEM_ROOT/etc/modprobe.d/janus-vfio.conf" ] \
+        && [ "$(cat "$modules_file")" = "# existing modules
+btrfs" ] \
+        && ! ls "$PERSIST_FIXTURE/state"/persist_*.state >/dev/null 2>&1; then
+        echo "[PASS] unpersist: one run removes every stacked persist state"
+    else
+        echo "[FAIL] unpersist: stacked persist states were not fully restored" >&2
+        exit 1
+    fi
+) && PASS_COUNT=$((PASS_COUNT + 1)) || FAIL_COUNT=$((FAIL_COUNT + 1))
+
+# ============================================================================
+echo ""
+echo "=== orchestrator/janus_tui.py (PCI inventory) ==="
+# ============================================================================
+
+# Fake sysfs: GPU + audio in group 14, a USB controller in group 3 and a
+# bridge without an IOMMU group; names come from a trimmed pci.ids.
+PCI_FIXTURE="$TMP_HOME/pci-fixture"
+mkdir -p "$PCI_FIXTURE/sys/bus/pci/devices" "$PCI_FIXTURE/groups/14" "$PCI_FIXTURE/groups/3" \
+    "$PCI_FIXTURE/drivers/nvidia" "$PCI_FIXTURE/drivers/snd_hda_intel" "$PCI_FIXTURE/drivers/xhci_hcd"
+
+pci_fixture_device() {
+    local dir="$PCI_FIXTURE/sys/bus/pci/devices/$1"
+    mkdir -p "$dir"
+    printf '0x%s\n' "$2" > "$dir/vendor"
+    printf '0x%s\n' "$3" > "$dir/device"
+    printf '0x%s\n' "$4" > "$dir/class"
+    [ -z "$5" ] || ln -s "$PCI_FIXTURE/drivers/$5" "$dir/driver"
+    [ -z "$6" ] || ln -s "$PCI_FIXTURE/groups/$6" "$dir/iommu_group"
+}
+
+pci_fixture_device 0000:00:01.0 8086 1901 060400 "" ""
+pci_fixture_device 0000:00:14.0 8086 a36d 0c0330 xhci_hcd 3
+pci_fixture_device 0000:03:00.0 10de 2484 030000 nvidia 14
+pci_fixture_device 0000:03:00.1 10de 228b 040300 snd_hda_intel 14
+
+printf '%s\n' "# trimmed pci.ids" "8086  Intel Corporation" "	1901  Xeon E3 PCIe Root Port" \
+    "10de  NVIDIA Corporation" "	2484  GA104 [GeForce RTX 3070]" "		1043 87b8  ROG Strix" \
+    "C 03  Display controller" > "$PCI_FIXTURE/pci.ids"
+
+tui_output="$(python3 - "$ROOT_DIR/orchestrator" "$PCI_FIXTURE" <<'PY' 2>&1
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+import janus_tui
+
+fixture = Path(sys.argv[2])
+devices = janus_tui.load_pci_inventory(fixture / "sys", fixture / "pci.ids")
+
+def addresses(query):
+    return ",".join(device.address for device in janus_tui.filter_devices(devices, query))
+
+gpu = devices[2]
+print(f"count={len(devices)}")
+print(f"gpu={gpu.driver}|{gpu.iommu_group}|{gpu.class_name}|{gpu.description}")
+print(f"bridge={devices[0].driver}|{devices[0].iommu_group}")
+print(f"display={addresses('class:display')}")
+print(f"group={addresses('group:14')}")
+print(f"vendor={addresses('vendor:nvidia class:audio')}")
+print(f"driver={addresses('driver:xhci')}")
+print(f"text={addresses('rtx')}")
+PY
+)" && tui_rc=0 || tui_rc=$?
+
+if [ "$tui_rc" -eq 0 ] && [ "$tui_output" = "count=4
+gpu=nvidia|14|VGA|NVIDIA Corporation GA104 [GeForce RTX 3070] [10de:2484]
+bridge=none|-
+display=0000:03:00.0
+group=0000:03:00.0,0000:03:00.1
+vendor=0000:03:00.1
+driver=0000:00:14.0
+text=0000:03:00.0" ]; then
+    echo "[PASS] load_pci_inventory/filter_devices: sysfs inventory and scoped filters"
+    PASS_COUNT=$((PASS_COUNT + 1))
+else
+    echo "[FAIL] load_pci_inventory/filter_devices: rc=$tui_rc output='$tui_output'" >&2
+    FAIL_COUNT=$((FAIL_COUNT + 1))
+fi
+
 # ============================================================================
 echo ""
 echo "=== Include guards ==="
@@ -374,6 +1137,20 @@ assert_zero \
         source '$ROOT_DIR/lib/core/runtime/tty.sh'
     "
 
+assert_zero \
+    "irq.sh: double source does not error" \
+    bash -c "
+        source '$ROOT_DIR/lib/core/runtime/irq.sh'
+        source '$ROOT_DIR/lib/core/runtime/irq.sh'
+    "
+
+assert_zero \
+    "lookingglass.sh: double source does not error" \
+    bash -c "
+        source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'
+        source '$ROOT_DIR/lib/core/runtime/lookingglass.sh'
+    "
+
 assert_zero \
     "lib/tty.sh shim: double source does not error" \
     bash -c "
@@ -381,6 +1158,24 @@ assert_zero \
         source '$ROOT_DIR/lib/tty.sh'
     "
 
+assert_output_equals \
+    "runtime libraries: sourced by bare file name load their dependencies" \
+    "ok" \
+    bash -c "
+        cd '$ROOT_DIR/lib/core/runtime' || exit 1
+        source logging.sh && source safety.sh && source irq.sh
+        declare -F janus_runtime_invoking_home >/dev/null && echo ok
+    "
+
+assert_output_equals \
+    "lib/tty.sh shim: sourced by bare file name loads the runtime tty" \
+    "ok" \
+    bash -c "
+        cd '$ROOT_DIR/lib' || exit 1
+        source tty.sh
+        [ -n \"\${JANUS_RUNTIME_TTY_LOADED:-}\" ] && echo ok
+    "
+
 # ============================================================================
 echo ""
 echo "=== Summary ==="
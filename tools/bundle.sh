@@ -0,0 +1,106 @@
+#!/usr/bin/env bash
+
+# ----------------------------------------------------------------------------
+# Janus Bundle Builder
+# ----------------------------------------------------------------------------
+# This script inlines a bin/ entrypoint and every library it can load into a
+# single executable file, so a run reads one script instead of dozens.
+#
+# Bundles are written to dist/ (one level below the Janus root, like bin/),
+# which keeps templates, languages and modules resolvable at runtime. They
+# set JANUS_BUNDLED=1 so on-demand library loading becomes a no-op.
+#
+# Usage:
+#   bash tools/bundle.sh [vm|bind|check|init ...]   (default: all)
+# ----------------------------------------------------------------------------
+
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+OUT_DIR="${JANUS_BUNDLE_OUT_DIR:-$ROOT_DIR/dist}"
+
+declare -A JANUS_BUNDLE_EMITTED=()
+
+# Print FILE with its library source lines replaced by the libraries.
+janus_bundle_expand() {
+    local file="$1"
+    local line=""
+    local target=""
+    local command_dir=""
+    local lib=""
+
+    [ -z "${JANUS_BUNDLE_EMITTED[$file]:-}" ] || return 0
+    JANUS_BUNDLE_EMITTED["$file"]=1
+
+    printf '\n# --- %s ---\n' "${file#"$ROOT_DIR"/}"
+
+    while IFS= read -r line || [ -n "$line" ]; do
+        case "$line" in
+            '#!'*|'# shellcheck source='*)
+                continue
+                ;;
+        esac
+
+        if [[ "$line" =~ ^[[:space:]]*source\ \"\$JANUS_ROOT_DIR/([^\"]+)\"$ ]]; then
+            target="$ROOT_DIR/${BASH_REMATCH[1]}"
+        elif [[ "$line" =~ ^[[:space:]]*source\ \"\$(JANUS_RUNTIME_LIB_DIR|JANUS_LIB_DIR)/([^\"]+)\"$ ]]; then
+            target="$(cd "$(dirname "$file")" && pwd)/${BASH_REMATCH[2]}"
+        else
+            printf '%s\n' "$line"
+            continue
+        fi
+
+        [ -f "$target" ] || {
+            echo "[ERROR] $file sources missing library: $target" >&2
+            return 1
+        }
+        janus_bundle_expand "$target"
+
+        # Command mains load the rest of their tree on demand; inline it too.
+        if [[ "$target" =~ ^"$ROOT_DIR"/lib/([a-z]+)/main\.sh$ ]]; then
+            command_dir="$ROOT_DIR/lib/${BASH_REMATCH[1]}"
+            for lib in "$ROOT_DIR"/lib/core/runtime/*.sh "$command_dir"/*/*.sh; do
+                janus_bundle_expand "$lib"
+            done
+        fi
+    done < "$file"
+}
+
+# Build dist/janus-NAME from bin/janus-NAME.sh.
+janus_bundle_build() {
+    local name="$1"
+    local entry="$ROOT_DIR/bin/janus-$name.sh"
+    local out="$OUT_DIR/janus-$name"
+
+    [ -f "$entry" ] || {
+        echo "[ERROR] Unknown entrypoint: $name (expected vm|bind|check|init)" >&2
+        return 1
+    }
+
+    JANUS_BUNDLE_EMITTED=()
+    mkdir -p "$OUT_DIR"
+
+    {
+        printf '#!/usr/bin/env bash\n'
+        printf '# Generated by tools/bundle.sh from bin/janus-%s.sh; do not edit.\n' "$name"
+        printf 'JANUS_BUNDLED=1\n'
+        janus_bundle_expand "$entry"
+    } > "$out.tmp"
+
+    bash -n "$out.tmp" || {
+        rm -f "$out.tmp"
+        echo "[ERROR] Generated bundle has syntax errors: $out" >&2
+        return 1
+    }
+
+    chmod +x "$out.tmp"
+    mv "$out.tmp" "$out"
+    echo "[OK] $out (${#JANUS_BUNDLE_EMITTED[@]} files)"
+}
+
+names=("$@")
+[ "${#names[@]}" -gt 0 ] || names=(vm bind check init)
+
+for name in "${names[@]}"; do
+    janus_bundle_build "$name"
+done